@@ -1,23 +1,34 @@
+import asyncio
 import traceback
+import uuid
 
 import streamlit as st
-from urllib.parse import quote_plus
 
 import recruiterblast.config as cfg
+from recruiterblast.accounting import get_usage_ledger, usage_scope
 from recruiterblast.api import GoogleGeminiAPIClient
+from recruiterblast.constants import (
+    DEFAULT_EMAIL_BODY_TEMPLATE,
+    DEFAULT_EMAIL_SUBJECT_TEMPLATE,
+    JOB_POST_SUMMARY_FIELDS,
+)
+from recruiterblast.email_formats import (
+    EmailFormatResolver,
+    EmailFormatResult,
+    get_email_format_priors,
+)
 from recruiterblast.logger import setup_logger
 from recruiterblast.models import Company, JobPost
-from recruiterblast.parsers import (
-    parse_emails_from_text,
-    parse_linkedin_job_url,
-    parse_rocket_reach_email_format,
-)
+from recruiterblast.parsers import parse_linkedin_job_url
+from recruiterblast.profiling import profile_run
+from recruiterblast.resolvers import prune_email_candidates
 from recruiterblast.scrapers import GoogleSearchScraper, LinkedInScraper
+from recruiterblast.templates import OutreachTemplate
 from recruiterblast.utils import (
     generate_formatted_employee_email,
     generate_rocketreach_formatted_username,
-    generate_email_subject_and_body,
 )
+from recruiterblast.warming import get_cache_warmer
 
 from streamlit_feedback import streamlit_feedback
 
@@ -47,6 +58,15 @@ def display_job_post_section(scraper: LinkedInScraper) -> JobPost:
         )
     )
     client = GoogleGeminiAPIClient()
+    # Streams are never cached, so exhausted budgets fall back to the
+    # cache-first request path.
+    if (
+        cfg.IS_PROD
+        and cfg.GOOGLE_GEMINI_STREAMING
+        and not get_usage_ledger().get_exceeded_budgets("gemini")
+    ):
+        return display_streamed_job_post_section(scraper, client, job_post)
+
     description_attrs = (
         client.parse_relevant_job_description_info(job_post.description)
         if cfg.IS_PROD
@@ -73,12 +93,33 @@ def display_job_post_section(scraper: LinkedInScraper) -> JobPost:
     return job_post
 
 
+def display_streamed_job_post_section(
+    scraper: LinkedInScraper, client: GoogleGeminiAPIClient, job_post: JobPost
+) -> JobPost:
+    description = job_post.description
+    job_post.job_url = scraper.job_post_url
+    job_post.description = ""
+
+    st.subheader("Job Post Information")
+    table = st.empty()
+    table.table(job_post.as_df())
+
+    for key, item in client.stream_relevant_job_description_info(description):
+        field_name = JOB_POST_SUMMARY_FIELDS.get(key)
+        if field_name:
+            getattr(job_post, field_name).append(item)
+            table.table(job_post.as_df())
+
+    return job_post
+
+
 def display_company_section(scraper: LinkedInScraper) -> Company:
     company = (
         scraper.fetch_company_from_job_post()
         if cfg.IS_PROD
         else scraper.generate_mock_company()
     )
+    get_cache_warmer().record_lookup(company)
 
     st.subheader("Company Information")
     st.table(company.as_df())
@@ -87,33 +128,23 @@ def display_company_section(scraper: LinkedInScraper) -> Company:
 
 
 def display_suggested_email_format_section(company: Company):
-    leadiq_snippet = "The Company ABC's email format is First.Last@companyabc.com;"
-    rocket_snippet = "The Company ABC's email format is [first].[last] (test)."
+    result = EmailFormatResult(
+        "RocketReach.co",
+        "[first].[last]",
+        "The Company ABC's email format is [first].[last] (test).",
+        0.9,
+    )
 
     if cfg.IS_PROD:
-        google_scraper = GoogleSearchScraper()
-        leadiq_snippet = google_scraper.scrape_leadiq_suggested_email_format(
-            company.domain
-        )
-        rocket_snippet = google_scraper.scrape_rocketreach_suggested_email_format(
-            company.domain
-        )
-
-    email_format = None
-
-    if any([leadiq_snippet, rocket_snippet]):
-        st.subheader("Email Format")
-
-        if leadiq_snippet:
-            st.write(f"Per LeadIQ.com: {leadiq_snippet}")
-            email_format = parse_emails_from_text(leadiq_snippet)
-            email_format = email_format[0] if email_format else None
+        resolver = EmailFormatResolver(GoogleSearchScraper())
+        result = resolver.resolve(company.domain)
 
-        if rocket_snippet:
-            st.write(f"Per RocketReach.co: {rocket_snippet}")
-            email_format = parse_rocket_reach_email_format(rocket_snippet)
+    if not result:
+        return None
 
-    return email_format
+    st.subheader("Email Format")
+    st.write(f"Per {result.source}: {result.snippet}")
+    return result.email_format
 
 
 def display_recruiters_section(
@@ -127,12 +158,27 @@ def display_recruiters_section(
 
     st.subheader("Recruiters")
 
-    for recruiter in recruiters:
-        subject, body = generate_email_subject_and_body(company, recruiter, job_post)
-        if subject_override:
-            subject = quote_plus(subject_override).replace("+", "%20")
-        if body_override:
-            body = quote_plus(body_override).replace("+", "%20")
+    candidate_emails = {}
+    if not email_format:
+        priors = get_email_format_priors().get_probabilities(company.domain)
+        candidate_emails = {
+            i: recruiter.rank_email_permutations(
+                company.domain, priors, cfg.EMAIL_PERMUTATION_LIMIT
+            )
+            for i, recruiter in enumerate(recruiters)
+        }
+        if cfg.IS_PROD and cfg.EMAIL_MX_VERIFICATION:
+            candidate_emails = asyncio.run(prune_email_candidates(candidate_emails))
+            if not any(candidate_emails.values()):
+                st.warning(f"No mail server found for {company.domain}.")
+
+    template = OutreachTemplate(
+        subject_override or DEFAULT_EMAIL_SUBJECT_TEMPLATE,
+        body_override or DEFAULT_EMAIL_BODY_TEMPLATE,
+    ).compile(company, job_post)
+
+    for i, recruiter in enumerate(recruiters):
+        subject, body = template.render(recruiter)
         if email_format and email_format.startswith("["):
             username = generate_rocketreach_formatted_username(recruiter, email_format)
             email = f"{username}@{company.domain}"
@@ -140,7 +186,7 @@ def display_recruiters_section(
         elif email_format:
             emails = [generate_formatted_employee_email(recruiter, email_format)]
         else:
-            emails = recruiter.generate_email_permutations(company.domain)
+            emails = candidate_emails[i]
 
         with st.container():
             st.markdown(
@@ -171,14 +217,26 @@ def main():
 
     st.subheader("Find recruiters from job posts, prepare your pitch, and send emails.")
 
+    # Starts the watchlist cache warmer once per process; `?warming=true`
+    # shows its progress.
+    cache_warmer = get_cache_warmer()
+    if st.query_params.get("warming") == "true":
+        st.json(cache_warmer.get_progress().to_dict())
+
     job_url = st.text_input(
         "Job URL", placeholder="https://www.linkedin.com/jobs/view/4133654166"
     )
 
+    template_help = (
+        "Use {first_name}, {last_name} or {full_name} for the recruiter and "
+        "{job_title}, {job_url}, {company_name} or {resume_link} for the job."
+    )
     subject_override = st.text_input(
-        "Email subject", placeholder="I am a fit for this role."
+        "Email subject", placeholder="I am a fit for this role.", help=template_help
+    )
+    body_override = st.text_area(
+        "Email body", placeholder="This is why.", help=template_help
     )
-    body_override = st.text_area("Email body", placeholder="This is why.")
 
     st.markdown(
         "<p style='color: gray;'>No worries, we don’t store your data. "
@@ -195,20 +253,28 @@ def main():
                     "Please enter a valid LinkedIn URL (e.g., 'https://www.linkedin.com/jobs/view/4133654166')"
                 )
             else:
+                session_id = st.session_state.setdefault(
+                    "usage_session_id", uuid.uuid4().hex
+                )
                 try:
                     scraper = LinkedInScraper(job_url)
 
-                    job_post = display_job_post_section(scraper)
-                    company = display_company_section(scraper)
-                    email_format = display_suggested_email_format_section(company)
-                    display_recruiters_section(
-                        scraper,
-                        company,
-                        job_post,
-                        email_format,
-                        subject_override,
-                        body_override,
-                    )
+                    # `?profile=true` profiles this run even if profiling is off.
+                    profile = st.query_params.get("profile") == "true" or None
+                    with usage_scope(
+                        job_id=scraper.job_id, session_id=session_id
+                    ), profile_run(scraper.job_id, profile):
+                        job_post = display_job_post_section(scraper)
+                        company = display_company_section(scraper)
+                        email_format = display_suggested_email_format_section(company)
+                        display_recruiters_section(
+                            scraper,
+                            company,
+                            job_post,
+                            email_format,
+                            subject_override,
+                            body_override,
+                        )
                     display_feedback_section()
 
                 except Exception as e:
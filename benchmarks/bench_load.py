@@ -0,0 +1,328 @@
+# Run from the repository root: python -m benchmarks.bench_load
+#
+# Drives the recruiter pipeline with concurrent simulated users against a stub
+# upstream (LinkedIn, Google search and Gemini) running in a separate process,
+# and reports per-stage latency percentiles, CPU, RSS and the saturation point.
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import resource
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+from requests.adapters import HTTPAdapter
+
+RESOURCES_DIR = Path(__file__).resolve().parent.parent / "resources"
+STAGES = ["job_post", "summary", "company", "email_format", "recruiters"]
+UPSTREAM_HOST_HEADER = "X-Upstream-Host"
+SATURATION_THROUGHPUT_GAIN = 1.1
+
+LEADIQ_SNIPPET = (
+    "The company's email format typically follows the pattern of "
+    "First.Last@{domain}; this email format is used 95% of the time."
+)
+GEMINI_SUMMARY = {
+    "core_responsibilities": ["Build data pipelines"],
+    "technical_requirements": ["Python", "SQL"],
+    "soft_skills": ["Communication"],
+    "highlights": ["Remote"],
+}
+
+
+def load_fixture(name: str) -> bytes:
+    return (RESOURCES_DIR / f"{name}.json").read_bytes()
+
+
+class StubUpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latencies = {}
+    fixtures = {}
+
+    def do_GET(self):
+        host = self.headers.get(UPSTREAM_HOST_HEADER, "")
+        url = urlsplit(self.path)
+        if host == "customsearch.googleapis.com":
+            query = parse_qs(url.query).get("q", [""])[0]
+            if "leadiq.com" in query:
+                domain = re.search(r'"@([^"]+)"', query).group(1)
+                snippet = LEADIQ_SNIPPET.format(domain=domain)
+                body = json.dumps({"items": [{"snippet": snippet}]}).encode()
+            elif "rocketreach.co" in query:
+                body = b"{}"
+            else:
+                body = self.fixtures["google_search_api_response"]
+            return self._respond("google", body)
+
+        if "/jobs/jobPostings/" in url.path:
+            return self._respond("linkedin", self.fixtures["linkedin_job_post"])
+        if "/entities/companies/" in url.path:
+            return self._respond("linkedin", self.fixtures["linkedin_company_entity"])
+        if "jobPostingUrn" in self.path:
+            return self._respond("linkedin", self.fixtures["linkedin_company"])
+        if "currentCompany" in self.path:
+            return self._respond("linkedin", self.fixtures["linkedin_employee"])
+        self._respond("linkedin", b"{}", status=404)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        response = {
+            "candidates": [
+                {"content": {"parts": [{"text": json.dumps(GEMINI_SUMMARY)}]}}
+            ],
+            "usageMetadata": {"promptTokenCount": 600, "candidatesTokenCount": 60},
+        }
+        if ":streamGenerateContent" in self.path:
+            body = f"data: {json.dumps(response)}\r\n\r\n".encode()
+            return self._respond("gemini", body, "text/event-stream")
+        self._respond("gemini", json.dumps(response).encode())
+
+    def _respond(
+        self, upstream: str, body: bytes, content_type="application/json", status=200
+    ):
+        time.sleep(self.latencies.get(upstream, 0))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_stub_upstream(latencies: dict, port_queue) -> None:
+    StubUpstreamHandler.latencies = latencies
+    StubUpstreamHandler.fixtures = {
+        "google_search_api_response": load_fixture("google_search_api_response"),
+        "linkedin_job_post": load_fixture("linkedin_job_post_api_response"),
+        "linkedin_company_entity": load_fixture("linkedin_company_entity_api_response"),
+        "linkedin_company": load_fixture("linkedin_company_api_response"),
+        "linkedin_employee": load_fixture("linkedin_employee_api_response"),
+    }
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubUpstreamHandler)
+    server.daemon_threads = True
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+class StubUpstreamAdapter(HTTPAdapter):
+    # Sends every request to the stub upstream, keeping the original host in a
+    # header so the stub can route it.
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(pool_maxsize=256, **kwargs)
+        self.base_url = urlsplit(base_url)
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        request.headers[UPSTREAM_HOST_HEADER] = url.netloc
+        request.url = urlunsplit(
+            url._replace(scheme=self.base_url.scheme, netloc=self.base_url.netloc)
+        )
+        return super().send(request, **kwargs)
+
+
+def configure_environment(cache: bool) -> None:
+    defaults = {
+        "ENV": "prod",
+        "LINKEDIN_COOKIE": "stub",
+        "LINKEDIN_CSRF_TOKEN": "stub",
+        "GOOGLE_GEMINI_LLM_MODEL": "stub",
+        "GOOGLE_SEARCH_DAILY_QUOTA": str(10**9),
+        "LOG_PAYLOAD_SAMPLE_RATE": "0",
+    }
+    for name, value in defaults.items():
+        os.environ.setdefault(name, value)
+    if not cache:
+        os.environ["RESPONSE_CACHE_TTL_SECONDS"] = "0"
+        os.environ["COMPANY_STORE_TTL_SECONDS"] = "0"
+        os.environ["RECRUITER_STORE_TTL_SECONDS"] = "0"
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(int(round(q / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+def get_rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def run_pipeline(job_id: int, latencies: dict) -> None:
+    from recruiterblast.api import GoogleGeminiAPIClient
+    from recruiterblast.email_formats import EmailFormatPriors, EmailFormatResolver
+    from recruiterblast.scrapers import GoogleSearchScraper, LinkedInScraper
+
+    def timed(stage, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            latencies[stage].append(time.perf_counter() - start)
+
+    scraper = LinkedInScraper(f"https://www.linkedin.com/jobs/view/{job_id}")
+    job_post = timed("job_post", scraper.fetch_job_post_details)
+    timed(
+        "summary",
+        GoogleGeminiAPIClient().parse_relevant_job_description_info,
+        job_post.description,
+    )
+    company = timed("company", scraper.fetch_company_from_job_post)
+    resolver = EmailFormatResolver(GoogleSearchScraper(), EmailFormatPriors())
+    timed("email_format", resolver.resolve, company.domain)
+    timed("recruiters", scraper.fetch_recruiters_from_company, company)
+
+
+def run_level(users: int, requests_per_user: int, job_ids) -> dict:
+    latencies = defaultdict(list)
+    errors = []
+    lock = threading.Lock()
+
+    def run_user():
+        for _ in range(requests_per_user):
+            with lock:
+                job_id = next(job_ids)
+            start = time.perf_counter()
+            try:
+                run_pipeline(job_id, latencies)
+            except Exception as e:
+                errors.append(repr(e))
+            latencies["total"].append(time.perf_counter() - start)
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        for future in [executor.submit(run_user) for _ in range(users)]:
+            future.result()
+    wall_time = time.perf_counter() - wall_start
+    cpu_time = time.process_time() - cpu_start
+
+    completed = users * requests_per_user
+    return {
+        "users": users,
+        "pipelines": completed,
+        "errors": len(errors),
+        "sample_error": errors[0] if errors else None,
+        "throughput_per_second": completed / wall_time,
+        "cpu_percent": 100 * cpu_time / wall_time,
+        "cpu_ms_per_pipeline": 1000 * cpu_time / completed,
+        "rss_mb": get_rss_mb(),
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "stages": {
+            stage: {
+                "p50_ms": 1000 * percentile(values, 50),
+                "p95_ms": 1000 * percentile(values, 95),
+                "p99_ms": 1000 * percentile(values, 99),
+                "mean_ms": 1000 * statistics.fmean(values),
+            }
+            for stage, values in latencies.items()
+        },
+    }
+
+
+def find_saturation_point(levels: list[dict]) -> int:
+    # The first level whose throughput no longer grows by at least 10% over
+    # the previous level.
+    for previous, level in itertools.pairwise(levels):
+        gain = level["throughput_per_second"] / previous["throughput_per_second"]
+        if gain < SATURATION_THROUGHPUT_GAIN:
+            return level["users"]
+    return None
+
+
+def print_level(level: dict) -> None:
+    print(
+        f"users={level['users']} pipelines={level['pipelines']} "
+        f"errors={level['errors']} "
+        f"throughput_per_second={level['throughput_per_second']:.1f} "
+        f"cpu_percent={level['cpu_percent']:.0f} "
+        f"cpu_ms_per_pipeline={level['cpu_ms_per_pipeline']:.1f} "
+        f"rss_mb={level['rss_mb']:.1f}"
+    )
+    for stage in STAGES + ["total"]:
+        stats = level["stages"].get(stage)
+        if stats:
+            print(
+                f"  {stage:<12} p50_ms={stats['p50_ms']:.1f} "
+                f"p95_ms={stats['p95_ms']:.1f} p99_ms={stats['p99_ms']:.1f}"
+            )
+    if level["sample_error"]:
+        print(f"  sample_error={level['sample_error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load test the recruiter pipeline against a stub upstream."
+    )
+    parser.add_argument(
+        "-u",
+        "--users",
+        default="1,2,4,8,16,32",
+        help="Comma separated concurrency levels",
+    )
+    parser.add_argument("-n", "--requests-per-user", type=int, default=5)
+    parser.add_argument("--linkedin-latency-ms", type=float, default=50)
+    parser.add_argument("--google-latency-ms", type=float, default=100)
+    parser.add_argument("--gemini-latency-ms", type=float, default=500)
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Keep the response cache and company store enabled",
+    )
+    parser.add_argument("-o", "--output", help="Write the results as JSON")
+    args = parser.parse_args()
+
+    upstream_latencies = {
+        "linkedin": args.linkedin_latency_ms / 1000,
+        "google": args.google_latency_ms / 1000,
+        "gemini": args.gemini_latency_ms / 1000,
+    }
+    port_queue = multiprocessing.Queue()
+    stub = multiprocessing.Process(
+        target=run_stub_upstream, args=(upstream_latencies, port_queue), daemon=True
+    )
+    stub.start()
+    base_url = f"http://127.0.0.1:{port_queue.get(timeout=10)}"
+
+    configure_environment(args.cache)
+    from recruiterblast.sessions import get_http_session
+
+    session = get_http_session()
+    session.mount("https://", StubUpstreamAdapter(base_url))
+    session.mount("http://", StubUpstreamAdapter(base_url))
+
+    # LinkedIn requests are throttled with random sleeps to avoid detection;
+    # the harness measures the pipeline itself.
+    levels = []
+    job_ids = itertools.count(4_000_000_000)
+    with mock.patch("recruiterblast.scrapers.sleep_for_random_n_seconds"):
+        run_level(1, 1, job_ids)
+        for users in map(int, re.split(r"\s*,\s*", args.users.strip())):
+            level = run_level(users, args.requests_per_user, job_ids)
+            levels.append(level)
+            print_level(level)
+    stub.terminate()
+
+    saturation_point = find_saturation_point(levels)
+    print(f"saturation_point_users={saturation_point}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"levels": levels, "saturation_point": saturation_point}, f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# Run from the repository root: python -m benchmarks.bench_skills
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from recruiterblast.skills import extract_technical_requirements
+
+RESOURCES_DIR = Path(__file__).resolve().parent.parent / "resources"
+FIXTURES = [
+    "linkedin_job_post_api_response",
+    "linkedin_job_post_hourly_wage_api_response",
+    "linkedin_job_post_salary_api_response",
+]
+
+
+def load_descriptions() -> list[str]:
+    descriptions = []
+    for name in FIXTURES:
+        with open(RESOURCES_DIR / f"{name}.json") as f:
+            descriptions.append(json.load(f)["data"]["description"]["text"])
+    return descriptions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure local skill extraction throughput on one core."
+    )
+    parser.add_argument("-n", "--iterations", type=int, default=3000)
+    args = parser.parse_args()
+
+    descriptions = load_descriptions()
+    extract_technical_requirements(descriptions[0])
+
+    start_time = time.perf_counter()
+    for i in range(args.iterations):
+        extract_technical_requirements(descriptions[i % len(descriptions)])
+    elapsed_time = time.perf_counter() - start_time
+
+    characters = sum(len(d) for d in descriptions) * args.iterations / len(descriptions)
+    print(f"descriptions={args.iterations} time_elapsed_seconds={elapsed_time:.2f}")
+    print(f"descriptions_per_second={args.iterations / elapsed_time:.0f}")
+    print(f"megabytes_per_second={characters / elapsed_time / 1e6:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+import contextlib
+import contextvars
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import dataclass
+
+import recruiterblast.config as cfg
+from recruiterblast import metrics
+from recruiterblast.logger import setup_logger
+from recruiterblast.quotas import get_quota_day
+
+log = setup_logger(__name__)
+
+DEFAULT_SESSION_ID = "default"
+USAGE_SCOPES = ("job", "session", "day")
+# Scopes bounded to the most recently used USAGE_LEDGER_MAX_SCOPES ids each.
+BOUNDED_USAGE_SCOPES = ("job", "session")
+
+
+class BudgetExceededError(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class UsageScope:
+    session_id: str = DEFAULT_SESSION_ID
+    job_id: str = None
+
+
+_usage_scope = contextvars.ContextVar("usage_scope", default=UsageScope())
+
+
+def get_usage_scope() -> UsageScope:
+    return _usage_scope.get()
+
+
+@contextlib.contextmanager
+def usage_scope(job_id: str = None, session_id: str = None):
+    parent = _usage_scope.get()
+    token = _usage_scope.set(
+        UsageScope(session_id or parent.session_id, job_id or parent.job_id)
+    )
+    try:
+        yield
+    finally:
+        _usage_scope.reset(token)
+
+
+def bind_usage_scope(func):
+    # Context variables do not follow work submitted to a thread pool, so the
+    # caller's scope is captured here and re-entered on the worker thread.
+    scope = _usage_scope.get()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _usage_scope.set(scope)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _usage_scope.reset(token)
+
+    return wrapper
+
+
+def parse_usage_budgets(text: str) -> dict[tuple[str, str], float]:
+    # e.g. "session.google.queries=50,day.gemini.input_tokens=1000000"
+    budgets = {}
+    for item in filter(None, (part.strip() for part in (text or "").split(","))):
+        name, _, limit = item.partition("=")
+        scope, _, metric = name.strip().partition(".")
+        if scope not in USAGE_SCOPES or not metric or not limit:
+            raise ValueError(f"Invalid usage budget {item!r}")
+        budgets[(scope, metric)] = float(limit)
+    return budgets
+
+
+def estimate_gemini_cost(input_tokens: int, output_tokens: int) -> float:
+    return (
+        input_tokens * cfg.GEMINI_INPUT_COST_PER_MILLION_TOKENS
+        + output_tokens * cfg.GEMINI_OUTPUT_COST_PER_MILLION_TOKENS
+    ) / 1_000_000
+
+
+def get_gemini_token_counts(response: dict) -> tuple[int, int]:
+    usage = (response or {}).get("usageMetadata", {})
+    return usage.get("promptTokenCount", 0), usage.get("candidatesTokenCount", 0)
+
+
+class UsageLedger:
+    # Usage and estimated cost totals per job, session and (Pacific-time) day,
+    # checked against the configured budgets before each upstream call. Only
+    # the most recently used `max_scopes` jobs and sessions are kept.
+    def __init__(
+        self, budgets: dict[tuple[str, str], float] = None, max_scopes: int = None
+    ):
+        self.lock = threading.Lock()
+        self.usage = defaultdict(Counter)
+        self.budgets = (
+            parse_usage_budgets(cfg.USAGE_BUDGETS) if budgets is None else budgets
+        )
+        self.max_scopes = max_scopes or cfg.USAGE_LEDGER_MAX_SCOPES
+        self.recent_scopes = {scope: OrderedDict() for scope in BOUNDED_USAGE_SCOPES}
+
+    def record(self, **amounts) -> None:
+        keys = self._get_scope_keys(get_usage_scope())
+        with self.lock:
+            for key in keys:
+                self.usage[key].update(amounts)
+                if key[0] in self.recent_scopes:
+                    self._touch_scope(key)
+        for name, value in amounts.items():
+            metrics.increment(f"usage.{name}", value)
+
+    def record_google_query(self, is_cached: bool = False) -> None:
+        cost = cfg.GOOGLE_SEARCH_COST_PER_QUERY
+        if is_cached:
+            self.record(**{"google.cache_hits": 1, "cache_savings_usd": cost})
+        else:
+            self.record(**{"google.queries": 1, "cost_usd": cost})
+
+    def record_gemini_response(self, response: dict, is_cached: bool = False) -> None:
+        input_tokens, output_tokens = get_gemini_token_counts(response)
+        cost = estimate_gemini_cost(input_tokens, output_tokens)
+        if is_cached:
+            self.record(**{"gemini.cache_hits": 1, "cache_savings_usd": cost})
+        else:
+            self.record(
+                **{
+                    "gemini.requests": 1,
+                    "gemini.input_tokens": input_tokens,
+                    "gemini.output_tokens": output_tokens,
+                    "cost_usd": cost,
+                }
+            )
+
+    def get_usage(self, scope: str, scope_id: str) -> dict:
+        with self.lock:
+            return dict(self.usage.get((scope, scope_id), {}))
+
+    def get_exceeded_budgets(self, service: str, ratio: float = 1.0) -> list[str]:
+        # With `ratio` below 1, budgets past that fraction of their limit count
+        # as exceeded.
+        scope_ids = dict(self._get_scope_keys(get_usage_scope()))
+        exceeded = []
+        with self.lock:
+            for (scope, metric), limit in self.budgets.items():
+                if not (metric.startswith(f"{service}.") or metric == "cost_usd"):
+                    continue
+                if scope not in scope_ids:
+                    continue
+                if self.usage[(scope, scope_ids[scope])][metric] >= limit * ratio:
+                    exceeded.append(f"{scope}.{metric}")
+        return exceeded
+
+    def summarize(self) -> dict:
+        scope = get_usage_scope()
+        with self.lock:
+            return {
+                "session": dict(self.usage.get(("session", scope.session_id), {})),
+                "day": dict(self.usage.get(("day", get_quota_day()), {})),
+                "jobs": {
+                    job_id: dict(usage)
+                    for (name, job_id), usage in self.usage.items()
+                    if name == "job"
+                },
+            }
+
+    def _touch_scope(self, key: tuple[str, str]) -> None:
+        recent = self.recent_scopes[key[0]]
+        recent[key] = None
+        recent.move_to_end(key)
+        while len(recent) > self.max_scopes:
+            evicted, _ = recent.popitem(last=False)
+            self.usage.pop(evicted, None)
+
+    @staticmethod
+    def _get_scope_keys(scope: UsageScope) -> list[tuple[str, str]]:
+        keys = [("session", scope.session_id), ("day", get_quota_day())]
+        if scope.job_id is not None:
+            keys.append(("job", str(scope.job_id)))
+        return keys
+
+
+class ResponseCache:
+    # Bounded LRU of upstream responses. Expired entries are kept until
+    # evicted so they can still be served once a budget is exhausted.
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key: str, allow_stale: bool = False):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if not allow_stale and expires_at <= time.monotonic():
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+def build_cache_key(service: str, *args, **kwargs) -> str:
+    data = json.dumps([service, args, kwargs], sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def is_response_cached(service: str, *args, **kwargs) -> bool:
+    key = build_cache_key(service, *args, **kwargs)
+    return get_response_cache().get(key) is not None
+
+
+def is_successful_response(response: dict) -> bool:
+    # Google and Gemini both answer quota, auth and server errors with a JSON
+    # body holding an "error" object.
+    return bool(response) and "error" not in response
+
+
+def metered(service: str, record, is_cacheable=is_successful_response):
+    # Wraps an upstream call on a client method: fresh cached responses are
+    # served first. Once any budget covering `service` is nearly spent
+    # (USAGE_BUDGET_SOFT_LIMIT_RATIO of its limit) stale cached responses are
+    # preferred to new calls, and once one is exhausted only cached responses
+    # are served. Every call is recorded, including failed ones, so the wrapper
+    # goes inside any retry decorator. Only responses passing `is_cacheable`
+    # are cached, so a transient error is not served again.
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            ledger = get_usage_ledger()
+            cache = get_response_cache()
+            key = build_cache_key(service, *args, **kwargs)
+
+            cached = cache.get(key)
+            if cached is not None:
+                record(ledger, cached, is_cached=True)
+                return cached
+
+            exceeded_budgets = ledger.get_exceeded_budgets(service)
+            nearly_exceeded_budgets = exceeded_budgets or ledger.get_exceeded_budgets(
+                service, cfg.USAGE_BUDGET_SOFT_LIMIT_RATIO
+            )
+            if nearly_exceeded_budgets:
+                cached = cache.get(key, allow_stale=True)
+                metrics.increment(f"usage.{service}.degraded")
+                if cached is not None:
+                    log.info(
+                        "Serving stale %s response, budgets=%s nearly exhausted",
+                        service,
+                        nearly_exceeded_budgets,
+                    )
+                    record(ledger, cached, is_cached=True)
+                    return cached
+                if exceeded_budgets:
+                    raise BudgetExceededError(
+                        f"Budgets {exceeded_budgets} exhausted and no cached "
+                        f"{service} response"
+                    )
+
+            try:
+                response = func(self, *args, **kwargs)
+            except Exception:
+                record(ledger, None)
+                raise
+            record(ledger, response)
+            if is_cacheable(response):
+                cache.set(key, response)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def record_google_response(ledger: UsageLedger, response: dict, is_cached=False):
+    ledger.record_google_query(is_cached)
+
+
+def record_gemini_response(ledger: UsageLedger, response: dict, is_cached=False):
+    ledger.record_gemini_response(response, is_cached)
+
+
+def format_usage_summary(summary: dict) -> str:
+    lines = []
+    for name in ("session", "day"):
+        lines.append(f"{name}: {_format_usage(summary.get(name, {}))}")
+    for job_id, usage in sorted(summary.get("jobs", {}).items()):
+        lines.append(f"job {job_id}: {_format_usage(usage)}")
+    return "\n".join(lines)
+
+
+def _format_usage(usage: dict) -> str:
+    if not usage:
+        return "no usage"
+    return ", ".join(
+        f"{name}={value:.4f}" if isinstance(value, float) else f"{name}={value}"
+        for name, value in sorted(usage.items())
+    )
+
+
+_usage_ledger = None
+_response_cache = None
+
+
+def get_usage_ledger() -> UsageLedger:
+    global _usage_ledger
+    if _usage_ledger is None:
+        _usage_ledger = UsageLedger()
+    return _usage_ledger
+
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            cfg.RESPONSE_CACHE_MAX_ENTRIES, cfg.RESPONSE_CACHE_TTL_SECONDS
+        )
+    return _response_cache
@@ -1,44 +1,373 @@
-import requests
+import json
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
 
 import recruiterblast.config as cfg
-from recruiterblast.constants import GOOGLE_GEMINI_API_URL
-from recruiterblast.logger import setup_logger
+from recruiterblast import metrics
+from recruiterblast.accounting import (
+    BudgetExceededError,
+    bind_usage_scope,
+    get_usage_ledger,
+    metered,
+    record_gemini_response,
+)
+from recruiterblast.compactors import compact_job_description
+from recruiterblast.constants import (
+    GOOGLE_GEMINI_API_URL,
+    GOOGLE_GEMINI_STREAM_API_URL,
+)
+from recruiterblast.logger import Payload, setup_logger
 from recruiterblast.parsers import (
     GoogleGeminiAPIResponseParser,
-    safe_parse_dict_from_json_str,
+    IncrementalJSONListParser,
+    parse_json_object_leniently,
+    validate_string_lists,
+)
+from recruiterblast.profiling import traced_memory
+from recruiterblast.prompts import (
+    JOB_DESCRIPTION_SUMMARY_FIELDS,
+    LLM_BATCH_JOB_DESCRIPTION_FIELDS_PROMPT,
+    LLM_BATCH_JOB_DESCRIPTION_SUMMARY_PROMPT,
+    LLM_JOB_DESCRIPTION_FIELDS_PROMPT,
+    LLM_JOB_DESCRIPTION_SUMMARY_PROMPT,
+    build_job_description_summary_schema,
 )
-from recruiterblast.prompts import LLM_JOB_DESCRIPTION_SUMMARY_PROMPT
-from recruiterblast.utils import retry
+from recruiterblast.sessions import get_http_session
+from recruiterblast.skills import extract_technical_requirements
+from recruiterblast.utils import estimate_token_count, retry
 
 log = setup_logger(__name__)
 
 
 class GoogleGeminiAPIClient:
-    BASE_URL = GOOGLE_GEMINI_API_URL.format(llm_model=cfg.GOOGLE_GEMINI_LLM_MODEL)
-
     def __init__(self):
+        self.base_url = GOOGLE_GEMINI_API_URL.format(
+            llm_model=cfg.GOOGLE_GEMINI_LLM_MODEL
+        )
+        self.stream_url = GOOGLE_GEMINI_STREAM_API_URL.format(
+            llm_model=cfg.GOOGLE_GEMINI_LLM_MODEL
+        )
         self.api_key = cfg.GOOGLE_GEMINI_API_KEY
         self.headers = {"Content-Type": "application/json"}
 
+    @traced_memory("gemini.summary")
     def parse_relevant_job_description_info(self, job_description: str) -> dict:
-        prompt = LLM_JOB_DESCRIPTION_SUMMARY_PROMPT
-        prompt += f"Job description: {job_description}"
+        job_description = self._compact_job_description(job_description)
+        local_summary = self._extract_local_summary(job_description)
+        if local_summary is not None:
+            remaining_fields = self._get_remaining_fields(local_summary)
+            if remaining_fields:
+                local_summary.update(
+                    self._parse_job_description_fields(
+                        job_description, remaining_fields
+                    )
+                )
+            return local_summary
 
-        payload = {"contents": [{"parts": [{"text": prompt}]}]}
-        log.debug(f"Starting to submit {prompt=}...")
+        prompt = self._build_summary_prompt(
+            job_description, JOB_DESCRIPTION_SUMMARY_FIELDS
+        )
+        payload = self._build_payload(prompt, JOB_DESCRIPTION_SUMMARY_FIELDS)
+        log.debug("Starting to submit prompt=%s...", Payload(prompt))
         response = self._make_request(payload)
 
         parser = GoogleGeminiAPIResponseParser(response)
-        text = parser.get_response_text()
+        return self._validate_summary_text(
+            job_description, parser.get_response_text(), JOB_DESCRIPTION_SUMMARY_FIELDS
+        )
+
+    def _validate_summary_text(
+        self, job_description: str, text: str, fields: list[str]
+    ) -> dict:
+        # Repairs the summary locally where possible and re-asks Gemini only
+        # for the fields that are still missing or invalid.
+        data, is_repaired = parse_json_object_leniently(text)
+        summary, invalid_fields = validate_string_lists(data, fields)
+
+        if is_repaired:
+            metrics.increment("gemini.summaries.repaired")
+        if not invalid_fields:
+            if not is_repaired:
+                metrics.increment("gemini.summaries.valid")
+            return summary
+
+        log.info("Re-asking Gemini for invalid_fields=%s...", invalid_fields)
+        metrics.increment(
+            "gemini.summaries.partial_reasks"
+            if summary
+            else "gemini.summaries.full_reasks"
+        )
+        summary.update(
+            self._parse_job_description_fields(job_description, invalid_fields)
+        )
+        return summary
+
+    def _parse_job_description_fields(
+        self, job_description: str, fields: list[str]
+    ) -> dict:
+        prompt = self._build_summary_prompt(job_description, fields)
+        payload = self._build_payload(prompt, fields)
+        try:
+            response = self._make_request(payload)
+        except Exception as e:
+            log.info("Failed to re-ask Gemini for fields=%s, %s", fields, e)
+            metrics.increment("gemini.summaries.failed")
+            return {}
+
+        parser = GoogleGeminiAPIResponseParser(response)
+        data, _ = parse_json_object_leniently(parser.get_response_text())
+        summary, invalid_fields = validate_string_lists(data, fields)
+        if invalid_fields:
+            metrics.increment("gemini.summaries.failed")
+        return summary
+
+    def stream_relevant_job_description_info(
+        self, job_description: str
+    ) -> Iterator[tuple[str, str]]:
+        job_description = self._compact_job_description(job_description)
+        fields = JOB_DESCRIPTION_SUMMARY_FIELDS
+        local_summary = self._extract_local_summary(job_description)
+        if local_summary is not None:
+            for item in local_summary.get("technical_requirements", []):
+                yield "technical_requirements", item
+            fields = self._get_remaining_fields(local_summary)
+            if not fields:
+                return
+
+        prompt = self._build_summary_prompt(job_description, fields)
+        payload = self._build_payload(prompt, fields)
+        log.debug("Starting to stream prompt=%s...", Payload(prompt))
+        json_parser = IncrementalJSONListParser()
+        texts, streamed_items = [], set()
+
+        try:
+            for response in self._stream_request(payload):
+                text = GoogleGeminiAPIResponseParser(response).get_raw_response_text()
+                texts.append(text)
+                for key, item in json_parser.feed(text):
+                    streamed_items.add((key, item.strip()))
+                    yield key, item
+        except Exception as e:
+            log.info("Failed to stream Gemini summary, %s", e)
+            metrics.increment("gemini.summaries.stream_failures")
+
+        # The streamed text is validated like a regular response once it ends;
+        # items from repaired or re-asked fields that were not streamed follow.
+        summary = self._validate_summary_text(job_description, "".join(texts), fields)
+        for key in fields:
+            for item in summary.get(key, []):
+                if (key, item) not in streamed_items:
+                    yield key, item
+
+    @traced_memory("gemini.batch_summary")
+    def parse_relevant_job_description_info_batch(self, job_descriptions: dict) -> dict:
+        job_descriptions = {
+            job_id: self._compact_job_description(description)
+            for job_id, description in job_descriptions.items()
+        }
+        local_summaries = {
+            job_id: self._extract_local_summary(description)
+            for job_id, description in job_descriptions.items()
+        }
+        if cfg.SKILL_EXTRACTION_MODE == "local":
+            return local_summaries
+
+        # In hybrid mode the LLM is only asked for the fields the local
+        # extractor did not fill, so jobs are batched by their missing fields.
+        results, groups = {}, defaultdict(dict)
+        for job_id, description in job_descriptions.items():
+            local_summary = local_summaries[job_id]
+            fields = (
+                JOB_DESCRIPTION_SUMMARY_FIELDS
+                if local_summary is None
+                else self._get_remaining_fields(local_summary)
+            )
+            if fields:
+                groups[tuple(fields)][job_id] = description
+            else:
+                results[job_id] = local_summary
+        batches = [
+            (list(fields), batch)
+            for fields, group in groups.items()
+            for batch in self._pack_job_descriptions(group)
+        ]
+        log.info(
+            "Starting to summarize %d job descriptions in %d batches...",
+            len(job_descriptions),
+            len(batches),
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=cfg.GOOGLE_GEMINI_MAX_CONCURRENT_REQUESTS
+        ) as executor:
+            summarize_batch = bind_usage_scope(self._summarize_batch)
+            for batch_results in executor.map(
+                summarize_batch,
+                [fields for fields, _ in batches],
+                [batch for _, batch in batches],
+            ):
+                results.update(batch_results)
+
+            failed_ids = [
+                job_id for job_id in job_descriptions if job_id not in results
+            ]
+            if failed_ids:
+                log.info("Resubmitting failed_ids=%s individually...", failed_ids)
+            descriptions = [job_descriptions[job_id] for job_id in failed_ids]
+            parse_description = bind_usage_scope(self._parse_job_description_safely)
+            for job_id, info in zip(
+                failed_ids, executor.map(parse_description, descriptions)
+            ):
+                results[job_id] = info
+
+        for job_id, local_summary in local_summaries.items():
+            if local_summary:
+                results[job_id].update(local_summary)
+
+        return {job_id: results[job_id] for job_id in job_descriptions}
+
+    def _parse_job_description_safely(self, job_description: str) -> dict:
+        try:
+            return self.parse_relevant_job_description_info(job_description)
+        except Exception as e:
+            log.info("Failed to summarize job description, %s", e)
+            metrics.increment("gemini.summaries.failed")
+            return {}
+
+    def _pack_job_descriptions(self, job_descriptions: dict) -> list[dict]:
+        token_budget = cfg.GOOGLE_GEMINI_BATCH_TOKEN_BUDGET - estimate_token_count(
+            LLM_BATCH_JOB_DESCRIPTION_SUMMARY_PROMPT
+        )
+        batches = []
+        batch, batch_tokens = {}, 0
+
+        for job_id, description in job_descriptions.items():
+            tokens = estimate_token_count(description)
+            if batch and (
+                batch_tokens + tokens > token_budget
+                or len(batch) >= cfg.GOOGLE_GEMINI_BATCH_MAX_ITEMS
+            ):
+                batches.append(batch)
+                batch, batch_tokens = {}, 0
+            batch[job_id] = description
+            batch_tokens += tokens
+
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _summarize_batch(self, fields: list[str], batch: dict) -> dict:
+        if fields == JOB_DESCRIPTION_SUMMARY_FIELDS:
+            prompt = LLM_BATCH_JOB_DESCRIPTION_SUMMARY_PROMPT
+        else:
+            prompt = LLM_BATCH_JOB_DESCRIPTION_FIELDS_PROMPT.format(
+                fields=", ".join(fields)
+            )
+        for job_id, description in batch.items():
+            prompt += f"Job id: {job_id}\nJob description: {description}\n\n"
+
+        payload = self._build_payload(prompt)
+        log.debug("Starting to submit batch prompt=%s...", Payload(prompt))
+        try:
+            response = self._make_request(payload)
+        except Exception as e:
+            log.info("Failed to summarize batch of %d, %s", len(batch), e)
+            return {}
+
+        parser = GoogleGeminiAPIResponseParser(response)
+        data, _ = parse_json_object_leniently(parser.get_response_text())
+
+        results = {}
+        for job_id in batch:
+            info = data.get(str(job_id))
+            if not isinstance(info, dict):
+                continue
+            summary, invalid_fields = validate_string_lists(info, fields)
+            if not invalid_fields:
+                results[job_id] = summary
+        return results
+
+    def _extract_local_summary(self, job_description: str) -> dict:
+        if cfg.SKILL_EXTRACTION_MODE == "llm":
+            return None
+        skills = extract_technical_requirements(job_description)
+        metrics.increment(
+            "skills.local_extractions.hits"
+            if skills
+            else "skills.local_extractions.misses"
+        )
+        return {"technical_requirements": skills} if skills else {}
+
+    def _get_remaining_fields(self, local_summary: dict) -> list[str]:
+        if cfg.SKILL_EXTRACTION_MODE != "hybrid":
+            return []
+        return [
+            field
+            for field in JOB_DESCRIPTION_SUMMARY_FIELDS
+            if field not in local_summary
+        ]
+
+    def _build_summary_prompt(self, job_description: str, fields: list[str]) -> str:
+        if fields == JOB_DESCRIPTION_SUMMARY_FIELDS:
+            prompt = LLM_JOB_DESCRIPTION_SUMMARY_PROMPT
+        else:
+            prompt = LLM_JOB_DESCRIPTION_FIELDS_PROMPT.format(fields=", ".join(fields))
+        return prompt + f"Job description: {job_description}"
+
+    def _compact_job_description(self, job_description: str) -> str:
+        compacted = compact_job_description(job_description)
+        metrics.increment("gemini.description_tokens.input", compacted.input_tokens)
+        metrics.increment("gemini.description_tokens.output", compacted.output_tokens)
+        log.info(
+            "Compacted job description from input_tokens=%d to output_tokens=%d",
+            compacted.input_tokens,
+            compacted.output_tokens,
+        )
+        return compacted.text
+
+    def _build_payload(self, prompt: str, fields: list[str] = None) -> dict:
+        generation_config = {"responseMimeType": "application/json"}
+        if fields:
+            generation_config["responseSchema"] = build_job_description_summary_schema(
+                fields
+            )
+        return {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": generation_config,
+        }
+
+    def _stream_request(self, payload: dict) -> Iterator[dict]:
+        ledger = get_usage_ledger()
+        exceeded_budgets = ledger.get_exceeded_budgets("gemini")
+        if exceeded_budgets:
+            raise BudgetExceededError(f"Budgets {exceeded_budgets} exhausted")
 
-        return safe_parse_dict_from_json_str(text)
+        url = f"{self.stream_url}?alt=sse&key={self.api_key}"
+        chunk = {}
+        with get_http_session().post(
+            url, headers=self.headers, json=payload, stream=True
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if line and line.startswith("data:"):
+                    chunk = json.loads(line[len("data:") :])
+                    yield chunk
+        # Each chunk carries the cumulative usage so far; the last one is final.
+        ledger.record_gemini_response(chunk)
+        log.info("Successfully streamed response from url=%r", self.stream_url)
 
-    @retry(log)
+    @retry(log, giveup=(BudgetExceededError,))
+    @metered("gemini", record_gemini_response)
     def _make_request(self, payload: dict) -> dict:
-        url = f"{self.BASE_URL}?key={self.api_key}"
-        response = requests.post(url, headers=self.headers, json=payload)
+        url = f"{self.base_url}?key={self.api_key}"
+        response = get_http_session().post(url, headers=self.headers, json=payload)
         data = response.json()
-        log.info(f"Successfully received response from {url=}, {data=}")
+        log.info(
+            "Successfully received response from url=%r, data=%s",
+            self.base_url,
+            Payload(data),
+        )
         return data
 
 
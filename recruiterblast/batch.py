@@ -0,0 +1,316 @@
+import argparse
+import dataclasses
+import json
+import sys
+import traceback
+import uuid
+from dataclasses import dataclass, field
+
+from recruiterblast.accounting import (
+    format_usage_summary,
+    get_usage_ledger,
+    usage_scope,
+)
+from recruiterblast.constants import (
+    DEFAULT_EMAIL_BODY_TEMPLATE,
+    DEFAULT_EMAIL_SUBJECT_TEMPLATE,
+    JOB_POST_SUMMARY_FIELDS,
+)
+from recruiterblast.logger import setup_logger
+from recruiterblast.models import Company, Employee, JobPost
+from recruiterblast.parsers import parse_linkedin_job_url
+from recruiterblast.templates import OutreachTemplate
+
+log = setup_logger(__name__)
+
+
+@dataclass(slots=True)
+class BatchResult:
+    job_url: str
+    job_post: JobPost = None
+    company: Company = None
+    recruiters: list[Employee] = field(default_factory=list)
+    email_format: str = None
+    error: str = None
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+
+def run_batch(
+    job_urls: list[str],
+    summarize: bool = True,
+    session_id: str = None,
+    profile: bool = None,
+    resolve_email_formats: bool = False,
+) -> list[BatchResult]:
+    from recruiterblast.orchestrator import ScraperOrchestrator
+    from recruiterblast.scrapers import LinkedInScraper
+
+    results = [BatchResult(job_url) for job_url in job_urls]
+    # Job posts from one company share its recruiters and email format, so
+    # the orchestrator fetches recruiters and this loop resolves formats once
+    # per company per batch.
+    email_formats_by_domain = {}
+    with usage_scope(session_id=session_id or uuid.uuid4().hex):
+        scrapers = {}
+        for result in results:
+            try:
+                scrapers[result.job_url] = LinkedInScraper(result.job_url)
+            except Exception as e:
+                record_batch_error(result, e)
+
+        scrape_results = ScraperOrchestrator(profile=profile).run(
+            list(scrapers.values())
+        )
+        scrape_results = dict(zip(scrapers, scrape_results))
+        for result in results:
+            scrape_result = scrape_results.get(result.job_url)
+            if scrape_result is None:
+                continue
+            result.job_post = scrape_result.job_post
+            if result.job_post:
+                result.job_post.job_url = result.job_url
+            result.company = scrape_result.company
+            result.recruiters = scrape_result.recruiters
+            result.error = scrape_result.error
+            domain = result.company.domain if result.company else None
+            if result.error or not resolve_email_formats or not domain:
+                continue
+            try:
+                with usage_scope(job_id=scrape_result.job_id):
+                    if domain not in email_formats_by_domain:
+                        email_formats_by_domain[domain] = resolve_email_format(domain)
+                    result.email_format = email_formats_by_domain[domain]
+            except Exception as e:
+                record_batch_error(result, e)
+
+        if summarize:
+            summarize_job_posts([r.job_post for r in results if r.job_post])
+    return results
+
+
+def record_batch_error(result: BatchResult, e: Exception) -> None:
+    result.error = str(e)
+    log.error(
+        "Failed to process job_url=%r, %s, %s",
+        result.job_url,
+        e,
+        traceback.format_exc(),
+    )
+
+
+def resolve_email_format(domain: str) -> str:
+    from recruiterblast.email_formats import EmailFormatResolver
+    from recruiterblast.scrapers import GoogleSearchScraper
+
+    result = EmailFormatResolver(GoogleSearchScraper()).resolve(domain)
+    return result.email_format if result else None
+
+
+def summarize_job_posts(job_posts: list[JobPost]) -> None:
+    from recruiterblast.api import GoogleGeminiAPIClient
+
+    job_descriptions = {
+        job_post.id: job_post.description
+        for job_post in job_posts
+        if job_post.description
+    }
+    if not job_descriptions:
+        return
+    try:
+        summaries = GoogleGeminiAPIClient().parse_relevant_job_description_info_batch(
+            job_descriptions
+        )
+    except Exception as e:
+        log.error("Failed to summarize job posts, %s, %s", e, traceback.format_exc())
+        return
+
+    for job_post in job_posts:
+        summary = summaries.get(job_post.id) or {}
+        for key, field_name in JOB_POST_SUMMARY_FIELDS.items():
+            if key in summary:
+                setattr(job_post, field_name, summary[key])
+
+
+def read_job_urls(lines) -> list[str]:
+    job_urls = []
+    for line in lines:
+        job_url = parse_linkedin_job_url(line.strip())
+        if job_url:
+            job_urls.append(job_url)
+        elif line.strip():
+            log.info("Skipping invalid job url line=%r", line.strip())
+    return job_urls
+
+
+def iter_result_drafts(results: list[BatchResult], args: argparse.Namespace):
+    from recruiterblast.exports import iter_drafts
+
+    body_template = DEFAULT_EMAIL_BODY_TEMPLATE
+    if args.body_template:
+        with open(args.body_template) as f:
+            body_template = f.read()
+    email_formats = {
+        result.company.domain: result.email_format
+        for result in results
+        if result.company and result.email_format
+    }
+    return iter_drafts(
+        (
+            (result.company, result.job_post, result.recruiters)
+            for result in results
+            if result.company and result.job_post
+        ),
+        OutreachTemplate(args.subject_template, body_template),
+        email_formats,
+    )
+
+
+def write_drafts(results: list[BatchResult], args: argparse.Namespace) -> int:
+    from recruiterblast.exports import write_eml_files, write_mbox
+
+    write = write_eml_files if args.drafts_format == "eml" else write_mbox
+    return write(args.drafts, iter_result_drafts(results, args))
+
+
+def send_drafts(results: list[BatchResult], args: argparse.Namespace) -> int:
+    from recruiterblast.mailer import create_mailer
+
+    mailer = create_mailer()
+    mailer.start()
+    try:
+        count = mailer.send_drafts(iter_result_drafts(results, args), args.send_guesses)
+    finally:
+        mailer.stop()
+    log.info("Queued drafts count=%d, outbox=%s", count, mailer.outbox.get_counts())
+    return count
+
+
+def write_parquet(results: list[BatchResult], args: argparse.Namespace) -> dict:
+    from recruiterblast.parquet import compact_parquet_results, write_parquet_results
+
+    counts = write_parquet_results(
+        args.parquet,
+        (
+            (result.company, result.job_post, result.recruiters)
+            for result in results
+            if result.job_post
+        ),
+    )
+    if args.compact_parquet:
+        compact_parquet_results(args.parquet)
+    return counts
+
+
+def write_recruiter_index(results: list[BatchResult], args: argparse.Namespace) -> int:
+    from recruiterblast.indexes import update_recruiter_index
+
+    index = update_recruiter_index(
+        args.recruiter_index,
+        ((result.company, result.recruiters) for result in results if result.company),
+    )
+    log.info("Indexed recruiters count=%d, path=%r", len(index), args.recruiter_index)
+    return len(index)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Find recruiters for a batch of LinkedIn job posts."
+    )
+    parser.add_argument(
+        "input", help="File with one LinkedIn job url per line, or - for stdin"
+    )
+    parser.add_argument("-o", "--output", help="JSON lines output file")
+    parser.add_argument(
+        "--no-summaries",
+        action="store_true",
+        help="Skip summarizing job descriptions with Gemini",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=None,
+        help="Profile each job regardless of PROFILING_ENABLED",
+    )
+    parser.add_argument(
+        "--drafts",
+        help="Write outreach drafts to this mbox file, or .eml files in this "
+        "directory with --drafts-format eml",
+    )
+    parser.add_argument("--drafts-format", choices=["mbox", "eml"], default="mbox")
+    parser.add_argument(
+        "--send",
+        action="store_true",
+        help="Send the drafts over SMTP from GMAIL_USERNAME, to recruiters whose "
+        "company email format was resolved",
+    )
+    parser.add_argument(
+        "--send-guesses",
+        action="store_true",
+        help="With --send, also send to the single most likely address of "
+        "recruiters whose company email format is unknown",
+    )
+    parser.add_argument(
+        "--subject-template",
+        default=DEFAULT_EMAIL_SUBJECT_TEMPLATE,
+        help="Draft subject template, e.g. 'Your {job_title} role'",
+    )
+    parser.add_argument("--body-template", help="File with the draft body template")
+    parser.add_argument(
+        "--parquet",
+        help="Append job posts, companies and recruiters to Parquet datasets "
+        "in this directory (requires pyarrow)",
+    )
+    parser.add_argument(
+        "--compact-parquet",
+        action="store_true",
+        help="Merge each --parquet partition's files into one after appending",
+    )
+    parser.add_argument(
+        "--recruiter-index",
+        help="Add the recruiters found to this index file, searchable with "
+        "python -m recruiterblast.indexes",
+    )
+    args = parser.parse_args(argv)
+
+    if args.input == "-":
+        job_urls = read_job_urls(sys.stdin)
+    else:
+        with open(args.input) as f:
+            job_urls = read_job_urls(f)
+
+    session_id = uuid.uuid4().hex
+    results = run_batch(
+        job_urls,
+        not args.no_summaries,
+        session_id,
+        args.profile,
+        resolve_email_formats=bool(args.drafts or args.send),
+    )
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for result in results:
+            output.write(json.dumps(result.to_dict(), default=str) + "\n")
+    finally:
+        if args.output:
+            output.close()
+
+    if args.parquet:
+        write_parquet(results, args)
+    if args.recruiter_index:
+        write_recruiter_index(results, args)
+    if args.drafts:
+        write_drafts(results, args)
+    if args.send:
+        send_drafts(results, args)
+
+    with usage_scope(session_id=session_id):
+        summary = get_usage_ledger().summarize()
+    print(format_usage_summary(summary), file=sys.stderr)
+    return 1 if any(result.error for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from recruiterblast.logger import setup_logger
+
+log = setup_logger(__name__)
+
+SENSITIVE_HEADERS = {
+    "authorization",
+    "cookie",
+    "csrf-token",
+    "set-cookie",
+    "x-goog-api-key",
+}
+SENSITIVE_QUERY_PARAMS = {"key", "cx"}
+REDACTED = "REDACTED"
+
+
+class CassetteMissError(Exception):
+    pass
+
+
+def sanitize_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = sorted(
+        (name, REDACTED if name in SENSITIVE_QUERY_PARAMS else value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+    )
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def sanitize_headers(headers) -> dict:
+    return {
+        name: REDACTED if name.lower() in SENSITIVE_HEADERS else value
+        for name, value in dict(headers or {}).items()
+    }
+
+
+def encode_body(body) -> dict:
+    if body is None:
+        return {"text": ""}
+    if isinstance(body, str):
+        body = body.encode()
+    try:
+        return {"text": body.decode()}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(body).decode()}
+
+
+def decode_body(data: dict) -> bytes:
+    if "base64" in data:
+        return base64.b64decode(data["base64"])
+    return data.get("text", "").encode()
+
+
+def build_interaction_key(method: str, url: str, body) -> str:
+    body = body.encode() if isinstance(body, str) else body or b""
+    body_hash = hashlib.sha256(body).hexdigest()
+    return f"{method.upper()} {sanitize_url(url)} {body_hash}"
+
+
+class Cassette:
+    # Recorded HTTP interactions keyed by method, sanitized url and body hash.
+    # Repeated requests replay their recordings in order, then the last one.
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.interactions = []
+        self.replay_positions = defaultdict(int)
+        if os.path.exists(path):
+            with open(path) as f:
+                self.interactions = json.load(f).get("interactions", [])
+
+    def find(self, key: str) -> dict:
+        with self.lock:
+            matches = [i for i in self.interactions if i["key"] == key]
+            if not matches:
+                return None
+            position = self.replay_positions[key]
+            self.replay_positions[key] += 1
+            return matches[min(position, len(matches) - 1)]
+
+    def append(self, interaction: dict) -> None:
+        with self.lock:
+            self.interactions.append(interaction)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"interactions": self.interactions}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+class CassetteAdapter(HTTPAdapter):
+    # Transport adapter that records live responses to a cassette with
+    # credentials stripped, or replays them without touching the network.
+    # `latency` is a fixed delay in seconds, or "recorded" to replay each
+    # interaction's recorded elapsed time.
+    def __init__(self, cassette: Cassette, mode: str, latency="0", **kwargs):
+        super().__init__(**kwargs)
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Invalid cassette mode {mode!r}")
+        self.cassette = cassette
+        self.mode = mode
+        self.latency = latency
+
+    def send(self, request, **kwargs):
+        key = build_interaction_key(request.method, request.url, request.body)
+        if self.mode == "replay":
+            interaction = self.cassette.find(key)
+            if interaction is None:
+                raise CassetteMissError(f"No recorded interaction for {key}")
+            self._simulate_latency(interaction)
+            return self._build_response(request, interaction)
+
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        content = response.content
+        self.cassette.append(
+            {
+                "key": key,
+                "request": {
+                    "method": request.method,
+                    "url": sanitize_url(request.url),
+                    "headers": sanitize_headers(request.headers),
+                    "body": encode_body(request.body),
+                },
+                "response": {
+                    "status": response.status_code,
+                    "reason": response.reason,
+                    "headers": sanitize_headers(response.headers),
+                    "body": encode_body(content),
+                },
+                "elapsed": time.perf_counter() - start,
+            }
+        )
+        log.debug("Recorded interaction key=%r", key)
+        return response
+
+    def _simulate_latency(self, interaction: dict) -> None:
+        if self.latency == "recorded":
+            delay = interaction.get("elapsed", 0)
+        else:
+            delay = float(self.latency or 0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _build_response(self, request, interaction: dict) -> requests.Response:
+        recorded = interaction["response"]
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded.get("reason")
+        response.headers = CaseInsensitiveDict(recorded.get("headers", {}))
+        # Bodies are stored decoded, so the recorded encoding no longer applies.
+        response.headers.pop("content-encoding", None)
+        response.raw = io.BytesIO(decode_body(recorded["body"]))
+        response.url = request.url
+        response.request = request
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
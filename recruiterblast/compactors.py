@@ -0,0 +1,82 @@
+import re
+from dataclasses import dataclass
+
+import recruiterblast.config as cfg
+from recruiterblast.constants import JOB_DESCRIPTION_BOILERPLATE_PATTERNS
+from recruiterblast.utils import estimate_token_count
+
+_BOILERPLATE_REGEX = re.compile(
+    "|".join(JOB_DESCRIPTION_BOILERPLATE_PATTERNS), re.IGNORECASE
+)
+_SENTENCE_BOUNDARY_REGEX = re.compile(r"(?<=[.!?])\s+(?=\S)")
+
+# Compaction that keeps less than this share of the input is assumed to have
+# misfired, and the normalized description is used instead.
+MIN_RETAINED_TOKEN_RATIO = 0.25
+
+
+@dataclass(slots=True)
+class CompactedText:
+    text: str
+    input_tokens: int
+    output_tokens: int
+
+
+def normalize_whitespace(text: str) -> str:
+    text = text.replace(" ", " ").replace("\r\n", "\n")
+    lines = [re.sub(r"[ \t\f\v]+", " ", line).strip() for line in text.split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _get_paragraph_key(paragraph: str) -> str:
+    return re.sub(r"[\W_]+", "", paragraph.lower())
+
+
+def _strip_boilerplate(paragraph: str) -> str:
+    lines = []
+    for line in paragraph.split("\n"):
+        sentences = [
+            sentence
+            for sentence in _SENTENCE_BOUNDARY_REGEX.split(line)
+            if not _BOILERPLATE_REGEX.search(sentence)
+        ]
+        if sentences:
+            lines.append(" ".join(sentences))
+    return "\n".join(lines)
+
+
+def compact_job_description(text: str, token_budget: int = None) -> CompactedText:
+    token_budget = token_budget or cfg.GOOGLE_GEMINI_DESCRIPTION_TOKEN_BUDGET
+    input_tokens = estimate_token_count(text)
+
+    normalized = normalize_whitespace(text)
+    paragraphs, seen_keys = [], set()
+    for paragraph in normalized.split("\n\n"):
+        paragraph = _strip_boilerplate(paragraph)
+        key = _get_paragraph_key(paragraph)
+        if not key or key in seen_keys:
+            continue
+        seen_keys.add(key)
+        paragraphs.append(paragraph)
+
+    compacted = "\n\n".join(paragraphs)
+    if estimate_token_count(compacted) < input_tokens * MIN_RETAINED_TOKEN_RATIO:
+        paragraphs = normalized.split("\n\n")
+        compacted = normalized
+    if estimate_token_count(compacted) > token_budget:
+        compacted = _truncate_to_token_budget(paragraphs, token_budget)
+
+    return CompactedText(compacted, input_tokens, estimate_token_count(compacted))
+
+
+def _truncate_to_token_budget(paragraphs: list[str], token_budget: int) -> str:
+    kept, tokens = [], 0
+    for paragraph in paragraphs:
+        paragraph_tokens = estimate_token_count(paragraph)
+        if tokens + paragraph_tokens > token_budget:
+            if not kept:
+                kept.append(paragraph[: token_budget * 4])
+            break
+        kept.append(paragraph)
+        tokens += paragraph_tokens
+    return "\n\n".join(kept)
@@ -1,28 +1,169 @@
 import os
 
-from dotenv import load_dotenv
+# Settings are resolved on first attribute access (PEP 562) so importing the
+# package never reads `.env` or fails on missing variables; values are cached
+# as module globals after the first lookup.
+_SETTINGS = {
+    "LINKEDIN_CSRF_TOKEN": lambda: os.environ["LINKEDIN_CSRF_TOKEN"],
+    "LINKEDIN_COOKIE": lambda: os.environ["LINKEDIN_COOKIE"],
+    "BING_SEARCH_API_KEY": lambda: os.getenv("BING_SEARCH_API_KEY"),
+    "GOOGLE_SEARCH_API_KEY": lambda: os.getenv("GOOGLE_SEARCH_API_KEY"),
+    "GOOGLE_SEARCH_CUSTOM_SEARCH_ENGINE_ID": lambda: os.getenv(
+        "GOOGLE_SEARCH_CUSTOM_SEARCH_ENGINE_ID"
+    ),
+    "GOOGLE_SEARCH_MAX_PAGES": lambda: int(os.getenv("GOOGLE_SEARCH_MAX_PAGES", 3)),
+    "GOOGLE_SEARCH_PAGE_CONCURRENCY": lambda: int(
+        os.getenv("GOOGLE_SEARCH_PAGE_CONCURRENCY", 1)
+    ),
+    "GOOGLE_SEARCH_DAILY_QUOTA": lambda: int(
+        os.getenv("GOOGLE_SEARCH_DAILY_QUOTA", 100)
+    ),
+    "GOOGLE_SEARCH_QUOTA_RESERVE": lambda: int(
+        os.getenv("GOOGLE_SEARCH_QUOTA_RESERVE", 10)
+    ),
+    "GOOGLE_SEARCH_QUOTA_PATH": lambda: os.getenv("GOOGLE_SEARCH_QUOTA_PATH"),
+    "GOOGLE_SEARCH_COST_PER_QUERY": lambda: float(
+        os.getenv("GOOGLE_SEARCH_COST_PER_QUERY", 0.005)
+    ),
+    "GOOGLE_GEMINI_API_KEY": lambda: os.getenv("GOOGLE_GEMINI_API_KEY"),
+    "GOOGLE_GEMINI_LLM_MODEL": lambda: os.getenv("GOOGLE_GEMINI_LLM_MODEL"),
+    "GOOGLE_GEMINI_BATCH_TOKEN_BUDGET": lambda: int(
+        os.getenv("GOOGLE_GEMINI_BATCH_TOKEN_BUDGET", 24000)
+    ),
+    "GOOGLE_GEMINI_BATCH_MAX_ITEMS": lambda: int(
+        os.getenv("GOOGLE_GEMINI_BATCH_MAX_ITEMS", 10)
+    ),
+    "GOOGLE_GEMINI_MAX_CONCURRENT_REQUESTS": lambda: int(
+        os.getenv("GOOGLE_GEMINI_MAX_CONCURRENT_REQUESTS", 4)
+    ),
+    "GOOGLE_GEMINI_DESCRIPTION_TOKEN_BUDGET": lambda: int(
+        os.getenv("GOOGLE_GEMINI_DESCRIPTION_TOKEN_BUDGET", 2000)
+    ),
+    "GEMINI_INPUT_COST_PER_MILLION_TOKENS": lambda: float(
+        os.getenv("GEMINI_INPUT_COST_PER_MILLION_TOKENS", 0.10)
+    ),
+    "GEMINI_OUTPUT_COST_PER_MILLION_TOKENS": lambda: float(
+        os.getenv("GEMINI_OUTPUT_COST_PER_MILLION_TOKENS", 0.40)
+    ),
+    "USAGE_BUDGETS": lambda: os.getenv("USAGE_BUDGETS", ""),
+    "USAGE_BUDGET_SOFT_LIMIT_RATIO": lambda: float(
+        os.getenv("USAGE_BUDGET_SOFT_LIMIT_RATIO", 0.9)
+    ),
+    "USAGE_LEDGER_MAX_SCOPES": lambda: int(os.getenv("USAGE_LEDGER_MAX_SCOPES", 1000)),
+    "RESPONSE_CACHE_MAX_ENTRIES": lambda: int(
+        os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1024)
+    ),
+    "RESPONSE_CACHE_TTL_SECONDS": lambda: float(
+        os.getenv("RESPONSE_CACHE_TTL_SECONDS", 86400)
+    ),
+    "SKILL_EXTRACTION_MODE": lambda: os.getenv("SKILL_EXTRACTION_MODE", "llm"),
+    "GOOGLE_GEMINI_STREAMING": lambda: os.getenv("GOOGLE_GEMINI_STREAMING", "true")
+    == "true",
+    "EMAIL_MX_VERIFICATION": lambda: os.getenv("EMAIL_MX_VERIFICATION", "true")
+    == "true",
+    "DNS_NAMESERVER": lambda: os.getenv("DNS_NAMESERVER"),
+    "DNS_TIMEOUT_SECONDS": lambda: float(os.getenv("DNS_TIMEOUT_SECONDS", 2.0)),
+    "DNS_MIN_TTL_SECONDS": lambda: int(os.getenv("DNS_MIN_TTL_SECONDS", 300)),
+    "DNS_MAX_TTL_SECONDS": lambda: int(os.getenv("DNS_MAX_TTL_SECONDS", 86400)),
+    "DNS_NEGATIVE_TTL_SECONDS": lambda: int(
+        os.getenv("DNS_NEGATIVE_TTL_SECONDS", 3600)
+    ),
+    "EMAIL_FORMAT_PRIORS_PATH": lambda: os.getenv("EMAIL_FORMAT_PRIORS_PATH"),
+    "EMAIL_PERMUTATION_LIMIT": lambda: int(os.getenv("EMAIL_PERMUTATION_LIMIT", 8)),
+    "EMAIL_FORMAT_CONFIDENCE_THRESHOLD": lambda: float(
+        os.getenv("EMAIL_FORMAT_CONFIDENCE_THRESHOLD", 0.8)
+    ),
+    "EMAIL_FORMAT_RESOLUTION_TIMEOUT_SECONDS": lambda: float(
+        os.getenv("EMAIL_FORMAT_RESOLUTION_TIMEOUT_SECONDS", 10.0)
+    ),
+    "EMAIL_FORMAT_HEDGE_DELAY_SECONDS": lambda: float(
+        os.getenv("EMAIL_FORMAT_HEDGE_DELAY_SECONDS", 2.0)
+    ),
+    "HTTP_CASSETTE_MODE": lambda: os.getenv("HTTP_CASSETTE_MODE", "off"),
+    "HTTP_CASSETTE_PATH": lambda: os.getenv(
+        "HTTP_CASSETTE_PATH", "cassettes/recruiterblast.json"
+    ),
+    "HTTP_CASSETTE_LATENCY": lambda: os.getenv("HTTP_CASSETTE_LATENCY", "0"),
+    "PROFILING_ENABLED": lambda: os.getenv("PROFILING_ENABLED", "false") == "true",
+    "PROFILING_SAMPLE_RATE": lambda: float(os.getenv("PROFILING_SAMPLE_RATE", 1.0)),
+    "PROFILING_INTERVAL_MILLISECONDS": lambda: float(
+        os.getenv("PROFILING_INTERVAL_MILLISECONDS", 5)
+    ),
+    "PROFILING_OUTPUT_DIR": lambda: os.getenv("PROFILING_OUTPUT_DIR", "profiles"),
+    "MEMORY_TRACING_ENABLED": lambda: os.getenv("MEMORY_TRACING_ENABLED", "false")
+    == "true",
+    "MEMORY_TRACING_FRAMES": lambda: int(os.getenv("MEMORY_TRACING_FRAMES", 1)),
+    "COMPANY_STORE_PATH": lambda: os.getenv("COMPANY_STORE_PATH"),
+    "COMPANY_STORE_TTL_SECONDS": lambda: float(
+        os.getenv("COMPANY_STORE_TTL_SECONDS", 30 * 86400)
+    ),
+    "SCRAPER_SOURCE_LIMITS": lambda: os.getenv(
+        "SCRAPER_SOURCE_LIMITS",
+        "linkedin.concurrency=2,linkedin.requests_per_minute=30",
+    ),
+    "RECRUITER_STORE_TTL_SECONDS": lambda: float(
+        os.getenv("RECRUITER_STORE_TTL_SECONDS", 86400)
+    ),
+    "RECRUITER_SEARCH_KEYWORDS": lambda: os.getenv(
+        "RECRUITER_SEARCH_KEYWORDS", "recruiter,talent acquisition"
+    ),
+    "RECRUITER_SEARCH_KEYWORDS_PER_QUERY": lambda: int(
+        os.getenv("RECRUITER_SEARCH_KEYWORDS_PER_QUERY", 5)
+    ),
+    "CACHE_WARMER_WATCHLIST": lambda: os.getenv("CACHE_WARMER_WATCHLIST", ""),
+    "CACHE_WARMER_WINDOWS": lambda: os.getenv("CACHE_WARMER_WINDOWS", "01:00-06:00"),
+    "CACHE_WARMER_TIMEZONE": lambda: os.getenv(
+        "CACHE_WARMER_TIMEZONE", "America/Los_Angeles"
+    ),
+    "CACHE_WARMER_LOOKUPS_PER_HOUR": lambda: float(
+        os.getenv("CACHE_WARMER_LOOKUPS_PER_HOUR", 60)
+    ),
+    "CACHE_WARMER_REFRESH_SECONDS": lambda: float(
+        os.getenv("CACHE_WARMER_REFRESH_SECONDS", 43200)
+    ),
+    "GMAIL_USERNAME": lambda: os.getenv("GMAIL_USERNAME"),
+    "GMAIL_PASSWORD": lambda: os.getenv("GMAIL_PASSWORD"),
+    "SMTP_HOST": lambda: os.getenv("SMTP_HOST", "smtp.gmail.com"),
+    "SMTP_PORT": lambda: int(os.getenv("SMTP_PORT", 587)),
+    "SMTP_STARTTLS": lambda: os.getenv("SMTP_STARTTLS", "true") == "true",
+    "SMTP_TIMEOUT_SECONDS": lambda: float(os.getenv("SMTP_TIMEOUT_SECONDS", 30)),
+    "SMTP_POOL_SIZE": lambda: int(os.getenv("SMTP_POOL_SIZE", 2)),
+    "SMTP_QUEUE_SIZE": lambda: int(os.getenv("SMTP_QUEUE_SIZE", 100)),
+    "SMTP_MESSAGES_PER_MINUTE": lambda: float(
+        os.getenv("SMTP_MESSAGES_PER_MINUTE", 20)
+    ),
+    "SMTP_MAX_ATTEMPTS": lambda: int(os.getenv("SMTP_MAX_ATTEMPTS", 3)),
+    "SMTP_OUTBOX_PATH": lambda: os.getenv("SMTP_OUTBOX_PATH", "outbox.sqlite3"),
+    "ENV": lambda: os.environ["ENV"],
+    "IS_PROD": lambda: _get("ENV") == "prod",
+    "IS_NON_PROD": lambda: _get("ENV") != "prod",
+    "RESUME_LINK": lambda: os.getenv("RESUME_LINK"),
+    "FEEDBACK_EMAIL": lambda: os.getenv("FEEDBACK_EMAIL"),
+    "LOG_PAYLOAD_MAX_CHARS": lambda: int(os.getenv("LOG_PAYLOAD_MAX_CHARS", 1000)),
+    "LOG_PAYLOAD_SAMPLE_RATE": lambda: float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", 1.0)),
+}
 
-load_dotenv()
+_is_loaded = False
 
-LINKEDIN_CSRF_TOKEN = os.environ["LINKEDIN_CSRF_TOKEN"]
-LINKEDIN_COOKIE = os.environ["LINKEDIN_COOKIE"]
 
-BING_SEARCH_API_KEY = os.getenv("BING_SEARCH_API_KEY")
+def load() -> None:
+    global _is_loaded
+    if _is_loaded:
+        return
+    from dotenv import load_dotenv
 
-GOOGLE_SEARCH_API_KEY = os.getenv("GOOGLE_SEARCH_API_KEY")
-GOOGLE_SEARCH_CUSTOM_SEARCH_ENGINE_ID = os.getenv(
-    "GOOGLE_SEARCH_CUSTOM_SEARCH_ENGINE_ID"
-)
+    load_dotenv()
+    _is_loaded = True
 
-GOOGLE_GEMINI_API_KEY = os.getenv("GOOGLE_GEMINI_API_KEY")
-GOOGLE_GEMINI_LLM_MODEL = os.getenv("GOOGLE_GEMINI_LLM_MODEL")
 
-GMAIL_USERNAME = os.getenv("GMAIL_USERNAME")
-GMAIL_PASSWORD = os.getenv("GMAIL_PASSWORD")
+def _get(name: str):
+    return globals()[name] if name in globals() else __getattr__(name)
 
-ENV = os.environ["ENV"]
-IS_PROD = ENV == "prod"
-IS_NON_PROD = ENV != "prod"
 
-RESUME_LINK = os.getenv("RESUME_LINK")
-FEEDBACK_EMAIL = os.getenv("FEEDBACK_EMAIL")
+def __getattr__(name: str):
+    if name not in _SETTINGS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    load()
+    value = _SETTINGS[name]()
+    globals()[name] = value
+    return value
@@ -1,5 +1,9 @@
 GOOGLE_SEARCH_API_URL = "https://customsearch.googleapis.com/customsearch/v1"
+GOOGLE_SEARCH_PAGE_SIZE = 10
+# The Custom Search JSON API never returns results past the 100th.
+GOOGLE_SEARCH_MAX_RESULTS = 100
 GOOGLE_GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/{llm_model}:generateContent"
+GOOGLE_GEMINI_STREAM_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/{llm_model}:streamGenerateContent"
 LINKEDIN_JOB_POST_API_URL = (
     "https://www.linkedin.com/voyager/api/jobs/jobPostings/{job_id}"
     "?decorationId=com.linkedin.voyager.deco.jobs.web.shared.WebFullJobPosting-65&"
@@ -52,6 +56,171 @@ LINKEDIN_API_HEADERS = {
     "x-restli-protocol-version": "2.0.0",
 }
 
+# Matched against single sentences, so every pattern is anchored to the start
+# of the sentence and only names phrasing that is boilerplate on its own.
+JOB_DESCRIPTION_BOILERPLATE_PATTERNS = [
+    r"^\W*(eeo|equal employment opportunity)( statement)?\W*$",
+    r"^\W*apply now\W*$",
+    r"^[\w&,.' -]{0,80}? (is|are) (an? )?(proud )?(equal (employment )?opportunity|affirmative action)[\w /-]* employers?\b",
+    r"^(all )?qualified applicants will receive consideration for employment without regard to\b",
+    r"^pursuant to (the )?[\w ,.'-]{0,60}\bfair chance (ordinance|act)\b",
+    r"^criminal history may have a direct, adverse,? and negative relationship\b",
+    r"^if you (have a disability and )?(need|require) an? (reasonable |workplace )?accommodation\b",
+    r"^[\w&,.' -]{0,80}? participates in e-verify\b",
+    r"^benefits offered may include\b",
+    r"^(our )?compensation reflects the cost of labor\b",
+    r"^this position will remain posted until filled\b",
+]
+
+TECH_SKILLS = {
+    "Python": ["python"],
+    "Java": ["java"],
+    "JavaScript": ["javascript", "js"],
+    "TypeScript": ["typescript"],
+    "Go": ["golang"],
+    "Rust": ["rust"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#"],
+    ".NET": [".net", "dotnet"],
+    "Ruby": ["ruby"],
+    "PHP": ["php"],
+    "Scala": ["scala"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["Swift", "swiftui"],
+    "SQL": ["sql"],
+    "PostgreSQL": ["postgresql", "postgres"],
+    "MySQL": ["mysql"],
+    "NoSQL": ["nosql"],
+    "MongoDB": ["mongodb"],
+    "Redis": ["redis"],
+    "Elasticsearch": ["elasticsearch"],
+    "Snowflake": ["snowflake"],
+    "dbt": ["dbt"],
+    "Airflow": ["airflow"],
+    "Spark": ["Spark", "apache spark", "pyspark"],
+    "Kafka": ["kafka"],
+    "Hadoop": ["hadoop"],
+    "Apache Iceberg": ["iceberg"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "PyTorch": ["pytorch"],
+    "TensorFlow": ["tensorflow"],
+    "Machine Learning": ["machine learning"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi"],
+    "Node.js": ["node.js", "nodejs"],
+    "React": ["React", "react.js", "reactjs", "react native"],
+    "Angular": ["angular"],
+    "Vue": ["vue", "vue.js"],
+    "GraphQL": ["graphql"],
+    "REST APIs": ["REST", "restful", "rest api", "rest apis"],
+    "RPC": ["rpc", "grpc"],
+    "Microservices": ["microservices"],
+    "AWS": ["aws", "amazon web services"],
+    "Azure": ["azure"],
+    "GCP": ["gcp", "google cloud"],
+    "Multi-Cloud": ["multi-cloud"],
+    "Docker": ["docker"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Terraform": ["terraform"],
+    "CloudFormation": ["cloudformation"],
+    "Ansible": ["ansible"],
+    "Infrastructure as Code": ["infrastructure as code", "iac"],
+    "CI/CD": ["ci/cd", "continuous integration", "continuous deployment"],
+    "Azure DevOps": ["azure devops"],
+    "Jenkins": ["jenkins"],
+    "GitHub Actions": ["github actions"],
+    "Git": ["git"],
+    "Linux": ["linux"],
+    "Bash": ["bash", "shell scripting"],
+    "IAM": ["iam"],
+    "Data Lake": ["data lake"],
+    "Distributed Systems": ["distributed systems", "distributed, multi-tiered systems"],
+    "Object-Oriented Design": ["object-oriented design", "object oriented design"],
+    "Data Structures": ["data structures"],
+    "Algorithms": ["algorithms", "algorithm design"],
+    "Relational Databases": ["relational databases"],
+    "Unit Testing": ["unit testing", "unit tests"],
+    "Agile": ["Agile", "agile development", "agile methodologies", "scrum"],
+    "Monitoring": ["Monitoring", "monitoring tools", "observability"],
+    "LiDAR": ["lidar"],
+}
+
+# Share of companies using each RocketReach-style email format, used to rank
+# permutations when no format is known for a domain.
+DEFAULT_EMAIL_FORMAT_PRIORS = {
+    "[first].[last]": 0.35,
+    "[first_initial][last]": 0.2,
+    "[first]": 0.1,
+    "[first][last]": 0.07,
+    "[first]_[last]": 0.04,
+    "[first_initial].[last]": 0.03,
+    "[first][last_initial]": 0.03,
+    "[last]": 0.02,
+    "[first].[last_initial]": 0.02,
+    "[last][first_initial]": 0.02,
+    "[last].[first]": 0.02,
+    "[last][first]": 0.01,
+    "[first_initial][last_initial]": 0.01,
+    "[last]_[first]": 0.01,
+    "[first_initial]_[last]": 0.01,
+}
+
+# Maps the Gemini job description summary fields to `JobPost` attributes.
+JOB_POST_SUMMARY_FIELDS = {
+    "core_responsibilities": "responsibilities",
+    "technical_requirements": "technical_requirements",
+    "soft_skills": "soft_skills",
+    "highlights": "highlights",
+}
+
+ROLE_EMAIL_USERNAMES = {
+    "admin",
+    "careers",
+    "contact",
+    "hello",
+    "help",
+    "hr",
+    "info",
+    "jobs",
+    "marketing",
+    "media",
+    "press",
+    "privacy",
+    "recruiting",
+    "sales",
+    "security",
+    "support",
+    "team",
+}
+
+# Outreach email templates; `{field}` placeholders are filled per job
+# (`job_title`, `job_url`, `company_name`, `resume_link`) and per recruiter
+# (`first_name`, `last_name`, `full_name`).
+DEFAULT_EMAIL_SUBJECT_TEMPLATE = "👋 I'm 92.5% Fit for Your {job_title} Role!"
+DEFAULT_EMAIL_BODY_TEMPLATE = (
+    "Hi {first_name},\n\n"
+    "I value your time, so I’ll keep this brief! My name is Bryan, and "
+    "I recently applied for the {job_title} role at {company_name} [1]. "
+    "I noticed you're on the recruiting team, so I thought I’d reach out in case my "
+    "application gets lost in the shuffle.\n\n"
+    "Here’s a high-level overview of my experience:\n\n"
+    "   ➡️ 4+ years as a backend software engineer\n"
+    "   ➡️ Previously at Bank of America (BofA)\n"
+    "   ➡️ Fixed a memory leak in pipeline processing 10M+ trades -> Saved BofA $221K\n"
+    "   ➡️ Launched bigbagdata.com -> boosted a vintage bag store's sales by 31% in 4 weeks\n"
+    "   ➡️ Relevant tech I've worked with: Python, Flask, SQL, DBT, Airflow, AWS, Apache Iceberg\n\n"
+    "Lastly, I completed Zach Wilson's data engineering bootcamp in Q4 2024 where I was awarded the "
+    "‘Superbness Certificate’ and ‘Outstanding Capstone,’ honors presented to top 1% of class. The "
+    "coursework included conceptual data modeling, slowly changing dimensions (SCDs), cumulative table design, "
+    "write-audit-publish framework.\n\n"
+    "I’ve attached and included a link to my resume below if you’re interested in chatting [2]. "
+    "I look forward to hearing from you. Thanks!\n\n"
+    "[1]: {job_url}\n"
+    "[2]: {resume_link}"
+)
+
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36",
@@ -0,0 +1,323 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+import recruiterblast.config as cfg
+from recruiterblast import metrics
+from recruiterblast.accounting import bind_usage_scope
+from recruiterblast.constants import DEFAULT_EMAIL_FORMAT_PRIORS, ROLE_EMAIL_USERNAMES
+from recruiterblast.logger import Payload, setup_logger
+from recruiterblast.parsers import (
+    parse_emails_from_text,
+    parse_rocket_reach_email_format,
+)
+from recruiterblast.utils import EMAIL_PERMUTATION_FORMATS, format_username
+
+log = setup_logger(__name__)
+
+SCRAPED_EMAIL_WEIGHT = 0.5
+DOMAIN_SMOOTHING = 2.0
+GLOBAL_SMOOTHING = 20.0
+SNIPPET_DEFAULT_CONFIDENCE = 0.7
+SCRAPED_EMAIL_MIN_SAMPLE = 5
+
+
+def normalize_email_format(email_format: str) -> str:
+    # Converts a LeadIQ-style example address (e.g. "First.Last@foobar.com")
+    # to the RocketReach-style format used as the prior key ("[first].[last]").
+    if not email_format:
+        return ""
+    if email_format.startswith("["):
+        return email_format
+    username = email_format.split("@")[0].lower()
+    username = username.replace("first", "%").replace("last", "#")
+    username = username.replace("f", "^").replace("l", ">")
+    for token, replacement in [
+        ("%", "[first]"),
+        ("#", "[last]"),
+        ("^", "[first_initial]"),
+        (">", "[last_initial]"),
+    ]:
+        username = username.replace(token, replacement)
+    return username
+
+
+def infer_email_format(
+    email: str, first_name: str = None, last_name: str = None
+) -> str:
+    username = email.split("@")[0].lower()
+    if username in ROLE_EMAIL_USERNAMES:
+        return ""
+
+    if first_name and last_name:
+        first_name, last_name = first_name.lower(), last_name.lower()
+        for email_format in EMAIL_PERMUTATION_FORMATS:
+            if format_username(email_format, first_name, last_name) == username:
+                return email_format
+        return ""
+
+    # Without a name only separated usernames are unambiguous enough to count.
+    match = re.fullmatch(r"([a-z]+)([._])([a-z]+)", username)
+    if not match:
+        return ""
+    left, sep, right = match.groups()
+    left = "[first_initial]" if len(left) == 1 else "[first]"
+    right = "[last_initial]" if len(right) == 1 else "[last]"
+    return f"{left}{sep}{right}"
+
+
+def infer_scraped_email_format(domain: str, emails: list[str]) -> tuple[str, float]:
+    # Returns the most common format among the domain's addresses with the
+    # share of addresses agreeing on it, discounted when there are only a few.
+    suffix = f"@{domain.lower()}"
+    emails = [e for e in emails if e.lower().endswith(suffix)]
+    formats = Counter(filter(None, map(infer_email_format, emails)))
+    if not formats:
+        return "", 0.0
+    email_format, count = formats.most_common(1)[0]
+    total = sum(formats.values())
+    return email_format, count / total * min(1.0, total / SCRAPED_EMAIL_MIN_SAMPLE)
+
+
+class EmailFormatPriors:
+    # Email format statistics learned from resolved domains. A domain's
+    # distribution is smoothed towards the global one, which is in turn
+    # smoothed towards DEFAULT_EMAIL_FORMAT_PRIORS.
+    def __init__(self, path: str = None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.domain_counts = defaultdict(Counter)
+        self.global_counts = Counter()
+        if path and os.path.exists(path):
+            self._load()
+
+    def observe(self, domain: str, email_format: str, weight: float = 1.0) -> None:
+        email_format = normalize_email_format(email_format)
+        if email_format not in EMAIL_PERMUTATION_FORMATS:
+            return
+        with self.lock:
+            self.domain_counts[domain.lower()][email_format] += weight
+            self.global_counts[email_format] += weight
+
+    def observe_emails(
+        self, domain: str, emails: list[str], weight: float = SCRAPED_EMAIL_WEIGHT
+    ) -> None:
+        for email in emails:
+            if email.lower().endswith(f"@{domain.lower()}"):
+                self.observe(domain, infer_email_format(email), weight)
+
+    def get_probabilities(self, domain: str) -> dict[str, float]:
+        with self.lock:
+            domain_counts = dict(self.domain_counts.get(domain.lower(), {}))
+            global_counts = dict(self.global_counts)
+
+        default_total = sum(DEFAULT_EMAIL_FORMAT_PRIORS.values())
+        global_total = sum(global_counts.values())
+        domain_total = sum(domain_counts.values())
+        probabilities = {}
+        for email_format in EMAIL_PERMUTATION_FORMATS:
+            global_probability = (
+                global_counts.get(email_format, 0.0)
+                + GLOBAL_SMOOTHING
+                * DEFAULT_EMAIL_FORMAT_PRIORS.get(email_format, 0.0)
+                / default_total
+            ) / (global_total + GLOBAL_SMOOTHING)
+            probabilities[email_format] = (
+                domain_counts.get(email_format, 0.0)
+                + DOMAIN_SMOOTHING * global_probability
+            ) / (domain_total + DOMAIN_SMOOTHING)
+        return probabilities
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        # Sources resolve on worker threads, so the write stays under the lock.
+        with self.lock:
+            data = {
+                "domains": {d: dict(c) for d, c in self.domain_counts.items()},
+                "global": dict(self.global_counts),
+            }
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            log.info("Failed to load email format priors from %r, %s", self.path, e)
+            return
+        for domain, counts in data.get("domains", {}).items():
+            self.domain_counts[domain].update(counts)
+        self.global_counts.update(data.get("global", {}))
+
+
+@dataclass(slots=True)
+class EmailFormatResult:
+    source: str
+    email_format: str
+    snippet: str
+    confidence: float
+
+
+def parse_snippet_confidence(snippet: str) -> float:
+    # LeadIQ and RocketReach snippets usually state how often the format is
+    # used, e.g. "used 95% of the time" or "used by 89.8% of ... addresses".
+    match = re.search(r"(\d+(?:\.\d+)?)\s*%", snippet)
+    if not match:
+        return SNIPPET_DEFAULT_CONFIDENCE
+    return min(float(match.group(1)) / 100, 1.0)
+
+
+class EmailFormatResolver:
+    # Queries the email format sources in order, cheapest and most reliable
+    # first, and returns the first result whose confidence reaches the
+    # threshold. The next source is only started once the previous one missed
+    # or has not answered within the hedge delay, so a confident first source
+    # saves the other lookups. When no source is confident enough the most
+    # confident result wins.
+    def __init__(self, scraper, priors: EmailFormatPriors = None):
+        self.scraper = scraper
+        self.priors = priors or get_email_format_priors()
+        self.sources = {
+            "LeadIQ.com": self._resolve_leadiq_format,
+            "RocketReach.co": self._resolve_rocketreach_format,
+            "company domain": self._resolve_scraped_format,
+        }
+
+    def resolve(
+        self,
+        domain: str,
+        threshold: float = None,
+        timeout: float = None,
+        hedge_delay: float = None,
+    ) -> EmailFormatResult:
+        threshold = (
+            cfg.EMAIL_FORMAT_CONFIDENCE_THRESHOLD if threshold is None else threshold
+        )
+        timeout = timeout or cfg.EMAIL_FORMAT_RESOLUTION_TIMEOUT_SECONDS
+        hedge_delay = (
+            cfg.EMAIL_FORMAT_HEDGE_DELAY_SECONDS if hedge_delay is None else hedge_delay
+        )
+        deadline = time.monotonic() + timeout
+        sources = list(self.sources.items())
+        resolve_source = bind_usage_scope(self._resolve_source)
+        executor = ThreadPoolExecutor(max_workers=len(sources))
+        pending, best = set(), None
+        try:
+            while sources or pending:
+                if sources:
+                    source, resolve = sources.pop(0)
+                    pending.add(
+                        executor.submit(
+                            resolve_source, source, resolve, domain, threshold
+                        )
+                    )
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    log.info("Timed out resolving email format for domain=%r", domain)
+                    break
+                done, pending = wait(
+                    pending,
+                    min(hedge_delay, remaining) if sources else remaining,
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done and sources:
+                    metrics.increment("email_formats.hedged_sources")
+                for future in done:
+                    result = future.result()
+                    if result and (not best or result.confidence > best.confidence):
+                        best = result
+                if best and best.confidence >= threshold:
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        metrics.increment(
+            f"email_formats.resolved.{best.source}"
+            if best
+            else "email_formats.unresolved"
+        )
+        if pending:
+            metrics.increment("email_formats.cancelled_sources", len(pending))
+        if sources:
+            metrics.increment("email_formats.skipped_sources", len(sources))
+        log.info("Resolved email format for domain=%r, result=%s", domain, best)
+        return best
+
+    def _resolve_source(
+        self, source: str, resolve_source, domain: str, threshold: float
+    ) -> EmailFormatResult:
+        try:
+            result = resolve_source(domain, threshold)
+        except Exception as e:
+            log.info("Failed to resolve email format from source=%r, %s", source, e)
+            return None
+        if result:
+            result.source = source
+        return result
+
+    def _resolve_leadiq_format(
+        self, domain: str, threshold: float
+    ) -> EmailFormatResult:
+        snippet = self.scraper.scrape_leadiq_suggested_email_format(domain)
+        emails = parse_emails_from_text(snippet or "")
+        return self._build_snippet_result(domain, snippet, emails[0] if emails else "")
+
+    def _resolve_rocketreach_format(
+        self, domain: str, threshold: float
+    ) -> EmailFormatResult:
+        snippet = self.scraper.scrape_rocketreach_suggested_email_format(domain)
+        return self._build_snippet_result(
+            domain, snippet, parse_rocket_reach_email_format(snippet) or ""
+        )
+
+    def _build_snippet_result(
+        self, domain: str, snippet: str, email_format: str
+    ) -> EmailFormatResult:
+        email_format = normalize_email_format(email_format)
+        if email_format not in EMAIL_PERMUTATION_FORMATS:
+            return None
+        self.priors.observe(domain, email_format)
+        self.priors.save()
+        return EmailFormatResult(
+            "", email_format, snippet, parse_snippet_confidence(snippet)
+        )
+
+    def _resolve_scraped_format(
+        self, domain: str, threshold: float
+    ) -> EmailFormatResult:
+        # Pagination stops as soon as the addresses seen agree on a format
+        # confidently enough, not only once enough addresses were found.
+        def has_confident_format(emails: list[str]) -> bool:
+            return infer_scraped_email_format(domain, emails)[1] >= threshold
+
+        emails = self.scraper.scrape_emails_from_company_domain(
+            domain, is_done=has_confident_format
+        )
+        emails = [e for e in emails if e.lower().endswith(f"@{domain.lower()}")]
+        self.priors.observe_emails(domain, emails)
+        self.priors.save()
+
+        email_format, confidence = infer_scraped_email_format(domain, emails)
+        if not email_format:
+            return None
+        log.debug("Inferred format=%r from emails=%s", email_format, Payload(emails))
+        return EmailFormatResult("", email_format, ", ".join(emails), confidence)
+
+
+_email_format_priors = None
+
+
+def get_email_format_priors() -> EmailFormatPriors:
+    global _email_format_priors
+    if _email_format_priors is None:
+        _email_format_priors = EmailFormatPriors(cfg.EMAIL_FORMAT_PRIORS_PATH)
+    return _email_format_priors
@@ -0,0 +1,154 @@
+import functools
+import os
+import quopri
+import re
+import time
+from dataclasses import dataclass
+from email.header import Header
+from email.utils import formatdate, make_msgid
+from typing import Iterable, Iterator
+
+import recruiterblast.config as cfg
+from recruiterblast.email_formats import (
+    get_email_format_priors,
+    normalize_email_format,
+)
+from recruiterblast.logger import setup_logger
+from recruiterblast.models import Company, Employee, JobPost
+from recruiterblast.templates import (
+    OutreachTemplate,
+    build_job_template_context,
+    compile_template,
+    encode_utf8,
+)
+from recruiterblast.utils import format_username
+
+log = setup_logger(__name__)
+
+MESSAGE_ID_DOMAIN = "recruiterblast.local"
+MAX_LINE_LENGTH = 998
+# Headers shared by every draft; X-Unsent makes mail clients open .eml files
+# as drafts.
+STATIC_DRAFT_HEADERS = (
+    b"MIME-Version: 1.0\n"
+    b'Content-Type: text/plain; charset="utf-8"\n'
+    b"X-Unsent: 1\n"
+)
+MBOX_FROM_LINE_PATTERN = re.compile(rb"^(>*From )", re.MULTILINE)
+HEADER_LINE_BREAK_PATTERN = re.compile(r"[ \t]*[\r\n]+[ \t]*")
+
+
+@dataclass(slots=True)
+class Draft:
+    to: list[str]
+    subject: str
+    body: bytes
+    # True when `to` is the one address built from the company's resolved
+    # email format, False when it holds ranked guesses.
+    resolved: bool = False
+
+
+def build_resolved_email(recruiter: Employee, domain: str, email_format: str) -> str:
+    username = format_username(
+        normalize_email_format(email_format),
+        recruiter.first_name.lower(),
+        recruiter.last_name.lower(),
+    )
+    return f"{username}@{domain}"
+
+
+def iter_drafts(
+    jobs: Iterable[tuple[Company, JobPost, list[Employee]]],
+    template: OutreachTemplate = None,
+    email_formats: dict[str, str] = None,
+) -> Iterator[Draft]:
+    # Yields a draft per recruiter per job, addressed to the address built
+    # from the company's format in `email_formats` (keyed by domain) or else
+    # to the recruiter's most likely email permutations, when their name is
+    # known. Templates are compiled once per job.
+    template = template or OutreachTemplate()
+    email_formats = email_formats or {}
+    priors = get_email_format_priors()
+    for company, job_post, recruiters in jobs:
+        context = build_job_template_context(company, job_post)
+        subject = compile_template(template.subject, context, str)
+        body = compile_template(template.body, context, encode_utf8)
+        email_format = email_formats.get(company.domain)
+        probabilities = priors.get_probabilities(company.domain)
+        for recruiter in recruiters:
+            to, resolved = [], False
+            if recruiter.first_name and recruiter.last_name and company.domain:
+                if email_format:
+                    to = [build_resolved_email(recruiter, company.domain, email_format)]
+                    resolved = True
+                else:
+                    to = recruiter.rank_email_permutations(
+                        company.domain, probabilities, cfg.EMAIL_PERMUTATION_LIMIT
+                    )
+            yield Draft(to, subject.render(recruiter), body.render(recruiter), resolved)
+
+
+@functools.lru_cache(maxsize=1024)
+def encode_header_value(value: str) -> str:
+    # Line breaks from templates or job titles are collapsed so a value
+    # cannot end its header and start another one.
+    value = HEADER_LINE_BREAK_PATTERN.sub(" ", value)
+    if value.isascii():
+        return value
+    return Header(value, "utf-8").encode()
+
+
+def encode_draft_body(body: bytes) -> tuple[bytes, bytes]:
+    # 8bit bodies are written as is unless a line exceeds the RFC 5322 limit.
+    if all(len(line) <= MAX_LINE_LENGTH for line in body.split(b"\n")):
+        return b"8bit", body
+    return b"quoted-printable", quopri.encodestring(body)
+
+
+def format_draft(draft: Draft, date: str) -> bytes:
+    encoding, body = encode_draft_body(draft.body)
+    headers = (
+        f"Date: {date}\n"
+        f"Message-ID: {make_msgid(domain=MESSAGE_ID_DOMAIN)}\n"
+        f"To: {HEADER_LINE_BREAK_PATTERN.sub(' ', ', '.join(draft.to))}\n"
+        f"Subject: {encode_header_value(draft.subject)}\n"
+    )
+    return b"".join(
+        [
+            headers.encode(),
+            STATIC_DRAFT_HEADERS,
+            b"Content-Transfer-Encoding: ",
+            encoding,
+            b"\n\n",
+            body,
+            b"\n",
+        ]
+    )
+
+
+def write_mbox(path: str, drafts: Iterable[Draft]) -> int:
+    # Streams drafts to a single mboxrd file; body lines starting with
+    # "From " are escaped so they are not read as message separators.
+    date = formatdate(localtime=True)
+    from_line = f"From MAILER-DAEMON {time.asctime()}\n".encode()
+    count = 0
+    with open(path, "wb") as f:
+        for draft in drafts:
+            message = MBOX_FROM_LINE_PATTERN.sub(rb">\1", format_draft(draft, date))
+            f.write(from_line)
+            f.write(message)
+            f.write(b"\n")
+            count += 1
+    log.info("Wrote count=%d drafts to path=%r", count, path)
+    return count
+
+
+def write_eml_files(directory: str, drafts: Iterable[Draft]) -> int:
+    date = formatdate(localtime=True)
+    os.makedirs(directory, exist_ok=True)
+    count = 0
+    for count, draft in enumerate(drafts, 1):
+        with open(os.path.join(directory, f"draft-{count:06d}.eml"), "wb") as f:
+            f.write(format_draft(draft, date))
+    log.info("Wrote count=%d drafts to directory=%r", count, directory)
+    return count
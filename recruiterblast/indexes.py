@@ -0,0 +1,221 @@
+import argparse
+import bisect
+import dataclasses
+import heapq
+import json
+import math
+import os
+import re
+import sys
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from recruiterblast.models import Company, Employee, RecruiterBatch
+
+STOPWORDS = {"a", "and", "at", "for", "in", "like", "of", "on", "the", "to", "with"}
+FIELD_WEIGHTS = {"headline": 1.0, "locale": 1.0, "company": 1.5}
+PREFIX_MATCH_WEIGHT = 0.5
+LOCATION_MATCH_WEIGHT = 2.0
+TITLE_MATCH_WEIGHT = 0.5
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = re.findall(r"[a-z0-9+#]+", str(text or "").lower())
+    return [token for token in tokens if token not in STOPWORDS]
+
+
+@dataclass(slots=True)
+class RecruiterSearchResult:
+    employee: Employee
+    company: str
+    score: float
+
+
+class RecruiterIndex:
+    # In-memory inverted index over cached recruiters. Each field maps a token
+    # to the ids of the recruiters containing it; a sorted copy of each field's
+    # vocabulary serves prefix lookups.
+    def __init__(self):
+        self.recruiters = RecruiterBatch()
+        self.company_names = []
+        self.company_domains = []
+        self.doc_ids = {}
+        self.postings = {field: defaultdict(set) for field in FIELD_WEIGHTS}
+        self._vocabularies = {}
+
+    def __len__(self) -> int:
+        return len(self.recruiters)
+
+    def add(self, employee: Employee, company: Company) -> None:
+        key = employee.id or employee.profile_url or employee.full_name
+        if key in self.doc_ids:
+            return
+
+        doc_id = len(self.recruiters)
+        self.doc_ids[key] = doc_id
+        self.recruiters.append(employee)
+        self.company_names.append(company.name)
+        self.company_domains.append(company.domain)
+
+        field_texts = {
+            "headline": employee.headline,
+            "locale": employee.locale,
+            "company": f"{company.name or ''} {company.domain or ''}",
+        }
+        for field, text in field_texts.items():
+            for token in tokenize(text):
+                self.postings[field][token].add(doc_id)
+        self._vocabularies.clear()
+
+    def add_many(self, employees: list[Employee], company: Company) -> None:
+        for employee in employees:
+            self.add(employee, company)
+
+    def search(
+        self,
+        query: str = "",
+        location: str = "",
+        job_title: str = "",
+        company: str = "",
+        limit: int = 20,
+    ) -> list[RecruiterSearchResult]:
+        weighted_postings = [
+            self._get_weighted_postings(token, FIELD_WEIGHTS)
+            for token in tokenize(query)
+        ]
+        weighted_postings += [
+            self._get_weighted_postings(token, {"company": 0.0})
+            for token in tokenize(company)
+        ]
+
+        # Intersect the smallest candidate sets first, then score only the
+        # surviving recruiters.
+        candidate_sets = sorted(
+            (
+                set().union(*(doc_ids for doc_ids, _ in postings))
+                for postings in weighted_postings
+            ),
+            key=len,
+        )
+        candidates = (
+            set.intersection(*candidate_sets)
+            if candidate_sets
+            else set(range(len(self.recruiters)))
+        )
+
+        scores = dict.fromkeys(candidates, 0.0)
+        for doc_id in candidates:
+            for postings in weighted_postings:
+                scores[doc_id] += max(
+                    weight for doc_ids, weight in postings if doc_id in doc_ids
+                )
+
+        location_tokens = set(tokenize(location))
+        for token in location_tokens:
+            weight = LOCATION_MATCH_WEIGHT / len(location_tokens)
+            self._boost_scores(scores, self.postings["locale"].get(token, ()), weight)
+        for token in set(tokenize(job_title)):
+            doc_ids = self.postings["headline"].get(token, ())
+            self._boost_scores(scores, doc_ids, TITLE_MATCH_WEIGHT)
+
+        ranked = heapq.nsmallest(
+            limit, scores.items(), key=lambda item: (-item[1], item[0])
+        )
+        return [
+            RecruiterSearchResult(
+                self.recruiters[doc_id], self.company_names[doc_id], score
+            )
+            for doc_id, score in ranked
+        ]
+
+    def _get_weighted_postings(
+        self, token: str, field_weights: dict
+    ) -> list[tuple[set, float]]:
+        weighted_postings = []
+        for field, field_weight in field_weights.items():
+            for match in self._get_prefix_matches(field, token):
+                doc_ids = self.postings[field][match]
+                weight = field_weight * self._get_idf(len(doc_ids))
+                if match != token:
+                    weight *= PREFIX_MATCH_WEIGHT
+                weighted_postings.append((doc_ids, weight))
+        return weighted_postings or [(set(), 0.0)]
+
+    def _get_prefix_matches(self, field: str, prefix: str) -> list[str]:
+        vocabulary = self._vocabularies.get(field)
+        if vocabulary is None:
+            vocabulary = self._vocabularies[field] = sorted(self.postings[field])
+        start = bisect.bisect_left(vocabulary, prefix)
+        end = bisect.bisect_left(vocabulary, prefix + "\uffff")
+        return vocabulary[start:end]
+
+    def _get_idf(self, document_frequency: int) -> float:
+        return math.log(1 + len(self.recruiters) / (1 + document_frequency))
+
+    @staticmethod
+    def _boost_scores(scores: dict, doc_ids: set, weight: float) -> None:
+        for doc_id in doc_ids:
+            if doc_id in scores:
+                scores[doc_id] += weight
+
+    def save(self, path: str) -> None:
+        data = {
+            "recruiters": self.recruiters.columns(),
+            "company_names": self.company_names,
+            "company_domains": self.company_domains,
+        }
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path: str) -> "RecruiterIndex":
+        with open(path) as f:
+            data = json.load(f)
+
+        index = cls()
+        columns = data["recruiters"]
+        companies = zip(data["company_names"], data["company_domains"])
+        for i, (name, domain) in enumerate(companies):
+            employee = Employee(
+                **{field: values[i] for field, values in columns.items()}
+            )
+            index.add(employee, Company(name=name, domain=domain))
+        return index
+
+
+def update_recruiter_index(
+    path: str, jobs: Iterable[tuple[Company, list[Employee]]]
+) -> RecruiterIndex:
+    # Recruiters accumulate in one index file across runs, so later searches
+    # don't have to scrape them again.
+    index = RecruiterIndex.load(path) if os.path.exists(path) else RecruiterIndex()
+    for company, recruiters in jobs:
+        index.add_many(recruiters or [], company)
+    index.save(path)
+    return index
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Search recruiters cached by batch runs with --recruiter-index."
+    )
+    parser.add_argument("index", help="Recruiter index file")
+    parser.add_argument("query", nargs="?", default="", help="e.g. 'tech recruiter'")
+    parser.add_argument("--location", default="", help="Job location to rank by")
+    parser.add_argument("--job-title", default="", help="Job title to rank by")
+    parser.add_argument("--company", default="", help="Company name or domain")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    index = RecruiterIndex.load(args.index)
+    results = index.search(
+        args.query, args.location, args.job_title, args.company, args.limit
+    )
+    for result in results:
+        print(json.dumps(dataclasses.asdict(result), default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
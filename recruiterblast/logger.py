@@ -1,17 +1,113 @@
+import atexit
+import functools
 import logging
+import logging.handlers
+import os
+import queue
+import random
+import reprlib
+import threading
 
 import recruiterblast.config as cfg
 
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_lock = threading.Lock()
+_queue_handler = None
+_handlers = ()
+_listener = None
+
+_payload_repr = reprlib.Repr()
+_payload_repr.maxlevel = 4
+_payload_repr.maxdict = 10
+_payload_repr.maxlist = 10
+_payload_repr.maxstring = 200
+_payload_repr.maxother = 200
+
+
+class Payload:
+    # Wraps a response or prompt passed as a lazy logging argument. The repr is
+    # only built when a handler formats the record, is bounded by reprlib, and
+    # is truncated to LOG_PAYLOAD_MAX_CHARS or omitted when not sampled.
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self) -> str:
+        if random.random() >= cfg.LOG_PAYLOAD_SAMPLE_RATE:
+            return f"<{type(self.value).__name__} omitted>"
+        text = _payload_repr.repr(self.value)
+        max_chars = cfg.LOG_PAYLOAD_MAX_CHARS
+        if len(text) <= max_chars:
+            return text
+        return f"{text[:max_chars]}...<{len(text) - max_chars} chars truncated>"
+
+
+@functools.cache
+def _get_console_log_level() -> int:
+    # Filters are not guarded by `handleError`, so an unset ENV must not make
+    # every log call raise; it falls back to the production level.
+    try:
+        return logging.DEBUG if cfg.ENV != "prod" else logging.INFO
+    except KeyError:
+        return logging.INFO
+
+
+def _is_console_level_enabled(record: logging.LogRecord) -> bool:
+    # Resolved on first emit rather than in setup_logger so that importing a
+    # module does not force the environment to be loaded. Applied on the queue
+    # handler so disabled records are dropped before their message is built.
+    return record.levelno >= _get_console_log_level()
+
+
+def _start_listener() -> None:
+    global _listener
+    _listener = logging.handlers.QueueListener(
+        _queue_handler.queue, *_handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def _get_queue_handler() -> logging.Handler:
+    global _queue_handler, _handlers
+    with _lock:
+        if _queue_handler is None:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            _handlers = (console_handler,)
+            _queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+            _queue_handler.addFilter(_is_console_level_enabled)
+            _start_listener()
+            atexit.register(stop_logging)
+    return _queue_handler
+
+
+def _restart_listener_after_fork() -> None:
+    # The listener thread does not survive fork (e.g. gunicorn workers), so the
+    # child gets a fresh queue and listener for the same handlers.
+    global _lock
+    _lock = threading.Lock()
+    if _listener is None:
+        return
+    _queue_handler.queue = queue.SimpleQueue()
+    _start_listener()
+
+
+os.register_at_fork(after_in_child=_restart_listener_after_fork)
+
+
+def stop_logging() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def setup_logger(name):
     logger = logging.getLogger(name)
     logger.setLevel(logging.DEBUG)
-    console_handler = logging.StreamHandler()
-    log_level = logging.DEBUG if cfg.ENV != "prod" else logging.INFO
-    console_handler.setLevel(log_level)
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    queue_handler = _get_queue_handler()
+    if queue_handler not in logger.handlers:
+        logger.addHandler(queue_handler)
     return logger
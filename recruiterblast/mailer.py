@@ -0,0 +1,385 @@
+import contextlib
+import hashlib
+import queue
+import smtplib
+import sqlite3
+import threading
+import time
+import traceback
+from email.message import EmailMessage
+from email.utils import formatdate
+from typing import Iterable
+
+import recruiterblast.config as cfg
+from recruiterblast import metrics
+from recruiterblast.logger import setup_logger
+from recruiterblast.utils import RateLimiter
+
+log = setup_logger(__name__)
+
+MESSAGE_ID_DOMAIN = "recruiterblast.local"
+# Pooled connections idle for longer than this are checked with NOOP before
+# reuse, as servers drop idle clients.
+SMTP_IDLE_CHECK_SECONDS = 30
+
+OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    key TEXT PRIMARY KEY,
+    sender TEXT NOT NULL,
+    recipients TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body BLOB NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status);
+"""
+
+
+def build_outbox_key(sender: str, to: list[str], subject: str, body: bytes) -> str:
+    data = "\0".join([sender, ",".join(to), subject]).encode() + b"\0" + body
+    return hashlib.sha256(data).hexdigest()
+
+
+def is_transient_smtp_error(error: Exception) -> bool:
+    # 4xx replies, dropped connections and socket errors are worth retrying;
+    # 5xx replies and refused recipients are not.
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+class Outbox:
+    # Persistent record of every message handed to the mailer. A message is
+    # claimed ("sending") before it is sent and marked "sent" after, so a
+    # message found "sending" after a crash may already have gone out; it is
+    # moved to "uncertain" instead of being sent again.
+    def __init__(self, path: str = None):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.executescript(OUTBOX_SCHEMA)
+
+    def add(
+        self, key: str, sender: str, to: list[str], subject: str, body: bytes
+    ) -> bool:
+        now = time.time()
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO outbox (key, sender, recipients, subject, "
+                "body, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 'pending', ?, ?)",
+                (key, sender, ",".join(to), subject, body, now, now),
+            )
+        return cursor.rowcount == 1
+
+    def claim(self, key: str) -> dict:
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                "UPDATE outbox SET status = 'sending', updated_at = ? "
+                "WHERE key = ? AND status = 'pending'",
+                (time.time(), key),
+            )
+            if cursor.rowcount != 1:
+                return None
+            sender, recipients, subject, body = self.connection.execute(
+                "SELECT sender, recipients, subject, body FROM outbox WHERE key = ?",
+                (key,),
+            ).fetchone()
+        return {
+            "sender": sender,
+            "to": recipients.split(","),
+            "subject": subject,
+            "body": body,
+        }
+
+    def record_attempt(self, key: str, error: str = None) -> None:
+        self._update(key, "attempts = attempts + 1, error = ?", error)
+
+    def mark_sent(self, key: str) -> None:
+        self._update(key, "status = 'sent', attempts = attempts + 1, error = ?", None)
+
+    def mark_failed(self, key: str, error: str) -> None:
+        self._update(key, "status = 'failed', error = ?", error)
+
+    def recover(self) -> int:
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                "UPDATE outbox SET status = 'uncertain', updated_at = ? "
+                "WHERE status = 'sending'",
+                (time.time(),),
+            )
+        return cursor.rowcount
+
+    def get_pending_keys(self) -> list[str]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT key FROM outbox WHERE status = 'pending' ORDER BY created_at"
+            ).fetchall()
+        return [key for key, in rows]
+
+    def get_status(self, key: str) -> str:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT status FROM outbox WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_counts(self) -> dict[str, int]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT status, COUNT(*) FROM outbox GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+    def _update(self, key: str, assignments: str, error: str) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"UPDATE outbox SET {assignments}, updated_at = ? WHERE key = ?",
+                (error, time.time(), key),
+            )
+
+
+class SMTPConnectionPool:
+    # Up to `size` authenticated SMTP connections shared across messages.
+    # A connection that raised is closed rather than returned to the pool.
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = None,
+        password: str = None,
+        size: int = 1,
+        starttls: bool = True,
+        timeout: float = 30,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._semaphore = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+
+    @contextlib.contextmanager
+    def connection(self):
+        with self._semaphore:
+            connection = self._get_idle_connection() or self._connect()
+            try:
+                yield connection
+            except BaseException:
+                self._close(connection)
+                raise
+            self._idle.put((connection, time.monotonic()))
+
+    def close(self) -> None:
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(connection)
+
+    def _get_idle_connection(self) -> smtplib.SMTP:
+        while True:
+            try:
+                connection, idle_since = self._idle.get_nowait()
+            except queue.Empty:
+                return None
+            if time.monotonic() - idle_since < SMTP_IDLE_CHECK_SECONDS:
+                return connection
+            try:
+                if connection.noop()[0] == 250:
+                    return connection
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close(connection)
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                connection.starttls()
+            if self.username:
+                connection.login(self.username, self.password)
+        except BaseException:
+            self._close(connection)
+            raise
+        metrics.increment("smtp.connections")
+        log.info("Opened SMTP connection to host=%r port=%d", self.host, self.port)
+        return connection
+
+    @staticmethod
+    def _close(connection: smtplib.SMTP) -> None:
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+
+
+class SMTPMailer:
+    # Sends messages from a bounded queue with a pool of worker threads, at
+    # most `messages_per_minute` for the account. Every message is recorded in
+    # the outbox before it is queued, so a message is sent at most once even
+    # across restarts; transient failures are retried up to `max_attempts`.
+    def __init__(
+        self,
+        pool: SMTPConnectionPool,
+        outbox: Outbox,
+        sender: str,
+        messages_per_minute: float = None,
+        workers: int = None,
+        queue_size: int = None,
+        max_attempts: int = None,
+        retry_delay: float = 1,
+    ):
+        self.pool = pool
+        self.outbox = outbox
+        self.sender = sender
+        self.rate_limiter = RateLimiter(
+            messages_per_minute or cfg.SMTP_MESSAGES_PER_MINUTE, period=60
+        )
+        self.workers = workers or cfg.SMTP_POOL_SIZE
+        self.max_attempts = max_attempts or cfg.SMTP_MAX_ATTEMPTS
+        self.retry_delay = retry_delay
+        self.queue = queue.Queue(maxsize=queue_size or cfg.SMTP_QUEUE_SIZE)
+        self._threads = []
+
+    def start(self) -> None:
+        recovered = self.outbox.recover()
+        if recovered:
+            log.warning(
+                "Found count=%d messages interrupted while sending, marked uncertain",
+                recovered,
+            )
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._run, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        for key in self.outbox.get_pending_keys():
+            self.queue.put(key)
+
+    def enqueue(self, to: list[str], subject: str, body: bytes) -> bool:
+        # Blocks while the queue is full. Returns False for a message that is
+        # already in the outbox.
+        key = build_outbox_key(self.sender, to, subject, body)
+        if not self.outbox.add(key, self.sender, to, subject, body):
+            log.info("Skipping message already in outbox key=%r", key)
+            return False
+        self.queue.put(key)
+        return True
+
+    def send_drafts(self, drafts: Iterable, include_guesses: bool = False) -> int:
+        # Each draft goes to a single address: the one built from a resolved
+        # email format or, with include_guesses, the most likely permutation.
+        # Ranked candidates are never sent together; most of them bounce and
+        # every recipient would see the others.
+        count, skipped = 0, 0
+        for draft in drafts:
+            if not draft.to or not (draft.resolved or include_guesses):
+                skipped += 1
+                continue
+            count += self.enqueue(draft.to[:1], draft.subject, draft.body)
+        if skipped:
+            log.info("Skipped count=%d drafts without a resolved address", skipped)
+        return count
+
+    def stop(self) -> None:
+        # Waits for queued messages to be sent, then closes the pool.
+        self.queue.join()
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.pool.close()
+
+    def _run(self) -> None:
+        while True:
+            key = self.queue.get()
+            try:
+                if key is None:
+                    return
+                self._send(key)
+            except Exception as e:
+                # A worker that dies leaves the rest of the queue unsent and
+                # stop() waiting on it forever, so even logging may not raise.
+                try:
+                    log.error(
+                        "Failed to send key=%r, %s, %s", key, e, traceback.format_exc()
+                    )
+                except Exception:
+                    pass
+            finally:
+                self.queue.task_done()
+
+    def _send(self, key: str) -> None:
+        message = self.outbox.claim(key)
+        if message is None:
+            return
+        # A claimed message is only moved out of "sending" here; one left there
+        # would never be sent or retried.
+        try:
+            self._deliver(key, message)
+        except Exception as e:
+            if self.outbox.get_status(key) == "sending":
+                self.outbox.mark_failed(key, repr(e))
+                metrics.increment("smtp.failed")
+            raise
+
+    def _deliver(self, key: str, message: dict) -> None:
+        email = self._build_message(key, message)
+        for attempt in range(1, self.max_attempts + 1):
+            self.rate_limiter.acquire()
+            try:
+                with self.pool.connection() as connection:
+                    connection.send_message(email)
+            except Exception as e:
+                if not is_transient_smtp_error(e) or attempt == self.max_attempts:
+                    self.outbox.mark_failed(key, repr(e))
+                    metrics.increment("smtp.failed")
+                    log.error(
+                        "Failed to send key=%r after attempt=%d, %s", key, attempt, e
+                    )
+                    return
+                self.outbox.record_attempt(key, repr(e))
+                metrics.increment("smtp.retried")
+                log.info("Retrying key=%r after attempt=%d, %s", key, attempt, e)
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+                continue
+            self.outbox.mark_sent(key)
+            metrics.increment("smtp.sent")
+            log.info("Sent key=%r to=%r", key, message["to"])
+            return
+
+    def _build_message(self, key: str, message: dict) -> EmailMessage:
+        email = EmailMessage()
+        email["From"] = message["sender"]
+        email["To"] = ", ".join(message["to"])
+        email["Subject"] = message["subject"]
+        email["Date"] = formatdate(localtime=True)
+        # A stable Message-ID lets recipients' servers drop duplicates too.
+        email["Message-ID"] = f"<{key}@{MESSAGE_ID_DOMAIN}>"
+        email.set_content(bytes(message["body"]).decode())
+        return email
+
+
+def create_mailer() -> SMTPMailer:
+    if not cfg.GMAIL_USERNAME or not cfg.GMAIL_PASSWORD:
+        raise ValueError("GMAIL_USERNAME and GMAIL_PASSWORD are required to send")
+    pool = SMTPConnectionPool(
+        cfg.SMTP_HOST,
+        cfg.SMTP_PORT,
+        cfg.GMAIL_USERNAME,
+        cfg.GMAIL_PASSWORD,
+        size=cfg.SMTP_POOL_SIZE,
+        starttls=cfg.SMTP_STARTTLS,
+        timeout=cfg.SMTP_TIMEOUT_SECONDS,
+    )
+    return SMTPMailer(pool, Outbox(cfg.SMTP_OUTBOX_PATH), cfg.GMAIL_USERNAME)
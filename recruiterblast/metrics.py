@@ -0,0 +1,20 @@
+import threading
+from collections import Counter
+
+_lock = threading.Lock()
+_counters = Counter()
+
+
+def increment(name: str, value: int = 1) -> None:
+    with _lock:
+        _counters[name] += value
+
+
+def get_counters(prefix: str = "") -> dict[str, int]:
+    with _lock:
+        return {k: v for k, v in _counters.items() if k.startswith(prefix)}
+
+
+def reset_counters() -> None:
+    with _lock:
+        _counters.clear()
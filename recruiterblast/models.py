@@ -1,11 +1,26 @@
-from dataclasses import asdict, dataclass, field
+import itertools
+from array import array
+from dataclasses import dataclass, field, fields
+from typing import Iterable, Iterator
 
-import pandas as pd
+from recruiterblast.utils import (
+    generate_email_permutations,
+    iter_ranked_email_permutations,
+)
 
-from recruiterblast.utils import generate_email_permutations
 
+def _as_field_details_df(obj):
+    import pandas as pd
 
-@dataclass
+    names = [f.name for f in fields(obj)]
+    data = {
+        "Field": names,
+        "Details": [getattr(obj, name) for name in names],
+    }
+    return pd.DataFrame(data)
+
+
+@dataclass(slots=True)
 class Company:
     id: int = None
     name: str = None
@@ -15,14 +30,10 @@ class Company:
     description: str = None
 
     def as_df(self):
-        data = {
-            "Field": list(asdict(self).keys()),
-            "Details": list(asdict(self).values()),
-        }
-        return pd.DataFrame(data)
+        return _as_field_details_df(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class Employee:
     id: int = None
     first_name: str = None
@@ -35,8 +46,21 @@ class Employee:
     def generate_email_permutations(self, domain: str) -> set[str]:
         return generate_email_permutations(self.first_name, self.last_name, domain)
 
+    def iter_ranked_email_permutations(
+        self, domain: str, priors: dict[str, float] = None
+    ) -> Iterator[str]:
+        return iter_ranked_email_permutations(
+            self.first_name, self.last_name, domain, priors
+        )
+
+    def rank_email_permutations(
+        self, domain: str, priors: dict[str, float] = None, limit: int = None
+    ) -> list[str]:
+        emails = self.iter_ranked_email_permutations(domain, priors)
+        return list(itertools.islice(emails, limit))
 
-@dataclass
+
+@dataclass(slots=True)
 class JobPost:
     id: int = None
     title: str = None
@@ -53,8 +77,145 @@ class JobPost:
     description: str = None
 
     def as_df(self):
-        data = {
-            "Field": list(asdict(self).keys()),
-            "Details": list(asdict(self).values()),
-        }
-        return pd.DataFrame(data)
+        return _as_field_details_df(self)
+
+
+EMPLOYEE_FIELDS = tuple(f.name for f in fields(Employee))
+
+
+class _IntColumn:
+    # Optional 64-bit integers in an array with a validity byte per row.
+    __slots__ = ("values", "valid")
+
+    def __init__(self):
+        self.values = array("q")
+        self.valid = bytearray()
+
+    def append(self, value: int) -> None:
+        self.values.append(0 if value is None else value)
+        self.valid.append(value is not None)
+
+    def __getitem__(self, i: int) -> int:
+        return self.values[i] if self.valid[i] else None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def to_list(self) -> list:
+        return [
+            value if valid else None for value, valid in zip(self.values, self.valid)
+        ]
+
+
+class _StringColumn:
+    # Optional strings stored as one contiguous UTF-8 buffer with a 32-bit end
+    # offset per row, as in Arrow, instead of a str object per row.
+    __slots__ = ("data", "offsets", "valid")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("I", [0])
+        self.valid = bytearray()
+
+    def append(self, value: str) -> None:
+        if value is not None:
+            self.data += str(value).encode()
+        self.offsets.append(len(self.data))
+        self.valid.append(value is not None)
+
+    def __getitem__(self, i: int) -> str:
+        if not self.valid[i]:
+            return None
+        return self.data[self.offsets[i] : self.offsets[i + 1]].decode()
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def to_list(self) -> list:
+        return [self[i] for i in range(len(self))]
+
+
+class _DictionaryColumn:
+    # Optional strings encoded as indexes into their distinct values, for
+    # columns that repeat a few values.
+    __slots__ = ("values", "codes", "index")
+
+    def __init__(self):
+        self.values = []
+        self.codes = array("i")
+        self.index = {}
+
+    def append(self, value: str) -> None:
+        if value is None:
+            self.codes.append(-1)
+            return
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, i: int) -> str:
+        code = self.codes[i]
+        return self.values[code] if code >= 0 else None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def to_list(self) -> list:
+        return [self.values[code] if code >= 0 else None for code in self.codes]
+
+
+class RecruiterBatch:
+    # Columnar store of `Employee` records: ids in an int64 array, locales
+    # dictionary-encoded since recruiters from the same company repeat a few
+    # values, and other strings in contiguous UTF-8 buffers. Rows are only
+    # materialized as `Employee` objects when read.
+    __slots__ = EMPLOYEE_FIELDS
+
+    def __init__(self):
+        for name in EMPLOYEE_FIELDS:
+            setattr(self, name, _StringColumn())
+        self.id = _IntColumn()
+        self.locale = _DictionaryColumn()
+
+    @classmethod
+    def from_employees(cls, employees: Iterable[Employee]) -> "RecruiterBatch":
+        batch = cls()
+        batch.extend(employees)
+        return batch
+
+    def append(self, employee: Employee) -> None:
+        for name in EMPLOYEE_FIELDS:
+            getattr(self, name).append(getattr(employee, name))
+
+    def extend(self, employees: Iterable[Employee]) -> None:
+        for employee in employees:
+            self.append(employee)
+
+    def to_employees(self) -> list[Employee]:
+        return list(self)
+
+    def columns(self) -> dict[str, list]:
+        return {name: getattr(self, name).to_list() for name in EMPLOYEE_FIELDS}
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        return pa.table(self.columns())
+
+    def to_pandas(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.columns(), columns=list(EMPLOYEE_FIELDS))
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def __getitem__(self, i: int) -> Employee:
+        return Employee(*(getattr(self, name)[i] for name in EMPLOYEE_FIELDS))
+
+    def __iter__(self) -> Iterator[Employee]:
+        columns = [getattr(self, name).to_list() for name in EMPLOYEE_FIELDS]
+        for row in zip(*columns):
+            yield Employee(*row)
@@ -0,0 +1,224 @@
+import dataclasses
+import re
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from urllib.parse import urlsplit
+
+import recruiterblast.config as cfg
+from recruiterblast import metrics
+from recruiterblast.accounting import bind_usage_scope, usage_scope
+from recruiterblast.logger import setup_logger
+from recruiterblast.models import Company, Employee, JobPost
+from recruiterblast.profiling import profile_run
+from recruiterblast.scrapers import BaseScraper
+from recruiterblast.utils import RateLimiter
+
+log = setup_logger(__name__)
+
+COMPANY_NAME_SUFFIXES = re.compile(
+    r"\b(inc|incorporated|llc|ltd|limited|corp|corporation|co|company|gmbh|plc)\b"
+)
+NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+
+@dataclass(slots=True)
+class SourceLimits:
+    concurrency: int = 1
+    requests_per_minute: float = None
+
+
+@dataclass(slots=True)
+class ScrapeResult:
+    source: str
+    job_id: str = None
+    job_post: JobPost = None
+    company: Company = None
+    recruiters: list[Employee] = field(default_factory=list)
+    error: str = None
+
+
+@dataclass(slots=True)
+class CompanyRecruiters:
+    company: Company
+    recruiters: list[Employee] = field(default_factory=list)
+    sources: list[str] = field(default_factory=list)
+
+
+def parse_source_limits(text: str) -> dict[str, SourceLimits]:
+    # e.g. "linkedin.concurrency=2,linkedin.requests_per_minute=30"
+    limits = {}
+    for item in filter(None, (part.strip() for part in (text or "").split(","))):
+        name, _, value = item.partition("=")
+        source, _, setting = name.strip().partition(".")
+        if setting not in SourceLimits.__slots__ or not source or not value:
+            raise ValueError(f"Invalid source limit {item!r}")
+        source_limits = limits.setdefault(source, SourceLimits())
+        value = int(value) if setting == "concurrency" else float(value)
+        setattr(source_limits, setting, value)
+    return limits
+
+
+def normalize_text(text: str) -> str:
+    return NON_ALPHANUMERIC.sub(" ", (text or "").casefold()).strip()
+
+
+def get_company_key(company: Company) -> str:
+    # Sources share no ids, so companies are matched by domain, then by name
+    # without legal suffixes ("Foo, Inc." and "foo" match).
+    if company.domain:
+        return "domain:" + company.domain.casefold().removeprefix("www.")
+    name = COMPANY_NAME_SUFFIXES.sub(" ", normalize_text(company.name))
+    return "name:" + " ".join(name.split())
+
+
+def get_employee_key(employee: Employee) -> str:
+    if employee.profile_url:
+        url = urlsplit(employee.profile_url.casefold())
+        return "profile:" + url.netloc.removeprefix("www.") + url.path.rstrip("/")
+    return "name:" + normalize_text(
+        employee.full_name or f"{employee.first_name} {employee.last_name}"
+    )
+
+
+def merge_records(record, other):
+    # Fills the fields missing from `record` with those of `other`.
+    for f in fields(record):
+        if getattr(record, f.name) in (None, "") and getattr(other, f.name):
+            setattr(record, f.name, getattr(other, f.name))
+    return record
+
+
+def merge_results(results: list[ScrapeResult]) -> list[CompanyRecruiters]:
+    merged = {}
+    recruiters = {}
+    for result in results:
+        if result.company is None:
+            continue
+        key = get_company_key(result.company)
+        if key not in merged:
+            merged[key] = CompanyRecruiters(Company())
+            recruiters[key] = {}
+        entry = merged[key]
+        merge_records(entry.company, result.company)
+        if result.source not in entry.sources:
+            entry.sources.append(result.source)
+        for recruiter in result.recruiters:
+            recruiter_key = get_employee_key(recruiter)
+            if recruiter_key in recruiters[key]:
+                merge_records(recruiters[key][recruiter_key], recruiter)
+                metrics.increment("orchestrator.duplicate_recruiters")
+            else:
+                recruiters[key][recruiter_key] = dataclasses.replace(recruiter)
+    for key, entry in merged.items():
+        entry.recruiters = list(recruiters[key].values())
+    return list(merged.values())
+
+
+class ScraperOrchestrator:
+    # Runs `BaseScraper` implementations concurrently, each source limited to
+    # its own number of in-flight scrapers and calls per minute, so a second
+    # source adds throughput rather than latency. Results keep the order of
+    # `scrapers`. Scrapers of one source whose job posts share a company
+    # fetch its recruiters once per run. `profile` is passed to `profile_run`
+    # for each scraper.
+    def __init__(self, limits: dict[str, SourceLimits] = None, profile: bool = None):
+        if limits is None:
+            limits = parse_source_limits(cfg.SCRAPER_SOURCE_LIMITS)
+        self.limits = limits
+        self.profile = profile
+        self.lock = threading.Lock()
+        self._rate_limiters = {}
+
+    def run(self, scrapers: list[BaseScraper]) -> list[ScrapeResult]:
+        # Each source gets its own pool, so a slow or saturated source never
+        # holds up the scrapers of another.
+        executors = {
+            source: ThreadPoolExecutor(
+                max_workers=self._get_limits(source).concurrency,
+                thread_name_prefix=f"scraper-{source}",
+            )
+            for source in {scraper.source for scraper in scrapers}
+        }
+        recruiter_fetches = {}
+        try:
+            futures = [
+                executors[scraper.source].submit(
+                    bind_usage_scope(self._scrape), scraper, recruiter_fetches
+                )
+                for scraper in scrapers
+            ]
+            return [future.result() for future in futures]
+        finally:
+            for executor in executors.values():
+                executor.shutdown()
+
+    def run_merged(self, scrapers: list[BaseScraper]) -> list[CompanyRecruiters]:
+        return merge_results(self.run(scrapers))
+
+    def _scrape(self, scraper: BaseScraper, recruiter_fetches: dict) -> ScrapeResult:
+        job_id = getattr(scraper, "job_id", None)
+        result = ScrapeResult(scraper.source, job_id)
+        with usage_scope(job_id=job_id), profile_run(job_id, self.profile):
+            try:
+                if scraper.has_job_post_details:
+                    self._throttle(scraper.source)
+                    result.job_post = scraper.fetch_job_post_details()
+                self._throttle(scraper.source)
+                result.company = scraper.fetch_company_from_job_post()
+                result.recruiters = self._fetch_recruiters(
+                    scraper, result.company, recruiter_fetches
+                )
+            except Exception as e:
+                result.error = str(e)
+                metrics.increment(f"orchestrator.{scraper.source}.failed")
+                log.error(
+                    "Failed to scrape source=%r job_id=%r, %s, %s",
+                    scraper.source,
+                    job_id,
+                    e,
+                    traceback.format_exc(),
+                )
+        return result
+
+    def _fetch_recruiters(
+        self, scraper: BaseScraper, company: Company, recruiter_fetches: dict
+    ) -> list[Employee]:
+        # The first scraper to reach a company fetches its recruiters; the
+        # others wait on its future instead of repeating the search.
+        if not company.domain and not company.name:
+            self._throttle(scraper.source)
+            return scraper.fetch_recruiters_from_company(company)
+        key = (scraper.source, get_company_key(company))
+        with self.lock:
+            future = recruiter_fetches.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = recruiter_fetches[key] = Future()
+        if not is_owner:
+            log.info("Reusing recruiters for company=%r", company.name)
+            metrics.increment(f"orchestrator.{scraper.source}.reused_recruiters")
+            return future.result()
+
+        try:
+            self._throttle(scraper.source)
+            recruiters = scraper.fetch_recruiters_from_company(company)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        future.set_result(recruiters)
+        return recruiters
+
+    def _get_limits(self, source: str) -> SourceLimits:
+        return self.limits.get(source) or SourceLimits()
+
+    def _throttle(self, source: str) -> None:
+        requests_per_minute = self._get_limits(source).requests_per_minute
+        if not requests_per_minute:
+            return
+        with self.lock:
+            if source not in self._rate_limiters:
+                self._rate_limiters[source] = RateLimiter(requests_per_minute, 60)
+            rate_limiter = self._rate_limiters[source]
+        rate_limiter.acquire()
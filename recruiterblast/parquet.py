@@ -0,0 +1,266 @@
+import json
+import os
+import time
+import uuid
+from datetime import date
+from typing import Iterable
+
+from recruiterblast import metrics
+from recruiterblast.logger import setup_logger
+from recruiterblast.models import Company, Employee, JobPost
+
+log = setup_logger(__name__)
+
+JOB_POSTS_DATASET = "job_posts"
+COMPANIES_DATASET = "companies"
+RECRUITERS_DATASET = "recruiters"
+PARTITION_KEY = "export_date"
+PARQUET_COMPRESSION = "zstd"
+# Compacted files list the files they replace, so inputs left behind by an
+# interrupted compaction are removed by the next one instead of being read
+# twice.
+COMPACTED_FROM_KEY = b"recruiterblast.compacted_from"
+
+JOB_POST_COLUMNS = {
+    "id": "string",
+    "company_id": "int64",
+    "title": "string",
+    "apply_url": "string",
+    "is_remote": "bool",
+    "is_easy_apply": "bool",
+    "location": "string",
+    "technical_requirements": "list<string>",
+    "responsibilities": "list<string>",
+    "soft_skills": "list<string>",
+    "highlights": "list<string>",
+    "job_url": "string",
+    "post_date": "string",
+    "description": "string",
+}
+COMPANY_COLUMNS = {
+    "id": "int64",
+    "name": "string",
+    "industry": "string",
+    "domain": "string",
+    "employee_count": "int64",
+    "description": "string",
+}
+RECRUITER_COLUMNS = {
+    "company_id": "int64",
+    "company_domain": "string",
+    "id": "int64",
+    "first_name": "string",
+    "last_name": "string",
+    "full_name": "string",
+    "headline": "string",
+    "locale": "string",
+    "profile_url": "string",
+}
+DATASET_COLUMNS = {
+    JOB_POSTS_DATASET: JOB_POST_COLUMNS,
+    COMPANIES_DATASET: COMPANY_COLUMNS,
+    RECRUITERS_DATASET: RECRUITER_COLUMNS,
+}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export requires pyarrow, pip install pyarrow") from e
+    return pa, pq
+
+
+def build_schema(columns: dict[str, str]):
+    pa, _ = _import_pyarrow()
+    types = {
+        "string": pa.string(),
+        "int64": pa.int64(),
+        "bool": pa.bool_(),
+        "list<string>": pa.list_(pa.string()),
+    }
+    return pa.schema([(name, types[type_name]) for name, type_name in columns.items()])
+
+
+def _to_column_value(value, type_name: str):
+    if type_name == "list<string>":
+        return [str(item) for item in value or []]
+    if value is None or type_name != "string":
+        return value
+    return str(value)
+
+
+def build_table(columns: dict[str, str], rows: Iterable[dict]):
+    # Rows are turned into one list per column, which pyarrow converts much
+    # faster than a list of row dicts.
+    pa, _ = _import_pyarrow()
+    data = {name: [] for name in columns}
+    for row in rows:
+        for name, type_name in columns.items():
+            data[name].append(_to_column_value(row.get(name), type_name))
+    return pa.table(data, schema=build_schema(columns))
+
+
+def iter_job_post_rows(
+    jobs: Iterable[tuple[Company, JobPost, list[Employee]]],
+    companies: dict,
+    recruiters: dict,
+):
+    # Yields a row per job post and collects each company and its recruiters
+    # once, as job posts from one company share them.
+    for company, job_post, job_recruiters in jobs:
+        company = company or Company()
+        key = company.id if company.id is not None else id(company)
+        if key not in companies:
+            companies[key] = company
+            recruiters[key] = (company, job_recruiters or [])
+        row = {name: getattr(job_post, name, None) for name in JOB_POST_COLUMNS}
+        row["company_id"] = company.id
+        yield row
+
+
+def iter_recruiter_rows(recruiters: dict):
+    for company, company_recruiters in recruiters.values():
+        for recruiter in company_recruiters:
+            row = {name: getattr(recruiter, name, None) for name in RECRUITER_COLUMNS}
+            row["company_id"] = company.id
+            row["company_domain"] = company.domain
+            yield row
+
+
+def append_parquet(path: str, table, partition: str) -> str:
+    # Appends are new files in the partition directory, written under a
+    # hidden name and renamed so readers never see a partial file.
+    _, pq = _import_pyarrow()
+    directory = os.path.join(path, f"{PARTITION_KEY}={partition}")
+    os.makedirs(directory, exist_ok=True)
+    name = f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+    tmp_path = os.path.join(directory, f".{name}.tmp")
+    pq.write_table(table, tmp_path, compression=PARQUET_COMPRESSION)
+    os.replace(tmp_path, os.path.join(directory, name))
+    metrics.increment("parquet.files_written")
+    return os.path.join(directory, name)
+
+
+def write_parquet_results(
+    root: str,
+    jobs: Iterable[tuple[Company, JobPost, list[Employee]]],
+    export_date: date = None,
+) -> dict[str, int]:
+    # Appends job posts, companies and recruiters to the datasets under
+    # `root`, partitioned by export date. Returns the rows written per dataset.
+    partition = (export_date or date.today()).isoformat()
+    companies = {}
+    recruiters = {}
+    tables = {
+        JOB_POSTS_DATASET: build_table(
+            JOB_POST_COLUMNS, iter_job_post_rows(jobs, companies, recruiters)
+        ),
+        COMPANIES_DATASET: build_table(
+            COMPANY_COLUMNS,
+            (
+                {name: getattr(company, name) for name in COMPANY_COLUMNS}
+                for company in companies.values()
+            ),
+        ),
+        RECRUITERS_DATASET: build_table(
+            RECRUITER_COLUMNS, iter_recruiter_rows(recruiters)
+        ),
+    }
+    counts = {}
+    for name, table in tables.items():
+        counts[name] = table.num_rows
+        if table.num_rows:
+            append_parquet(os.path.join(root, name), table, partition)
+    log.info("Wrote parquet rows=%s to root=%r", counts, root)
+    return counts
+
+
+def _get_partition_files(directory: str) -> list[str]:
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(".parquet") and not name.startswith((".", "_"))
+    )
+
+
+def _remove_compacted_inputs(directory: str, files: list[str]) -> list[str]:
+    _, pq = _import_pyarrow()
+    removed = set()
+    for path in files:
+        if not os.path.basename(path).startswith("compacted-"):
+            continue
+        metadata = pq.read_schema(path).metadata or {}
+        for name in json.loads(metadata.get(COMPACTED_FROM_KEY, b"[]")):
+            input_path = os.path.join(directory, name)
+            if input_path in files and input_path not in removed:
+                os.remove(input_path)
+                removed.add(input_path)
+    return [path for path in files if path not in removed]
+
+
+def compact_partition(directory: str, min_files: int = 2) -> bool:
+    # Streams the partition's files into a single file one row group at a
+    # time, so compaction needs memory for a row group rather than the
+    # partition.
+    _, pq = _import_pyarrow()
+    files = _remove_compacted_inputs(directory, _get_partition_files(directory))
+    if len(files) < min_files:
+        return False
+    schema = pq.read_schema(files[0])
+    inputs = json.dumps([os.path.basename(path) for path in files])
+    schema = schema.with_metadata(
+        {**(schema.metadata or {}), COMPACTED_FROM_KEY: inputs.encode()}
+    )
+    name = f"compacted-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+    tmp_path = os.path.join(directory, f".{name}.tmp")
+    with pq.ParquetWriter(tmp_path, schema, compression=PARQUET_COMPRESSION) as writer:
+        for path in files:
+            parquet_file = pq.ParquetFile(path)
+            for i in range(parquet_file.num_row_groups):
+                writer.write_table(
+                    parquet_file.read_row_group(i).replace_schema_metadata(
+                        schema.metadata
+                    )
+                )
+    os.replace(tmp_path, os.path.join(directory, name))
+    for path in files:
+        os.remove(path)
+    metrics.increment("parquet.partitions_compacted")
+    log.info("Compacted count=%d files in directory=%r", len(files), directory)
+    return True
+
+
+def compact_parquet_dataset(path: str, min_files: int = 2) -> int:
+    # Returns the number of partitions compacted.
+    if not os.path.isdir(path):
+        return 0
+    return sum(
+        compact_partition(os.path.join(path, name), min_files)
+        for name in sorted(os.listdir(path))
+        if name.startswith(f"{PARTITION_KEY}=")
+    )
+
+
+def compact_parquet_results(root: str, min_files: int = 2) -> int:
+    return sum(
+        compact_parquet_dataset(os.path.join(root, name), min_files)
+        for name in DATASET_COLUMNS
+    )
+
+
+def open_parquet_dataset(root: str, name: str):
+    # A `pyarrow.dataset.Dataset` over every partition; filters on
+    # export_date skip whole partitions and column selections skip the
+    # other columns' pages.
+    pa, _ = _import_pyarrow()
+    import pyarrow.dataset as ds
+
+    return ds.dataset(
+        os.path.join(root, name),
+        format="parquet",
+        partitioning=ds.partitioning(
+            pa.schema([(PARTITION_KEY, pa.string())]), flavor="hive"
+        ),
+    )
@@ -1,10 +1,7 @@
 import json
 import re
 
-import tldextract
-from nameparser import HumanName
-
-from recruiterblast.logger import setup_logger
+from recruiterblast.logger import Payload, setup_logger
 from recruiterblast.utils import iso_to_utc_timestamp
 
 log = setup_logger(__name__)
@@ -21,6 +18,16 @@ def parse_linkedin_job_url(input_str: str) -> str:
     return matches[0] if matches else ""
 
 
+def parse_search_keywords(text: str) -> list[str]:
+    # e.g. "recruiter,talent acquisition"; repeated keywords are dropped.
+    keywords = {}
+    for keyword in (text or "").split(","):
+        keyword = " ".join(keyword.split())
+        if keyword:
+            keywords.setdefault(keyword.casefold(), keyword)
+    return list(keywords.values())
+
+
 def safe_parse_dict_from_json_str(json_str: str) -> dict:
     try:
         return json.loads(json_str)
@@ -28,6 +35,71 @@ def safe_parse_dict_from_json_str(json_str: str) -> dict:
         return {}
 
 
+def repair_json_object_str(text: str) -> str:
+    # Best-effort local repair of near-valid model output: keeps the first
+    # object up to its matching brace, drops trailing commas and closes open
+    # containers. A member cut off mid-value is dropped entirely so it can be
+    # re-requested.
+    start = text.find("{")
+    if start == -1:
+        return ""
+    text = text[start:]
+
+    stack = []
+    last_member_end = 1
+    is_in_string = is_escaped = False
+    for i, char in enumerate(text):
+        if is_in_string:
+            if is_escaped:
+                is_escaped = False
+            elif char == "\\":
+                is_escaped = True
+            elif char == '"':
+                is_in_string = False
+        elif char == '"':
+            is_in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+            if not stack:
+                text = text[: i + 1]
+                break
+        elif char == "," and len(stack) == 1:
+            last_member_end = i
+
+    if is_in_string or len(stack) > 1:
+        text, stack = text[:last_member_end], ["}"]
+    text = re.sub(r"[,:\s]+$", "", text)
+    if stack:
+        text = re.sub(r'([{,])\s*"(?:[^"\\]|\\.)*"$', r"\1", text).rstrip(",")
+    text += "".join(reversed(stack))
+    return re.sub(r",\s*([}\]])", r"\1", text)
+
+
+def parse_json_object_leniently(text: str) -> tuple[dict, bool]:
+    data = safe_parse_dict_from_json_str(text)
+    if isinstance(data, dict) and data:
+        return data, False
+    data = safe_parse_dict_from_json_str(repair_json_object_str(text))
+    if isinstance(data, dict) and data:
+        return data, True
+    return {}, False
+
+
+def validate_string_lists(data: dict, fields: list[str]) -> tuple[dict, list[str]]:
+    valid, invalid_fields = {}, []
+    for field in fields:
+        value = data.get(field)
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list):
+            invalid_fields.append(field)
+            continue
+        valid[field] = [str(item).strip() for item in value if str(item).strip()]
+    return valid, invalid_fields
+
+
 def parse_rocket_reach_email_format(text: str) -> str:
     parts = str(text).split(" ")
     for part in parts:
@@ -40,21 +112,79 @@ class GoogleGeminiAPIResponseParser:
         self.response = response
 
     def remove_json_formatting_text(self, text: str) -> str:
-        text = text.replace("```json\n", "")
-        text = text.replace("\n```", "")
+        text = re.sub(r"^\s*```[a-zA-Z]*\s*", "", text)
+        text = re.sub(r"\s*```\s*$", "", text)
         return text
 
     def get_response_text(self):
-        log.debug(f"Parsing {self.response=}...")
+        log.debug("Parsing self.response=%s...", Payload(self.response))
+        text = self.get_raw_response_text()
+        text = self.remove_json_formatting_text(text)
+        return text
+
+    def get_raw_response_text(self) -> str:
         candidates = self.response.get("candidates", [])
         if not candidates:
             return ""
         content_parts = candidates[0].get("content", {}).get("parts", [])
         if not content_parts:
             return ""
-        text = content_parts[0].get("text", "")
-        text = self.remove_json_formatting_text(text)
-        return text
+        return content_parts[0].get("text", "")
+
+
+class IncrementalJSONListParser:
+    # Consumes a JSON object of string lists (e.g. a streamed Gemini summary)
+    # chunk by chunk and emits each (key, item) pair as soon as the item's
+    # closing quote arrives. Text outside the top-level object, such as
+    # markdown fences, is ignored.
+    def __init__(self):
+        self.stack = []
+        self.key = None
+        self.is_expecting_key = False
+        self.is_in_string = False
+        self.is_escaped = False
+        self.is_done = False
+        self.chars = []
+
+    def feed(self, chunk: str) -> list[tuple[str, str]]:
+        items = []
+        for char in chunk:
+            if self.is_done:
+                break
+            if self.is_in_string:
+                item = self._consume_string_char(char)
+                if item is not None:
+                    items.append(item)
+            elif char == '"' and self.stack:
+                self.is_in_string = True
+            elif char in "{[":
+                self.stack.append(char)
+                self.is_expecting_key = self.stack == ["{"]
+            elif char in "}]" and self.stack:
+                self.stack.pop()
+                self.is_done = not self.stack
+            elif char == "," and self.stack == ["{"]:
+                self.is_expecting_key = True
+        return items
+
+    def _consume_string_char(self, char: str):
+        if self.is_escaped:
+            self.is_escaped = False
+        elif char == "\\":
+            self.is_escaped = True
+        elif char == '"':
+            self.is_in_string = False
+            value = json.loads(f'"{"".join(self.chars)}"')
+            self.chars = []
+            return self._complete_string(value)
+        self.chars.append(char)
+
+    def _complete_string(self, value: str):
+        if self.stack == ["{"] and self.is_expecting_key:
+            self.key = value
+            self.is_expecting_key = False
+        elif self.stack == ["{", "["]:
+            return self.key, value
 
 
 class LinkedInJobPostAPIResponseParser:
@@ -107,11 +237,15 @@ class LinkedinEmployeeAPIResponseParser:
 
     @staticmethod
     def get_employee_first_name(full_name: str) -> str:
+        from nameparser import HumanName
+
         parsed_name = HumanName(full_name)
         return parsed_name.first.replace(" ", "").replace(".", "")
 
     @staticmethod
     def get_employee_last_name(full_name: str) -> str:
+        from nameparser import HumanName
+
         parsed_name = HumanName(full_name)
         return parsed_name.last.replace(" ", "").replace(".", "")
 
@@ -160,6 +294,8 @@ class LinkedinCompanyAPIResponseParser:
 
     @staticmethod
     def get_domain(data: dict) -> str:
+        import tldextract
+
         try:
             url = data["data"]["websiteUrl"]
             extracted = tldextract.extract(url)
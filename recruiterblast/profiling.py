@@ -0,0 +1,184 @@
+import contextlib
+import cProfile
+import functools
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+import recruiterblast.config as cfg
+from recruiterblast import metrics
+from recruiterblast.logger import setup_logger
+
+log = setup_logger(__name__)
+
+# cProfile can only be active once per process on newer interpreters, so only
+# one run is profiled at a time and concurrent runs are skipped.
+_profile_lock = threading.Lock()
+
+_memory_lock = threading.Lock()
+_memory_stages = threading.local()
+_memory_peaks = {}
+_memory_retained = {}
+
+
+def format_frame(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{os.path.basename(code.co_filename)}:{name}"
+
+
+class StackSampler:
+    # Samples one thread's stack every `interval` seconds and counts the
+    # collapsed stacks ("outer;inner;leaf count"), the input format of
+    # flamegraph tools.
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(format_frame(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def should_profile(enabled: bool = None) -> bool:
+    if enabled is None:
+        enabled = cfg.PROFILING_ENABLED
+    return enabled and random.random() < cfg.PROFILING_SAMPLE_RATE
+
+
+@contextlib.contextmanager
+def profile_run(job_id, enabled: bool = None, output_dir: str = None):
+    # Profiles the calling thread for the duration of the block, writing
+    # `<job_id>-<timestamp>.pstats` and `.collapsed` files to `output_dir`.
+    # `enabled` is the per-request flag; it defaults to PROFILING_ENABLED.
+    if not should_profile(enabled):
+        yield None
+        return
+    if not _profile_lock.acquire(blocking=False):
+        log.info("Skipping profile for job_id=%r, another run is profiled", job_id)
+        metrics.increment("profiling.skipped")
+        yield None
+        return
+
+    output_dir = output_dir or cfg.PROFILING_OUTPUT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{job_id}-{time.strftime('%Y%m%dT%H%M%S')}")
+    profiler = cProfile.Profile()
+    sampler = StackSampler(
+        threading.get_ident(), cfg.PROFILING_INTERVAL_MILLISECONDS / 1000
+    )
+    try:
+        sampler.start()
+        profiler.enable()
+        try:
+            yield path
+        finally:
+            profiler.disable()
+            sampler.stop()
+            profiler.dump_stats(f"{path}.pstats")
+            sampler.write(f"{path}.collapsed")
+            metrics.increment("profiling.runs")
+            log.info("Wrote profile for job_id=%r to path=%r", job_id, path)
+    finally:
+        _profile_lock.release()
+
+
+def is_memory_tracing_enabled() -> bool:
+    return cfg.MEMORY_TRACING_ENABLED or tracemalloc.is_tracing()
+
+
+@contextlib.contextmanager
+def trace_memory(stage: str):
+    # Records the peak memory allocated above the starting point while the
+    # block runs, and the memory still allocated when it ends (retained). tracemalloc keeps a single process-wide peak, so a nested
+    # stage folds the peak seen so far into its enclosing stages before
+    # resetting it. Stages running concurrently on other threads inflate each
+    # other's peaks, so budgets should be checked on one thread at a time.
+    if not is_memory_tracing_enabled():
+        yield
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(cfg.MEMORY_TRACING_FRAMES)
+
+    stack = _memory_stages.__dict__.setdefault("stack", [])
+    with _memory_lock:
+        _fold_memory_peak(stack)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+    frame = {"start": current, "peak": 0}
+    stack.append(frame)
+    try:
+        yield
+    finally:
+        with _memory_lock:
+            _fold_memory_peak(stack)
+            stack.pop()
+            current, _ = tracemalloc.get_traced_memory()
+            retained = current - frame["start"]
+            _memory_peaks[stage] = max(_memory_peaks.get(stage, 0), frame["peak"])
+            _memory_retained[stage] = max(_memory_retained.get(stage, 0), retained)
+        log.debug(
+            "Traced stage=%r peak_bytes=%d retained_bytes=%d",
+            stage,
+            frame["peak"],
+            retained,
+        )
+
+
+def _fold_memory_peak(stack: list[dict]) -> None:
+    _, peak = tracemalloc.get_traced_memory()
+    for frame in stack:
+        frame["peak"] = max(frame["peak"], peak - frame["start"])
+
+
+def traced_memory(stage: str):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_memory(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_memory_peaks() -> dict[str, int]:
+    with _memory_lock:
+        return dict(_memory_peaks)
+
+
+def get_retained_memory() -> dict[str, int]:
+    with _memory_lock:
+        return dict(_memory_retained)
+
+
+def reset_memory_peaks() -> None:
+    with _memory_lock:
+        _memory_peaks.clear()
+        _memory_retained.clear()
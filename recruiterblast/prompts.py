@@ -22,3 +22,73 @@ LLM_JOB_DESCRIPTION_SUMMARY_PROMPT = """
 
     Here's the job post:
     """
+
+LLM_BATCH_JOB_DESCRIPTION_SUMMARY_PROMPT = """
+    Summarize each of the following job postings in a structured format and return the results as a JSON string. Use the following categories for every job post:
+
+    core_responsibilities: A concise list of the primary tasks and duties. Do not include generic/cliché phrases such as "Learn and adapt to new technologies," or "Contribute to the improvement of our software development processes."
+    technical_requirements: Outline specific technologies, tools, or methodologies required (e.g., Python, REST APIs, Database Design, Unit Testing, etc.). Avoid including soft skills or qualifications that are not technical (e.g., fast-paced environment, degree requirements).
+    soft_skills: Points detailing essential soft skills and personality traits.
+    highlights: Unique aspects or benefits offered by the company.
+
+    Ensure results return only a JSON dictionary string keyed by the job id of each job post in the exact format shown below.
+    Include every job id exactly once. No explanations, no extra text, no json formatting pre/post text (e.g., ```json\n or \n```),
+    no new line characters (e.g., '\n'), and no context beyond the JSON output.
+
+    {
+      "<job id>": {
+        "core_responsibilities": [ ... ],
+        "technical_requirements": [ ... ],
+        "soft_skills": [ ... ],
+        "highlights": [ ... ]
+      }
+    }
+
+    Here are the job posts:
+    """
+
+LLM_BATCH_JOB_DESCRIPTION_FIELDS_PROMPT = """
+    Summarize each of the following job postings and return the results as a JSON string keyed by the job id of each job post.
+    Each job id maps to an object containing only these categories: {fields}. Each category must be a list of short strings.
+    Use the same category definitions as below:
+
+    core_responsibilities: A concise list of the primary tasks and duties.
+    technical_requirements: Specific technologies, tools, or methodologies required.
+    soft_skills: Essential soft skills and personality traits.
+    highlights: Unique aspects or benefits offered by the company.
+
+    Include every job id exactly once. Return only the JSON dictionary string, with no explanations and no json formatting pre/post text.
+
+    Here are the job posts:
+    """
+
+LLM_JOB_DESCRIPTION_FIELDS_PROMPT = """
+    Summarize the following job posting and return the results as a JSON string containing only these categories: {fields}.
+    Each category must be a list of short strings. Use the same category definitions as below:
+
+    core_responsibilities: A concise list of the primary tasks and duties.
+    technical_requirements: Specific technologies, tools, or methodologies required.
+    soft_skills: Essential soft skills and personality traits.
+    highlights: Unique aspects or benefits offered by the company.
+
+    Return only the JSON dictionary string, with no explanations and no json formatting pre/post text.
+
+    Here's the job post:
+    """
+
+JOB_DESCRIPTION_SUMMARY_FIELDS = [
+    "core_responsibilities",
+    "technical_requirements",
+    "soft_skills",
+    "highlights",
+]
+
+
+def build_job_description_summary_schema(fields: list[str]) -> dict:
+    return {
+        "type": "OBJECT",
+        "properties": {
+            field: {"type": "ARRAY", "items": {"type": "STRING"}} for field in fields
+        },
+        "required": fields,
+    }
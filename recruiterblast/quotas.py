@@ -0,0 +1,105 @@
+import datetime
+import json
+import os
+import threading
+from zoneinfo import ZoneInfo
+
+import recruiterblast.config as cfg
+from recruiterblast import metrics
+from recruiterblast.logger import setup_logger
+
+log = setup_logger(__name__)
+
+# The Custom Search JSON API quota resets at midnight Pacific Time.
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+
+class QuotaExceededError(Exception):
+    pass
+
+
+def get_quota_day() -> str:
+    return datetime.datetime.now(QUOTA_TIMEZONE).date().isoformat()
+
+
+class DailyQuotaBudget:
+    # Tracks queries spent against a daily quota. Essential queries (e.g. the
+    # first page of a search) are refused only once the quota is spent; optional
+    # ones (further pages) are deferred while the remaining quota is within the
+    # reserve, so later searches still get their first page.
+    def __init__(self, name: str, daily_limit: int, reserve: int = 0, path: str = None):
+        self.name = name
+        self.daily_limit = daily_limit
+        self.reserve = reserve
+        self.path = path
+        self.lock = threading.Lock()
+        self.day = get_quota_day()
+        self.used = 0
+        if path and os.path.exists(path):
+            self._load()
+
+    def remaining(self) -> int:
+        with self.lock:
+            self._reset_if_new_day()
+            return max(self.daily_limit - self.used, 0)
+
+    def acquire(self, cost: int = 1, essential: bool = True) -> bool:
+        with self.lock:
+            self._reset_if_new_day()
+            remaining = self.daily_limit - self.used
+            if cost > remaining:
+                metrics.increment(f"{self.name}.quota.refused")
+                raise QuotaExceededError(
+                    f"{self.name} daily quota of {self.daily_limit} is exhausted"
+                )
+            if not essential and remaining - cost < self.reserve:
+                metrics.increment(f"{self.name}.quota.deferred")
+                log.info(
+                    "Deferring optional %s query, remaining=%d reserve=%d",
+                    self.name,
+                    remaining,
+                    self.reserve,
+                )
+                return False
+            self.used += cost
+            self._save()
+        metrics.increment(f"{self.name}.quota.used", cost)
+        return True
+
+    def _reset_if_new_day(self) -> None:
+        day = get_quota_day()
+        if day != self.day:
+            self.day, self.used = day, 0
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"day": self.day, "used": self.used}, f)
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            log.info("Failed to load %s quota from %r, %s", self.name, self.path, e)
+            return
+        if data.get("day") == self.day:
+            self.used = int(data.get("used", 0))
+
+
+_google_search_quota = None
+
+
+def get_google_search_quota() -> DailyQuotaBudget:
+    global _google_search_quota
+    if _google_search_quota is None:
+        _google_search_quota = DailyQuotaBudget(
+            "google.search",
+            cfg.GOOGLE_SEARCH_DAILY_QUOTA,
+            cfg.GOOGLE_SEARCH_QUOTA_RESERVE,
+            cfg.GOOGLE_SEARCH_QUOTA_PATH,
+        )
+    return _google_search_quota
@@ -0,0 +1,220 @@
+import asyncio
+import random
+import struct
+import time
+
+import recruiterblast.config as cfg
+from recruiterblast import metrics
+from recruiterblast.logger import setup_logger
+
+log = setup_logger(__name__)
+
+DNS_TYPE_MX = 15
+DNS_CLASS_IN = 1
+DNS_RCODE_NXDOMAIN = 3
+
+
+class DNSError(Exception):
+    pass
+
+
+# Malformed replies surface as struct.error or IndexError while parsing, and
+# unencodable names as UnicodeError (a ValueError).
+DNS_LOOKUP_ERRORS = (
+    DNSError,
+    OSError,
+    asyncio.TimeoutError,
+    struct.error,
+    IndexError,
+    ValueError,
+)
+
+
+def build_mx_query(domain: str, query_id: int) -> bytes:
+    header = struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 0)
+    question = encode_dns_name(domain) + struct.pack("!HH", DNS_TYPE_MX, DNS_CLASS_IN)
+    return header + question
+
+
+def encode_dns_name(name: str) -> bytes:
+    labels = [label.encode("idna") for label in name.strip(".").split(".") if label]
+    return b"".join(bytes([len(label)]) + label for label in labels) + b"\x00"
+
+
+def decode_dns_name(data: bytes, offset: int) -> tuple[str, int]:
+    labels, end_offset, jumps = [], None, 0
+    while True:
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if end_offset is None:
+                end_offset = offset + 2
+            offset = struct.unpack_from("!H", data, offset)[0] & 0x3FFF
+            jumps += 1
+            if jumps > 32:
+                raise DNSError("Too many compression pointers")
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(data[offset : offset + length].decode("ascii", "replace"))
+        offset += length
+    return ".".join(labels), end_offset if end_offset is not None else offset
+
+
+def parse_mx_response(data: bytes, query_id: int) -> tuple[list[tuple[int, str]], int]:
+    # Returns the (preference, exchange) records and the minimum answer TTL.
+    # Records are None for a domain that does not exist (NXDOMAIN) and empty
+    # for one without MX records (NODATA).
+    response_id, flags, qdcount, ancount, _, _ = struct.unpack_from("!HHHHHH", data)
+    if response_id != query_id:
+        raise DNSError(f"Mismatched DNS response id={response_id}")
+    rcode = flags & 0x000F
+    if rcode == DNS_RCODE_NXDOMAIN:
+        return None, 0
+    if rcode:
+        raise DNSError(f"DNS query failed with rcode={rcode}")
+
+    offset = 12
+    for _ in range(qdcount):
+        _, offset = decode_dns_name(data, offset)
+        offset += 4
+
+    records, ttls = [], []
+    for _ in range(ancount):
+        _, offset = decode_dns_name(data, offset)
+        record_type, _, ttl, rdlength = struct.unpack_from("!HHIH", data, offset)
+        offset += 10
+        if record_type == DNS_TYPE_MX:
+            preference = struct.unpack_from("!H", data, offset)[0]
+            exchange, _ = decode_dns_name(data, offset + 2)
+            records.append((preference, exchange))
+            ttls.append(ttl)
+        offset += rdlength
+
+    return sorted(records), min(ttls, default=0)
+
+
+def get_system_nameserver() -> str:
+    try:
+        with open("/etc/resolv.conf") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver":
+                    return parts[1]
+    except OSError:
+        pass
+    return "8.8.8.8"
+
+
+class _DNSClientProtocol(asyncio.DatagramProtocol):
+    def __init__(self, query: bytes, future: asyncio.Future):
+        self.query = query
+        self.future = future
+
+    def connection_made(self, transport):
+        transport.sendto(self.query)
+
+    def datagram_received(self, data, addr):
+        if not self.future.done():
+            self.future.set_result(data)
+
+    def error_received(self, exc):
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+class MXResolver:
+    # Async MX lookups over UDP with a TTL-bounded cache. Concurrent lookups
+    # for the same domain on the same event loop share one in-flight query, so
+    # a batch of recruiters costs one query per domain. In-flight queries are
+    # keyed by loop because the resolver is shared by runs on different loops.
+    def __init__(self, nameserver: str = None, port: int = 53, timeout: float = None):
+        self.nameserver = nameserver or cfg.DNS_NAMESERVER or get_system_nameserver()
+        self.port = port
+        self.timeout = timeout or cfg.DNS_TIMEOUT_SECONDS
+        self.cache = {}
+        self.pending = {}
+
+    async def resolve_mx(self, domain: str) -> list[str]:
+        # Returns None for a domain that does not exist.
+        domain = domain.lower().strip(".")
+        cached = self.cache.get(domain)
+        if cached and cached[0] > time.monotonic():
+            metrics.increment("dns.mx.cache_hits")
+            return cached[1]
+
+        key = (asyncio.get_running_loop(), domain)
+        if key not in self.pending:
+            self.pending[key] = asyncio.ensure_future(self._query_mx(domain))
+        try:
+            return await asyncio.shield(self.pending[key])
+        finally:
+            self.pending.pop(key, None)
+
+    async def can_receive_mail(self, domain: str) -> bool:
+        try:
+            exchanges = await self.resolve_mx(domain)
+        except DNS_LOOKUP_ERRORS as e:
+            log.info(
+                "Failed to resolve MX for domain=%r, assuming deliverable, %s",
+                domain,
+                e,
+            )
+            return True
+        # Only a missing domain or a null MX (a single "." exchange, RFC 7505)
+        # rules out mail. A domain without MX records falls back to its A/AAAA
+        # records (implicit MX, RFC 5321 section 5.1), so it stays deliverable.
+        return exchanges is not None and exchanges != [""]
+
+    async def _query_mx(self, domain: str) -> list[str]:
+        metrics.increment("dns.mx.queries")
+        query_id = random.randint(0, 0xFFFF)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _DNSClientProtocol(build_mx_query(domain, query_id), future),
+            remote_addr=(self.nameserver, self.port),
+        )
+        try:
+            data = await asyncio.wait_for(future, self.timeout)
+        finally:
+            transport.close()
+
+        records, ttl = parse_mx_response(data, query_id)
+        exchanges = None if records is None else [exchange for _, exchange in records]
+        ttl = ttl if exchanges else cfg.DNS_NEGATIVE_TTL_SECONDS
+        ttl = min(max(ttl, cfg.DNS_MIN_TTL_SECONDS), cfg.DNS_MAX_TTL_SECONDS)
+        self.cache[domain] = (time.monotonic() + ttl, exchanges)
+        log.info("Resolved domain=%r exchanges=%s ttl=%d", domain, exchanges, ttl)
+        return exchanges
+
+
+_mx_resolver = None
+
+
+def get_mx_resolver() -> MXResolver:
+    global _mx_resolver
+    if _mx_resolver is None:
+        _mx_resolver = MXResolver()
+    return _mx_resolver
+
+
+def get_email_domain(email: str) -> str:
+    return email.rsplit("@", 1)[-1].lower()
+
+
+async def prune_email_candidates(candidates: dict, resolver: MXResolver = None) -> dict:
+    # Drops every candidate address whose domain cannot receive mail, keeping
+    # each list's order. Each distinct domain is resolved once.
+    resolver = resolver or get_mx_resolver()
+    domains = list(
+        {get_email_domain(email) for emails in candidates.values() for email in emails}
+    )
+    results = await asyncio.gather(*map(resolver.can_receive_mail, domains))
+    deliverable_domains = {domain for domain, ok in zip(domains, results) if ok}
+    return {
+        key: [
+            email for email in emails if get_email_domain(email) in deliverable_domains
+        ]
+        for key, emails in candidates.items()
+    }
@@ -1,27 +1,45 @@
+import math
 import re
 from abc import ABC, abstractmethod
-
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from urllib.parse import quote
 
 import recruiterblast.config as cfg
+from recruiterblast import metrics
+from recruiterblast.accounting import (
+    BudgetExceededError,
+    bind_usage_scope,
+    is_response_cached,
+    metered,
+    record_google_response,
+)
 from recruiterblast.constants import (
     GOOGLE_SEARCH_API_URL,
+    GOOGLE_SEARCH_MAX_RESULTS,
+    GOOGLE_SEARCH_PAGE_SIZE,
     LINKEDIN_API_HEADERS,
     LINKEDIN_COMPANY_API_URL,
     LINKEDIN_COMPANY_ENTITY_API_URL,
     LINKEDIN_EMPLOYEE_API_URL,
     LINKEDIN_JOB_POST_API_URL,
 )
-from recruiterblast.logger import setup_logger
+from recruiterblast.logger import Payload, setup_logger
 from recruiterblast.models import Company, Employee, JobPost
 from recruiterblast.parsers import (
     LinkedinCompanyAPIResponseParser,
     LinkedinEmployeeAPIResponseParser,
     LinkedInJobPostAPIResponseParser,
     parse_emails_from_text,
+    parse_search_keywords,
 )
+from recruiterblast.profiling import traced_memory
+from recruiterblast.quotas import QuotaExceededError, get_google_search_quota
+from recruiterblast.sessions import get_http_session
+from recruiterblast.stores import get_company_store
 from recruiterblast.utils import (
     Timer,
+    build_or_query,
     get_random_user_agent,
     retry,
     sleep_for_random_n_seconds,
@@ -31,22 +49,36 @@ log = setup_logger(__name__)
 
 
 class BaseScraper(ABC):
+    # Name used to group scrapers for per-source limits and merged results.
+    source = "base"
+    # Whether `fetch_job_post_details` requests anything from the source.
+    has_job_post_details = False
+
     @abstractmethod
     def fetch_company_from_job_post(self) -> Company: ...
 
     @abstractmethod
     def fetch_recruiters_from_company(self, company: Company) -> list[Employee]: ...
 
+    def fetch_job_post_details(self) -> JobPost:
+        return None
+
 
 class LinkedInScraper(BaseScraper):
-    def __init__(self, job_post_url: str):
+    source = "linkedin"
+    has_job_post_details = True
+
+    def __init__(self, job_post_url: str = None):
         self.job_post_url = job_post_url
         self.headers = LINKEDIN_API_HEADERS
         self._update_auth_headers()
-        self.job_id = self._parse_job_id_from_job_post_url(job_post_url)
+        self.job_id = (
+            self._parse_job_id_from_job_post_url(job_post_url) if job_post_url else None
+        )
 
+    @traced_memory("linkedin.job_post")
     def fetch_job_post_details(self) -> JobPost:
-        log.info(f"Starting to fetch job post details...")
+        log.info("Starting to fetch job post details...")
         job_post = JobPost()
 
         response = self._fetch_job_post_details()
@@ -60,12 +92,22 @@ class LinkedInScraper(BaseScraper):
         job_post.is_remote = parser.get_is_remote()
         job_post.apply_url = parser.get_apply_url()
 
-        log.info(f"Successfully fetched {job_post=}")
+        log.info("Successfully fetched job_post=%s", Payload(job_post))
 
         return job_post
 
+    @traced_memory("linkedin.company")
     def fetch_company_from_job_post(self) -> Company:
-        log.info(f"Starting to fetch company details from {self.job_post_url=}...")
+        log.info(
+            "Starting to fetch company details from self.job_post_url=%r...",
+            self.job_post_url,
+        )
+
+        store = get_company_store()
+        company = store.get_company_for_job(self.job_id)
+        if company:
+            log.info("Found stored %s", Payload(company))
+            return company
 
         company = Company()
         parser = LinkedinCompanyAPIResponseParser()
@@ -78,53 +120,135 @@ class LinkedInScraper(BaseScraper):
         company.description = parser.get_company_description(data)
         company.employee_count = parser.get_employee_count(data)
 
-        company_data = self._fetch_company_entity_data(company)
-        company.domain = parser.get_domain(company_data)
+        # Other job posts from the same company already resolved its domain.
+        stored_company = store.get_company(company.id)
+        if stored_company:
+            company.domain = stored_company.domain
+        else:
+            company.domain = self.fetch_company_domain(company)
 
-        log.info(f"Successfully added {company}")
+        store.save(self.job_id, company)
+        log.info("Successfully added %s", Payload(company))
 
         return company
 
+    def fetch_company_domain(self, company: Company) -> str:
+        data = self._fetch_company_entity_data(company)
+        return LinkedinCompanyAPIResponseParser.get_domain(data)
+
+    @traced_memory("linkedin.recruiters")
     def fetch_recruiters_from_company(self, company: Company) -> list[Employee]:
-        log.info(f"Starting to fetch recruiters from {company=}...")
+        log.info("Starting to fetch recruiters from company=%s...", Payload(company))
+
+        store = get_company_store()
+        recruiters = store.get_recruiters(company.id)
+        if recruiters is not None:
+            log.info(
+                "Found %d stored recruiters for company_id=%r",
+                len(recruiters),
+                company.id,
+            )
+            return recruiters
 
         employees = {}
-        keywords = ["recruiter", "talent%20acquisition"]
+        # Recruiters matched by more than one keyword, i.e. the results a
+        # per-keyword search would have fetched twice.
+        overlapping = set()
+        keywords = parse_search_keywords(cfg.RECRUITER_SEARCH_KEYWORDS)
         parser = LinkedinEmployeeAPIResponseParser()
 
-        for keyword in keywords:
-            data = self._fetch_recruiters_from_company(company, keyword)
+        for result, keyword in self._iter_recruiter_search_results(company, keywords):
+            if not self._is_valid_public_employee(result):
+                continue
 
-            for result in data["included"]:
-                if not self._is_valid_public_employee(result):
-                    continue
+            employee = Employee()
+            employee.id = parser.get_employee_id(result)
 
-                employee = Employee()
-                employee.id = parser.get_employee_id(result)
+            if employee.id in employees:
+                log.debug("Skipping duplicate employee=%s...", employee)
+                overlapping.add(employee.id)
+                continue
 
-                if employee.id in employees:
-                    log.debug(f"Skipping duplicate {employee=}...")
-                    continue
+            employee.headline = parser.get_employee_headline(result)
+            employee.profile_url = parser.get_employee_profile_url(result)
+            employee.locale = parser.get_employee_locale(result)
 
-                employee.headline = parser.get_employee_headline(result)
-                employee.profile_url = parser.get_employee_profile_url(result)
-                employee.locale = parser.get_employee_locale(result)
+            employee.full_name = parser.get_employee_name(result)
+            employee.first_name = parser.get_employee_first_name(employee.full_name)
+            employee.last_name = parser.get_employee_last_name(employee.full_name)
 
-                employee.full_name = parser.get_employee_name(result)
-                employee.first_name = parser.get_employee_first_name(employee.full_name)
-                employee.last_name = parser.get_employee_last_name(employee.full_name)
+            employees[employee.id] = employee
+            if keyword is None and self._count_matched_keywords(employee, keywords) > 1:
+                overlapping.add(employee.id)
 
-                employees[employee.id] = employee
+            log.info("Successfully added i=%d, %s", len(employees), employee)
 
-                log.info(f"Successfully added i={len(employees)}, {employee}")
+        metrics.increment("linkedin.recruiter_search.recruiters", len(employees))
+        metrics.increment("linkedin.recruiter_search.overlapping", len(overlapping))
+        log.info(
+            "Found %d recruiters for company_id=%r, overlap_ratio=%.2f",
+            len(employees),
+            company.id,
+            len(overlapping) / len(employees) if employees else 0.0,
+        )
 
-        return list(employees.values())
+        recruiters = list(employees.values())
+        # An empty list is more likely a transient or auth failure than a
+        # company without recruiters, so it is not stored.
+        if recruiters:
+            store.save_recruiters(company.id, recruiters)
+        return recruiters
 
     def fetch_company_and_recruiter_data(self) -> tuple[Company, list[Employee]]:
         company = self.fetch_company_from_job_post()
         recruiters = self.fetch_recruiters_from_company(company)
         return company, recruiters
 
+    def _iter_recruiter_search_results(self, company: Company, keywords: list[str]):
+        # Yields (result, keyword) pairs, searching up to
+        # RECRUITER_SEARCH_KEYWORDS_PER_QUERY keywords per OR query. A group
+        # whose OR query fails or is rejected is searched one keyword at a
+        # time, as is one that finds nobody, in case LinkedIn ignored the OR
+        # syntax. The keyword is None for results of an OR query.
+        size = max(cfg.RECRUITER_SEARCH_KEYWORDS_PER_QUERY, 1)
+        for i in range(0, len(keywords), size):
+            group = keywords[i : i + size]
+            if len(group) > 1:
+                results = self._search_recruiters_with_or_query(company, group)
+                if results is not None:
+                    yield from ((result, None) for result in results)
+                    continue
+            for keyword in group:
+                data = self._search_recruiters(company, keyword)
+                yield from ((result, keyword) for result in data.get("included", []))
+
+    def _search_recruiters_with_or_query(
+        self, company: Company, keywords: list[str]
+    ) -> list[dict]:
+        try:
+            results = self._search_recruiters(company, build_or_query(keywords)).get(
+                "included"
+            )
+        except Exception as e:
+            log.warning("Failed OR query for keywords=%r, %s", keywords, e)
+            results = None
+        if not results:
+            metrics.increment("linkedin.recruiter_search.fallbacks")
+            log.warning(
+                "Falling back to one query per keyword for keywords=%r", keywords
+            )
+            return None
+        return results
+
+    def _search_recruiters(self, company: Company, query: str) -> dict:
+        metrics.increment("linkedin.recruiter_search.queries")
+        return self._fetch_recruiters_from_company(company, quote(query, safe=""))
+
+    @staticmethod
+    def _count_matched_keywords(employee: Employee, keywords: list[str]) -> int:
+        headline = (employee.headline or "").casefold()
+        return sum(keyword.casefold() in headline for keyword in keywords)
+
     @retry(log)
     def _fetch_job_post_details(self) -> dict:
         self._update_user_agent_header()
@@ -134,7 +258,7 @@ class LinkedInScraper(BaseScraper):
             message=f"Time taken to fetch job post from {url=}",
             unit="milliseconds",
         ):
-            response = requests.get(url, headers=LINKEDIN_API_HEADERS)
+            response = get_http_session().get(url, headers=LINKEDIN_API_HEADERS)
         sleep_for_random_n_seconds(log, min_seconds=1, max_seconds=5)
         return response.json()
 
@@ -147,7 +271,7 @@ class LinkedInScraper(BaseScraper):
             message=f"Time taken to fetch company data from {url=}",
             unit="milliseconds",
         ):
-            response = requests.get(url, headers=LINKEDIN_API_HEADERS)
+            response = get_http_session().get(url, headers=LINKEDIN_API_HEADERS)
         sleep_for_random_n_seconds(log, min_seconds=1, max_seconds=5)
         return response.json()
 
@@ -160,7 +284,7 @@ class LinkedInScraper(BaseScraper):
             message=f"Time taken to fetch company domain from {url=}",
             unit="milliseconds",
         ):
-            response = requests.get(url, headers=LINKEDIN_API_HEADERS)
+            response = get_http_session().get(url, headers=LINKEDIN_API_HEADERS)
         sleep_for_random_n_seconds(log, min_seconds=1, max_seconds=5)
         return response.json()
 
@@ -173,7 +297,7 @@ class LinkedInScraper(BaseScraper):
             message=f"Time taken to fetch recruiters from {url=}",
             unit="milliseconds",
         ):
-            response = requests.get(url, headers=LINKEDIN_API_HEADERS)
+            response = get_http_session().get(url, headers=LINKEDIN_API_HEADERS)
         sleep_for_random_n_seconds(log, min_seconds=1, max_seconds=5)
         return response.json()
 
@@ -230,20 +354,32 @@ class LinkedInScraper(BaseScraper):
 
 
 class GoogleSearchScraper:
-    def scrape_emails_from_company_domain(self, domain: str) -> list[str]:
+    @traced_memory("google.domain_emails")
+    def scrape_emails_from_company_domain(
+        self,
+        domain: str,
+        max_emails: int = 10,
+        is_done: Callable[[list[str]], bool] = None,
+    ) -> list[str]:
+        # Pagination stops once `max_emails` addresses were seen or `is_done`
+        # is satisfied by them, e.g. when they already agree on a format.
+        def has_enough_emails(items: list[dict]) -> bool:
+            snippets = " ".join(str(item.get("snippet", "")) for item in items)
+            emails = list(dict.fromkeys(parse_emails_from_text(snippets)))
+            return len(emails) >= max_emails or bool(is_done and is_done(emails))
+
         scraped_emails = set()
-        results = self._search_google(
-            f'site:{domain} "@{domain}"',
+        search_results = self._search_google_pages(
+            f'site:{domain} "@{domain}"', has_enough_emails
         )
-        search_results = results.get("items", [])
-        log.info(f"Starting to parse {len(search_results)} search results...")
+        log.info("Starting to parse %d search results...", len(search_results))
         for i, item in enumerate(search_results):
             snippet = str(item["snippet"])
-            log.debug(f"Parsing emails from {i=} {snippet=}...")
+            log.debug("Parsing emails from i=%d snippet=%s...", i, Payload(snippet))
             emails = parse_emails_from_text(snippet)
             for email in emails:
                 scraped_emails.add(email)
-                log.info(f"Successfully scraped {i=}, {email=}...")
+                log.info("Successfully scraped i=%d, email=%r...", i, email)
         return list(scraped_emails)
 
     def scrape_leadiq_suggested_email_format(self, domain: str):
@@ -256,30 +392,105 @@ class GoogleSearchScraper:
             domain, "rocketreach.co", "the most common"
         )
 
+    @traced_memory("google.email_format")
     def _scrape_suggested_email_format(
         self, domain: str, site: str, pattern: str
     ) -> str:
-        results = self._search_google(
+        def is_suggested_format(item: dict) -> bool:
+            snippet = str(item.get("snippet", "")).lower()
+            return pattern.lower() in snippet and f"@{domain.lower()}" in snippet
+
+        search_results = self._search_google_pages(
             f'site:{site} "@{domain}" "{pattern}"',
+            lambda items: any(map(is_suggested_format, items)),
         )
-        search_results = results.get("items", [])
 
-        log.info(f"Starting to parse {len(search_results)} search results...")
+        log.info("Starting to parse %d search results...", len(search_results))
 
         for i, item in enumerate(search_results):
             snippet = str(item.get("snippet", ""))
-            log.debug(f"Parsing formats from {i=} {snippet=}...")
-            if (
-                pattern.lower() in snippet.lower()
-                and f"@{domain.lower()}" in snippet.lower()
-            ):
+            log.debug("Parsing formats from i=%d snippet=%s...", i, Payload(snippet))
+            if is_suggested_format(item):
                 return snippet
 
-    @retry(log)
-    def _search_google(self, query: str) -> dict:
+    def _search_google_pages(
+        self,
+        query: str,
+        is_done: Callable[[list[dict]], bool] = None,
+        max_pages: int = None,
+    ) -> list[dict]:
+        # Fetches the first page, then the remaining pages in batches of
+        # GOOGLE_SEARCH_PAGE_CONCURRENCY, and stops as soon as `is_done` is
+        # satisfied by the items seen so far or an optional page is deferred
+        # by the quota. Only the first page is essential to the quota.
+        max_pages = max_pages or cfg.GOOGLE_SEARCH_MAX_PAGES
+        try:
+            results = self._search_google(query)
+        except QuotaExceededError as e:
+            log.info("Skipping Google query=%r, %s", query, e)
+            return []
+
+        items = results.get("items", [])
+        total_results = int(
+            results.get("searchInformation", {}).get("totalResults", 0)
+            or GOOGLE_SEARCH_MAX_RESULTS
+        )
+        last_page = min(
+            max_pages,
+            math.ceil(
+                min(total_results, GOOGLE_SEARCH_MAX_RESULTS) / GOOGLE_SEARCH_PAGE_SIZE
+            ),
+        )
+        if len(items) < GOOGLE_SEARCH_PAGE_SIZE or (is_done and is_done(items)):
+            return items
+
+        starts = [page * GOOGLE_SEARCH_PAGE_SIZE + 1 for page in range(1, last_page)]
+        batch_size = cfg.GOOGLE_SEARCH_PAGE_CONCURRENCY
+        search_google = bind_usage_scope(self._search_google)
+        with ThreadPoolExecutor(max_workers=batch_size) as executor:
+            for i in range(0, len(starts), batch_size):
+                batch = starts[i : i + batch_size]
+                futures = [
+                    executor.submit(search_google, query, start, essential=False)
+                    for start in batch
+                ]
+                for start, future in zip(batch, futures):
+                    try:
+                        page = future.result()
+                    except Exception as e:
+                        log.info("Failed to fetch Google page start=%d, %s", start, e)
+                        return items
+                    if page is None:
+                        log.info("Stopping Google pagination at start=%d", start)
+                        return items
+                    page_items = page.get("items", [])
+                    items.extend(page_items)
+                    if len(page_items) < GOOGLE_SEARCH_PAGE_SIZE or (
+                        is_done and is_done(items)
+                    ):
+                        log.info("Stopping Google pagination at start=%d", start)
+                        return items
+        return items
+
+    @retry(log, giveup=(BudgetExceededError, QuotaExceededError))
+    def _search_google(
+        self, query: str, start: int = 1, essential: bool = True
+    ) -> dict:
+        # Quota is taken for every attempt that is not served from the cache,
+        # so retried queries count against the daily budget too. Returns None
+        # when an optional page is deferred to keep the quota reserve.
+        args = (query,) if start == 1 else (query, start)
+        if not is_response_cached(
+            "google", *args
+        ) and not get_google_search_quota().acquire(essential=essential):
+            return None
+        return self._request_google(*args)
+
+    @metered("google", record_google_response)
+    def _request_google(self, query: str, start: int = 1) -> dict:
         with Timer(
             log,
-            message=f"Time taken to process Google {query=}",
+            message=f"Time taken to process Google {query=} {start=}",
             unit="milliseconds",
         ):
             params = {
@@ -287,10 +498,15 @@ class GoogleSearchScraper:
                 "cx": cfg.GOOGLE_SEARCH_CUSTOM_SEARCH_ENGINE_ID,
                 "q": query,
             }
-            response = requests.get(GOOGLE_SEARCH_API_URL, params=params)
+            if start > 1:
+                params["start"] = start
+            response = get_http_session().get(GOOGLE_SEARCH_API_URL, params=params)
             data = response.json()
             log.debug(
-                f"Successfully received response {response.status_code} from {response.url} with {data=}"
+                "Successfully received response %d for query=%r with data=%s",
+                response.status_code,
+                query,
+                Payload(data),
             )
             return data or {}
 
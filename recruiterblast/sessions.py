@@ -0,0 +1,61 @@
+import contextlib
+import http.cookiejar
+import threading
+
+import requests
+
+import recruiterblast.config as cfg
+from recruiterblast.accounting import get_usage_scope
+from recruiterblast.cassettes import Cassette, CassetteAdapter
+
+_lock = threading.Lock()
+_http_session = None
+_request_throttles = {}
+
+
+@contextlib.contextmanager
+def request_throttle(session_id: str, throttle):
+    # Calls `throttle` before every request made under the usage session
+    # `session_id`, including requests that clients make on worker threads
+    # through `bind_usage_scope`.
+    _request_throttles[session_id] = throttle
+    try:
+        yield
+    finally:
+        _request_throttles.pop(session_id, None)
+
+
+class ThrottledSession(requests.Session):
+    def request(self, *args, **kwargs):
+        throttle = _request_throttles.get(get_usage_scope().session_id)
+        if throttle is not None:
+            throttle()
+        return super().request(*args, **kwargs)
+
+
+def create_http_session(
+    cassette_mode: str = None, cassette_path: str = None, latency: str = None
+) -> requests.Session:
+    session = ThrottledSession()
+    # Clients send their own credentials per request, so response cookies are
+    # never stored and replayed to other hosts.
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+    cassette_mode = cassette_mode or cfg.HTTP_CASSETTE_MODE
+    if cassette_mode != "off":
+        adapter = CassetteAdapter(
+            Cassette(cassette_path or cfg.HTTP_CASSETTE_PATH),
+            cassette_mode,
+            latency if latency is not None else cfg.HTTP_CASSETTE_LATENCY,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    global _http_session
+    with _lock:
+        if _http_session is None:
+            _http_session = create_http_session()
+    return _http_session
@@ -0,0 +1,105 @@
+from collections import deque
+
+from recruiterblast.constants import TECH_SKILLS
+
+# Characters after which a capitalized word may just start a sentence or a
+# bullet point.
+SENTENCE_START_MARKERS = ".!?:;\n\u2022*-"
+
+
+class SkillAutomaton:
+    # Aho-Corasick automaton over lowercased skill aliases. A single pass over
+    # the text reports every alias occurrence; matches are only kept when they
+    # are not embedded in a longer word (e.g. "java" in "javascript").
+    # Aliases with capitals are names that are also English words ("React",
+    # "Spark"): they only match with the same case, and capitalized words at
+    # the start of a sentence only when they stand alone ("- Swift" but not
+    # "Swift decisions ...").
+    def __init__(self, vocabulary: dict[str, list[str]]):
+        self.transitions = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+        for skill, aliases in vocabulary.items():
+            for alias in aliases:
+                self._add(alias, skill)
+        self._build_fail_links()
+
+    def _add(self, alias: str, skill: str) -> None:
+        case_sensitive_alias = alias if alias != alias.lower() else None
+        state = 0
+        for char in alias.lower():
+            next_state = self.transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions[state][char] = next_state
+                self.transitions.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            state = next_state
+        self.outputs[state].append((len(alias), skill, case_sensitive_alias))
+
+    def _build_fail_links(self) -> None:
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fail_state = self.fail[state]
+                while fail_state and char not in self.transitions[fail_state]:
+                    fail_state = self.fail[fail_state]
+                self.fail[next_state] = self.transitions[fail_state].get(char, 0)
+                if self.fail[next_state] == next_state:
+                    self.fail[next_state] = 0
+                self.outputs[next_state] += self.outputs[self.fail[next_state]]
+
+    def find_skills(self, text: str) -> list[str]:
+        original_text, text = text, text.lower()
+        transitions, fail, outputs = self.transitions, self.fail, self.outputs
+        skills = {}
+        state = 0
+
+        for end, char in enumerate(text, start=1):
+            while state and char not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(char, 0)
+            for length, skill, case_sensitive_alias in outputs[state]:
+                start = end - length
+                if skill in skills or not self._is_whole_word(text, start, end):
+                    continue
+                if case_sensitive_alias and not self._is_case_match(
+                    original_text, start, case_sensitive_alias
+                ):
+                    continue
+                skills[skill] = None
+
+        return list(skills)
+
+    @staticmethod
+    def _is_case_match(text: str, start: int, alias: str) -> bool:
+        if text[start : start + len(alias)] != alias:
+            return False
+        if alias.isupper():
+            return True
+        preceding = text[:start].rstrip(" \t")
+        if preceding and preceding[-1] not in SENTENCE_START_MARKERS:
+            return True
+        # At the start of a sentence only a standalone name counts, as in a
+        # bullet list of skills, not a capitalized word running into prose.
+        following = text[start + len(alias) : start + len(alias) + 2]
+        return not (following[:1] == " " and following[1:].islower())
+
+    @staticmethod
+    def _is_whole_word(text: str, start: int, end: int) -> bool:
+        is_start_bounded = start == 0 or not text[start - 1].isalnum()
+        is_end_bounded = end == len(text) or not text[end].isalnum()
+        return is_start_bounded and is_end_bounded
+
+
+_automaton = None
+
+
+def extract_technical_requirements(text: str) -> list[str]:
+    global _automaton
+    if _automaton is None:
+        _automaton = SkillAutomaton(TECH_SKILLS)
+    return _automaton.find_skills(text)
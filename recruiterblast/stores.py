@@ -0,0 +1,198 @@
+import sqlite3
+import threading
+import time
+
+import recruiterblast.config as cfg
+from recruiterblast import metrics
+from recruiterblast.models import Company, Employee
+
+COMPANY_COLUMNS = ("id", "name", "industry", "domain", "employee_count", "description")
+RECRUITER_COLUMNS = (
+    "id",
+    "first_name",
+    "last_name",
+    "full_name",
+    "headline",
+    "locale",
+    "profile_url",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_companies (
+    job_id TEXT PRIMARY KEY,
+    company_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    industry TEXT,
+    domain TEXT,
+    employee_count INTEGER,
+    description TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS companies_domain ON companies (domain);
+CREATE TABLE IF NOT EXISTS company_recruiters (
+    company_id INTEGER PRIMARY KEY,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS recruiters (
+    company_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    id INTEGER,
+    first_name TEXT,
+    last_name TEXT,
+    full_name TEXT,
+    headline TEXT,
+    locale TEXT,
+    profile_url TEXT,
+    PRIMARY KEY (company_id, position)
+);
+"""
+
+
+class CompanyStore:
+    # SQLite-backed job id -> company id map, company id -> `Company` store
+    # and company id -> recruiters store. Job posts never move between
+    # companies, so only company rows expire after `ttl_seconds` and recruiter
+    # lists after `recruiter_ttl_seconds`. Without a path the store lives in
+    # memory.
+    def __init__(
+        self,
+        path: str = None,
+        ttl_seconds: float = None,
+        recruiter_ttl_seconds: float = None,
+    ):
+        self.ttl_seconds = (
+            cfg.COMPANY_STORE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self.recruiter_ttl_seconds = (
+            cfg.RECRUITER_STORE_TTL_SECONDS
+            if recruiter_ttl_seconds is None
+            else recruiter_ttl_seconds
+        )
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def get_company(self, company_id: int) -> Company:
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT {', '.join(COMPANY_COLUMNS)} FROM companies "
+                "WHERE id = ? AND updated_at > ?",
+                (company_id, time.time() - self.ttl_seconds),
+            ).fetchone()
+        return self._to_company(row, "company")
+
+    def get_company_by_domain(self, domain: str) -> Company:
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT {', '.join(COMPANY_COLUMNS)} FROM companies "
+                "WHERE domain = ? AND updated_at > ? ORDER BY updated_at DESC",
+                (domain, time.time() - self.ttl_seconds),
+            ).fetchone()
+        return self._to_company(row, "domain")
+
+    def get_company_for_job(self, job_id) -> Company:
+        columns = ", ".join(f"c.{column}" for column in COMPANY_COLUMNS)
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT {columns} FROM job_companies j "
+                "JOIN companies c ON c.id = j.company_id "
+                "WHERE j.job_id = ? AND c.updated_at > ?",
+                (str(job_id), time.time() - self.ttl_seconds),
+            ).fetchone()
+        return self._to_company(row, "job")
+
+    def get_recruiters(self, company_id: int) -> list[Employee]:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT 1 FROM company_recruiters "
+                "WHERE company_id = ? AND updated_at > ?",
+                (company_id, time.time() - self.recruiter_ttl_seconds),
+            ).fetchone()
+            rows = (
+                self.connection.execute(
+                    f"SELECT {', '.join(RECRUITER_COLUMNS)} FROM recruiters "
+                    "WHERE company_id = ? ORDER BY position",
+                    (company_id,),
+                ).fetchall()
+                if row
+                else []
+            )
+        metrics.increment(
+            "company_store.recruiters.hits"
+            if row
+            else "company_store.recruiters.misses"
+        )
+        return [Employee(*recruiter) for recruiter in rows] if row else None
+
+    def save(self, job_id, company: Company) -> None:
+        if company.id is None:
+            return
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO job_companies (job_id, company_id) "
+                "VALUES (?, ?)",
+                (str(job_id), company.id),
+            )
+            self._insert_company(company)
+
+    def save_company(self, company: Company) -> None:
+        if company.id is None:
+            return
+        with self.lock, self.connection:
+            self._insert_company(company)
+
+    def save_recruiters(self, company_id: int, recruiters: list[Employee]) -> None:
+        if company_id is None:
+            return
+        with self.lock, self.connection:
+            self.connection.execute(
+                "DELETE FROM recruiters WHERE company_id = ?", (company_id,)
+            )
+            self.connection.executemany(
+                f"INSERT INTO recruiters "
+                f"(company_id, position, {', '.join(RECRUITER_COLUMNS)}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        company_id,
+                        position,
+                        *(getattr(recruiter, column) for column in RECRUITER_COLUMNS),
+                    )
+                    for position, recruiter in enumerate(recruiters)
+                ),
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO company_recruiters (company_id, updated_at) "
+                "VALUES (?, ?)",
+                (company_id, time.time()),
+            )
+
+    def _insert_company(self, company: Company) -> None:
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO companies "
+            f"({', '.join(COMPANY_COLUMNS)}, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (*(getattr(company, column) for column in COMPANY_COLUMNS), time.time()),
+        )
+
+    @staticmethod
+    def _to_company(row: tuple, lookup: str) -> Company:
+        metrics.increment(
+            f"company_store.{lookup}.hits" if row else f"company_store.{lookup}.misses"
+        )
+        return Company(**dict(zip(COMPANY_COLUMNS, row))) if row else None
+
+
+_company_store = None
+_company_store_lock = threading.Lock()
+
+
+def get_company_store() -> CompanyStore:
+    global _company_store
+    with _company_store_lock:
+        if _company_store is None:
+            _company_store = CompanyStore(cfg.COMPANY_STORE_PATH)
+    return _company_store
@@ -0,0 +1,102 @@
+import re
+from dataclasses import dataclass
+from typing import Callable
+from urllib.parse import quote
+
+import recruiterblast.config as cfg
+from recruiterblast.constants import (
+    DEFAULT_EMAIL_BODY_TEMPLATE,
+    DEFAULT_EMAIL_SUBJECT_TEMPLATE,
+)
+from recruiterblast.models import Company, Employee, JobPost
+
+JOB_TEMPLATE_FIELDS = ("job_title", "job_url", "company_name", "resume_link")
+RECRUITER_TEMPLATE_FIELDS = ("first_name", "last_name", "full_name")
+
+# Only known fields are placeholders, so user-written braces stay literal.
+TEMPLATE_FIELD_PATTERN = re.compile(
+    r"\{(%s)\}" % "|".join(JOB_TEMPLATE_FIELDS + RECRUITER_TEMPLATE_FIELDS)
+)
+
+
+def encode_url_component(text: str) -> str:
+    # Same as quote_plus(text).replace("+", "%20"). Every character is encoded
+    # on its own, so encoded segments can be concatenated.
+    return quote(text, safe="")
+
+
+def encode_utf8(text: str) -> bytes:
+    return text.encode()
+
+
+class CompiledTemplate:
+    # A template with its job fields filled in and its static text encoded
+    # once, so rendering for a recruiter only encodes the recruiter fields and
+    # joins the segments. Segments alternate between encoded static text and
+    # recruiter field names.
+    def __init__(self, segments: list, encode: Callable):
+        self.segments = segments
+        self.encode = encode
+        self.empty = encode("")
+
+    def render(self, recruiter: Employee):
+        parts = self.segments.copy()
+        for i in range(1, len(parts), 2):
+            parts[i] = self.encode(getattr(recruiter, parts[i]) or "")
+        return self.empty.join(parts)
+
+
+def compile_template(
+    template: str, context: dict, encode: Callable = encode_url_component
+) -> CompiledTemplate:
+    segments = []
+    static = []
+    position = 0
+    for match in TEMPLATE_FIELD_PATTERN.finditer(template):
+        static.append(template[position : match.start()])
+        position = match.end()
+        name = match.group(1)
+        if name in context:
+            static.append(str(context[name] or ""))
+        else:
+            segments += [encode("".join(static)), name]
+            static = []
+    static.append(template[position:])
+    segments.append(encode("".join(static)))
+    return CompiledTemplate(segments, encode)
+
+
+def build_job_template_context(company: Company, job_post: JobPost) -> dict:
+    return {
+        "job_title": job_post.title,
+        "job_url": job_post.job_url,
+        "company_name": company.name,
+        "resume_link": cfg.RESUME_LINK,
+    }
+
+
+@dataclass(slots=True)
+class OutreachTemplate:
+    subject: str = DEFAULT_EMAIL_SUBJECT_TEMPLATE
+    body: str = DEFAULT_EMAIL_BODY_TEMPLATE
+
+    def compile(
+        self,
+        company: Company,
+        job_post: JobPost,
+        encode: Callable = encode_url_component,
+    ) -> "CompiledOutreachTemplate":
+        context = build_job_template_context(company, job_post)
+        return CompiledOutreachTemplate(
+            compile_template(self.subject, context, encode),
+            compile_template(self.body, context, encode),
+        )
+
+
+@dataclass(slots=True)
+class CompiledOutreachTemplate:
+    subject: CompiledTemplate
+    body: CompiledTemplate
+
+    def render(self, recruiter: Employee) -> tuple:
+        return self.subject.render(recruiter), self.body.render(recruiter)
@@ -1,12 +1,27 @@
 import datetime
 import functools
 import random
+import threading
 import time
 import traceback
-from urllib.parse import quote_plus
-
-import recruiterblast.config as cfg
-from recruiterblast.constants import USER_AGENTS
+from typing import Iterator
+
+from recruiterblast.constants import DEFAULT_EMAIL_FORMAT_PRIORS, USER_AGENTS
+
+EMAIL_PERMUTATION_FORMATS = ["[first]", "[last]"] + [
+    f"{left}{sep}{right}"
+    for sep in ["", ".", "_"]
+    for left, right in [
+        ("[first]", "[last]"),
+        ("[last]", "[first]"),
+        ("[first_initial]", "[last]"),
+        ("[first]", "[last_initial]"),
+        ("[first_initial]", "[last_initial]"),
+        ("[last]", "[first_initial]"),
+        ("[last_initial]", "[first]"),
+        ("[last_initial]", "[first_initial]"),
+    ]
+]
 
 
 def iso_to_utc_timestamp(iso_timestamp_ms: int) -> str:
@@ -17,11 +32,15 @@ def iso_to_utc_timestamp(iso_timestamp_ms: int) -> str:
 
 
 def generate_rocketreach_formatted_username(employee, format: str) -> str:
-    first_initial = employee.first_name[0] if employee.first_name else ""
-    last_inital = employee.last_name[0] if employee.last_name else ""
+    return format_username(format, employee.first_name, employee.last_name)
+
 
-    username = format.replace("[first]", employee.first_name)
-    username = username.replace("[last]", employee.last_name)
+def format_username(format: str, first_name: str, last_name: str) -> str:
+    first_initial = first_name[0] if first_name else ""
+    last_inital = last_name[0] if last_name else ""
+
+    username = format.replace("[first]", first_name)
+    username = username.replace("[last]", last_name)
     username = username.replace("[first_initial]", first_initial)
     username = username.replace("[last_initial]", last_inital)
 
@@ -54,28 +73,53 @@ def generate_formatted_employee_email(employee, format: str) -> str:
 def generate_email_permutations(
     first_name: str, last_name: str, domain: str
 ) -> set[str]:
-    separators = ["", ".", "_"]
-    emails = set()
+    return set(generate_labeled_email_permutations(first_name, last_name, domain))
 
-    emails.add(f"{first_name}@{domain}")
-    emails.add(f"{last_name}@{domain}")
-
-    first_initial = first_name[0] if first_name else ""
-    last_initial = last_name[0] if last_name else ""
-
-    for sep in separators:
-        emails.add(f"{first_name}{sep}{last_name}@{domain}")
-        emails.add(f"{last_name}{sep}{first_name}@{domain}")
-        emails.add(f"{first_initial}{sep}{last_name}@{domain}")
-        emails.add(f"{first_name}{sep}{last_initial}@{domain}")
-        emails.add(f"{first_initial}{sep}{last_initial}@{domain}")
-        emails.add(f"{last_name}{sep}{first_initial}@{domain}")
-        emails.add(f"{last_initial}{sep}{first_name}@{domain}")
-        emails.add(f"{last_initial}{sep}{first_initial}@{domain}")
 
+def generate_labeled_email_permutations(
+    first_name: str, last_name: str, domain: str
+) -> dict[str, str]:
+    emails = {}
+    for format in EMAIL_PERMUTATION_FORMATS:
+        email = f"{format_username(format, first_name, last_name)}@{domain}"
+        emails.setdefault(email, format)
     return emails
 
 
+def rank_email_permutations(
+    first_name: str, last_name: str, domain: str, priors: dict[str, float] = None
+) -> list[str]:
+    return list(iter_ranked_email_permutations(first_name, last_name, domain, priors))
+
+
+def iter_ranked_email_permutations(
+    first_name: str, last_name: str, domain: str, priors: dict[str, float] = None
+) -> Iterator[str]:
+    # Only the formats are sorted up front; each address is built when the
+    # caller asks for it, so `itertools.islice(..., k)` costs k usernames.
+    priors = priors or DEFAULT_EMAIL_FORMAT_PRIORS
+    formats = sorted(EMAIL_PERMUTATION_FORMATS, key=lambda f: -priors.get(f, 0.0))
+    seen = set()
+    for format in formats:
+        email = f"{format_username(format, first_name, last_name)}@{domain}"
+        if email not in seen:
+            seen.add(email)
+            yield email
+
+
+def build_or_query(keywords: list[str]) -> str:
+    # Multi-word keywords are quoted so they match as phrases; a single
+    # keyword is searched as is.
+    if len(keywords) == 1:
+        return keywords[0]
+    return " OR ".join(f'"{k}"' if " " in k else k for k in keywords)
+
+
+def estimate_token_count(text: str) -> int:
+    # Gemini averages roughly four characters per token for English text.
+    return len(text) // 4 + 1
+
+
 def get_current_iso_timestamp():
     return datetime.datetime.now(datetime.UTC)
 
@@ -84,11 +128,12 @@ def sleep_for_random_n_seconds(
     log, min_seconds: int = 15, max_seconds: int = 30
 ) -> None:
     sleep_time = random.uniform(min_seconds, max_seconds)
-    log.info(f"Sleeping for {sleep_time=} seconds...")
+    log.info("Sleeping for sleep_time=%s seconds...", sleep_time)
     time.sleep(sleep_time)
 
 
-def retry(log, max_retries=3, initial_delay=1, max_delay=32):
+def retry(log, max_retries=3, initial_delay=1, max_delay=32, giveup=()):
+    # Exceptions in `giveup` are raised without retrying.
     def decorator_retry(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
@@ -98,6 +143,8 @@ def retry(log, max_retries=3, initial_delay=1, max_delay=32):
             while retries < max_retries:
                 try:
                     return func(*args, **kwargs)
+                except giveup:
+                    raise
                 except Exception as e:
                     retries += 1
                     if retries == max_retries:
@@ -144,36 +191,33 @@ class Timer:
         else:
             unit_str = "seconds"
 
-        self.log.info(f"{self.message} time_elapsed_{unit_str}={elapsed_time:.2f}")
+        self.log.info("%s time_elapsed_%s=%.2f", self.message, unit_str, elapsed_time)
+
+
+class RateLimiter:
+    # Token bucket allowing `rate` acquisitions per `period` seconds with bursts
+    # of up to `burst`. Callers reserve their slot under the lock and sleep
+    # outside it, so waiting threads are released in order.
+    def __init__(self, rate: float, period: float = 1.0, burst: int = 1):
+        self.rate_per_second = rate / period
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated_at) * self.rate_per_second
+            )
+            self.updated_at = now
+            self.tokens -= 1
+            delay = -self.tokens / self.rate_per_second if self.tokens < 0 else 0.0
+        if delay > 0:
+            time.sleep(delay)
+        return delay
 
 
 def get_random_user_agent() -> str:
     return random.choice(USER_AGENTS)
-
-
-def generate_email_subject_and_body(company, recruiter, job_post) -> tuple[str, str]:
-    subject = f"👋 I'm 92.5% Fit for Your {job_post.title} Role!"
-    body = (
-        f"Hi {recruiter.first_name},\n\n"
-        f"I value your time, so I’ll keep this brief! My name is Bryan, and "
-        f"I recently applied for the {job_post.title} role at {company.name} [1]. "
-        f"I noticed you're on the recruiting team, so I thought I’d reach out in case my "
-        f"application gets lost in the shuffle.\n\n"
-        f"Here’s a high-level overview of my experience:\n\n"
-        f"   ➡️ 4+ years as a backend software engineer\n"
-        f"   ➡️ Previously at Bank of America (BofA)\n"
-        f"   ➡️ Fixed a memory leak in pipeline processing 10M+ trades -> Saved BofA $221K\n"
-        f"   ➡️ Launched bigbagdata.com -> boosted a vintage bag store's sales by 31% in 4 weeks\n"
-        f"   ➡️ Relevant tech I've worked with: Python, Flask, SQL, DBT, Airflow, AWS, Apache Iceberg\n\n"
-        f"Lastly, I completed Zach Wilson's data engineering bootcamp in Q4 2024 where I was awarded the "
-        f"‘Superbness Certificate’ and ‘Outstanding Capstone,’ honors presented to top 1% of class. The "
-        f"coursework included conceptual data modeling, slowly changing dimensions (SCDs), cumulative table design, "
-        f"write-audit-publish framework.\n\n"
-        f"I’ve attached and included a link to my resume below if you’re interested in chatting [2]. "
-        f"I look forward to hearing from you. Thanks!\n\n"
-        f"[1]: {job_post.job_url}\n"
-        f"[2]: {cfg.RESUME_LINK}"
-    )
-    subject_encoded = quote_plus(subject).replace("+", "%20")
-    body_encoded = quote_plus(body).replace("+", "%20")
-    return subject_encoded, body_encoded
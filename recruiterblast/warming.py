@@ -0,0 +1,276 @@
+import dataclasses
+import datetime
+import re
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from zoneinfo import ZoneInfo
+
+import recruiterblast.config as cfg
+from recruiterblast import metrics
+from recruiterblast.accounting import usage_scope
+from recruiterblast.logger import setup_logger
+from recruiterblast.models import Company
+from recruiterblast.quotas import get_google_search_quota
+from recruiterblast.sessions import request_throttle
+from recruiterblast.stores import get_company_store
+
+log = setup_logger(__name__)
+
+# Entries that failed, or whose email format was deferred to protect the
+# interactive search quota, are retried after this long.
+WARMING_RETRY_SECONDS = 3600
+IDLE_SECONDS = 60
+WARMER_SESSION_ID = "cache-warmer"
+
+
+class WarmingStoppedError(BaseException):
+    # Raised from the request throttle, so it derives from BaseException to
+    # pass through the `except Exception` retries and fallbacks of clients.
+    pass
+
+
+def parse_watchlist(value: str) -> list:
+    # "69318116,foo.com" -> [69318116, "foo.com"]; numeric entries are
+    # LinkedIn company ids, anything else is a company domain.
+    entries = []
+    for entry in re.split(r"\s*,\s*", (value or "").strip().lower()):
+        if entry:
+            entries.append(int(entry) if entry.isdigit() else entry)
+    return list(dict.fromkeys(entries))
+
+
+def parse_off_peak_windows(value: str) -> list[tuple[datetime.time, datetime.time]]:
+    # "22:00-02:00,12:00-13:00" -> [(22:00, 02:00), (12:00, 13:00)]. A window
+    # whose end is before its start wraps past midnight.
+    windows = []
+    for window in re.split(r"\s*,\s*", (value or "").strip()):
+        if not window:
+            continue
+        start, end = window.split("-")
+        windows.append(
+            (datetime.time.fromisoformat(start), datetime.time.fromisoformat(end))
+        )
+    return windows
+
+
+def is_within_windows(
+    now: datetime.time, windows: list[tuple[datetime.time, datetime.time]]
+) -> bool:
+    for start, end in windows:
+        if start <= end and start <= now < end:
+            return True
+        if start > end and (now >= start or now < end):
+            return True
+    return False
+
+
+@dataclass(slots=True)
+class WarmingProgress:
+    total: int = 0
+    warmed: int = 0
+    failed: int = 0
+    pending: int = 0
+    lookups: int = 0
+    is_off_peak: bool = False
+    last_warmed_at: float = None
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+
+class CacheWarmer:
+    # Background scheduler that precomputes company entity data, recruiter
+    # lists and email formats for a watchlist of companies during off-peak
+    # windows, so interactive lookups for them are served from the company
+    # store and the response cache. Every upstream request made while warming,
+    # including retries, fallbacks and concurrent pages, is paced to
+    # `lookups_per_hour`.
+    def __init__(
+        self,
+        watchlist: list,
+        windows: list[tuple[datetime.time, datetime.time]],
+        lookups_per_hour: float = None,
+        refresh_seconds: float = None,
+        timezone: str = None,
+    ):
+        self.watchlist = watchlist
+        self.windows = windows
+        self.lookups_per_hour = lookups_per_hour or cfg.CACHE_WARMER_LOOKUPS_PER_HOUR
+        self.refresh_seconds = refresh_seconds or cfg.CACHE_WARMER_REFRESH_SECONDS
+        self.timezone = ZoneInfo(timezone or cfg.CACHE_WARMER_TIMEZONE)
+        self.lock = threading.Lock()
+        self.warmed_at = {}
+        self.attempted_at = {}
+        self.failed = set()
+        self.warmed_companies = set()
+        self.lookups = 0
+        self._next_lookup_at = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is None and self.watchlist:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+            log.info("Started cache warmer for %d companies", len(self.watchlist))
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def is_off_peak(self) -> bool:
+        now = datetime.datetime.now(self.timezone).time()
+        return is_within_windows(now, self.windows)
+
+    def get_progress(self) -> WarmingProgress:
+        now = time.time()
+        with self.lock:
+            warmed = sum(
+                1
+                for entry in self.watchlist
+                if now - self.warmed_at.get(entry, 0) < self.refresh_seconds
+            )
+            return WarmingProgress(
+                total=len(self.watchlist),
+                warmed=warmed,
+                failed=len(self.failed),
+                pending=len(self.watchlist) - warmed,
+                lookups=self.lookups,
+                is_off_peak=self.is_off_peak(),
+                last_warmed_at=max(self.warmed_at.values(), default=None),
+            )
+
+    def record_lookup(self, company: Company) -> None:
+        # Counts interactive lookups served by a warmed company.
+        with self.lock:
+            is_warm = (
+                company.id in self.warmed_companies
+                or company.domain in self.warmed_companies
+            )
+        metrics.increment("cache_warmer.hits" if is_warm else "cache_warmer.misses")
+
+    def warm(self, entry) -> bool:
+        from recruiterblast.email_formats import (
+            EmailFormatResolver,
+            get_email_format_priors,
+        )
+        from recruiterblast.scrapers import GoogleSearchScraper, LinkedInScraper
+
+        with self.lock:
+            self.attempted_at[entry] = time.time()
+        store = get_company_store()
+        scraper = LinkedInScraper()
+        is_complete = True
+        try:
+            with usage_scope(session_id=WARMER_SESSION_ID), request_throttle(
+                WARMER_SESSION_ID, self._throttle
+            ):
+                if isinstance(entry, int):
+                    company = store.get_company(entry)
+                    if company is None:
+                        company = Company(id=entry)
+                        self._raise_if_stopped()
+                        company.domain = scraper.fetch_company_domain(company)
+                        store.save_company(company)
+                else:
+                    company = store.get_company_by_domain(entry) or Company(
+                        domain=entry
+                    )
+
+                if company.id is not None:
+                    self._raise_if_stopped()
+                    scraper.fetch_recruiters_from_company(company)
+                else:
+                    # LinkedIn has no domain lookup, so recruiters for a domain
+                    # entry are warmed once its company has been stored.
+                    log.info("No stored company for domain=%r", company.domain)
+                    is_complete = False
+
+                if company.domain:
+                    quota = get_google_search_quota()
+                    if quota.remaining() > quota.reserve:
+                        self._raise_if_stopped()
+                        EmailFormatResolver(
+                            GoogleSearchScraper(), get_email_format_priors()
+                        ).resolve(company.domain)
+                    else:
+                        log.info("Deferring email format for domain=%r", company.domain)
+                        metrics.increment("cache_warmer.deferred")
+                        is_complete = False
+        except WarmingStoppedError:
+            log.info("Stopped warming entry=%r", entry)
+            return False
+        except Exception as e:
+            log.error(
+                "Failed to warm entry=%r, %s, %s", entry, e, traceback.format_exc()
+            )
+            metrics.increment("cache_warmer.failed")
+            with self.lock:
+                self.failed.add(entry)
+            return False
+
+        with self.lock:
+            self.failed.discard(entry)
+            self.warmed_companies.update(
+                key for key in (company.id, company.domain) if key
+            )
+            if is_complete:
+                self.warmed_at[entry] = time.time()
+        metrics.increment("cache_warmer.warmed")
+        log.info("Warmed entry=%r, %s", entry, self.get_progress())
+        return is_complete
+
+    def _get_next_entry(self):
+        now = time.time()
+        with self.lock:
+            for entry in self.watchlist:
+                if now - self.warmed_at.get(entry, 0) < self.refresh_seconds:
+                    continue
+                if now - self.attempted_at.get(entry, 0) < WARMING_RETRY_SECONDS:
+                    continue
+                return entry
+        return None
+
+    def _throttle(self) -> None:
+        # Email format sources request concurrently, so slots are reserved
+        # under the lock and waited for outside it.
+        with self.lock:
+            now = time.monotonic()
+            lookup_at = max(self._next_lookup_at, now)
+            self._next_lookup_at = lookup_at + 3600 / self.lookups_per_hour
+        if lookup_at > now:
+            self._stop.wait(lookup_at - now)
+        self._raise_if_stopped()
+        with self.lock:
+            self.lookups += 1
+
+    def _raise_if_stopped(self) -> None:
+        if self._stop.is_set():
+            raise WarmingStoppedError()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            entry = self._get_next_entry() if self.is_off_peak() else None
+            if entry is None:
+                self._stop.wait(IDLE_SECONDS)
+                continue
+            self.warm(entry)
+
+
+_cache_warmer = None
+_cache_warmer_lock = threading.Lock()
+
+
+def get_cache_warmer() -> CacheWarmer:
+    global _cache_warmer
+    with _cache_warmer_lock:
+        if _cache_warmer is None:
+            _cache_warmer = CacheWarmer(
+                parse_watchlist(cfg.CACHE_WARMER_WATCHLIST),
+                parse_off_peak_windows(cfg.CACHE_WARMER_WINDOWS),
+            )
+            _cache_warmer.start()
+    return _cache_warmer
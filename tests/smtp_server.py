@@ -0,0 +1,101 @@
+import base64
+import socketserver
+import threading
+from collections import deque
+
+
+class SMTPStandInHandler(socketserver.StreamRequestHandler):
+    # Minimal SMTP server speaking just enough of RFC 5321 for smtplib:
+    # EHLO, AUTH PLAIN, MAIL, RCPT, DATA, RSET, NOOP and QUIT.
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.write("220 localhost SMTP stand-in")
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command, _, argument = line.decode().rstrip("\r\n").partition(" ")
+            command = command.upper()
+            if command == "EHLO":
+                self.write("250-localhost\r\n250 AUTH PLAIN")
+            elif command == "HELO":
+                self.write("250 localhost")
+            elif command == "AUTH":
+                _, _, credentials = argument.partition(" ")
+                _, username, password = (
+                    base64.b64decode(credentials).decode().split("\0")
+                )
+                if (username, password) == (server.username, server.password):
+                    self.write("235 Authentication successful")
+                else:
+                    self.write("535 Authentication failed")
+            elif command == "MAIL":
+                sender, recipients = argument, []
+                self.write("250 OK")
+            elif command == "RCPT":
+                recipients.append(argument)
+                self.write("250 OK")
+            elif command == "DATA":
+                self.write("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    line = self.rfile.readline()
+                    if line in (b".\r\n", b""):
+                        break
+                    lines.append(line[1:] if line.startswith(b"..") else line)
+                with server.lock:
+                    reply = (
+                        server.data_replies.popleft() if server.data_replies else None
+                    )
+                    if reply is None:
+                        server.messages.append((sender, recipients, b"".join(lines)))
+                if reply == "drop":
+                    return
+                self.write(reply or "250 OK")
+            elif command == "RSET":
+                sender, recipients = None, []
+                self.write("250 OK")
+            elif command == "NOOP":
+                self.write("250 OK")
+            elif command == "QUIT":
+                self.write("221 Bye")
+                return
+            else:
+                self.write("502 Command not implemented")
+
+    def write(self, reply: str) -> None:
+        self.wfile.write(f"{reply}\r\n".encode())
+
+
+class SMTPStandInServer(socketserver.ThreadingTCPServer):
+    # Records accepted messages; `data_replies` queues replies for the next
+    # DATA commands, e.g. "451 Try again later", or "drop" to hang up.
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, username: str = "user", password: str = "secret"):
+        super().__init__(("127.0.0.1", 0), SMTPStandInHandler)
+        self.username = username
+        self.password = password
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = []
+        self.data_replies = deque()
+        self._thread = threading.Thread(
+            target=self.serve_forever, args=(0.01,), daemon=True
+        )
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
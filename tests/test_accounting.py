@@ -0,0 +1,194 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, mock
+
+from recruiterblast.accounting import (
+    BudgetExceededError,
+    ResponseCache,
+    UsageLedger,
+    bind_usage_scope,
+    get_usage_scope,
+    metered,
+    parse_usage_budgets,
+    record_gemini_response,
+    usage_scope,
+)
+from recruiterblast.logger import setup_logger
+from recruiterblast.utils import retry
+
+log = setup_logger(__name__)
+
+
+class FakeGeminiClient:
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+
+    @metered("gemini", record_gemini_response)
+    def make_request(self, payload: dict) -> dict:
+        self.calls += 1
+        if payload.get("error"):
+            return {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}
+        return {
+            "text": payload["prompt"],
+            "usageMetadata": {"promptTokenCount": 100, "candidatesTokenCount": 20},
+        }
+
+    @retry(log, initial_delay=0, giveup=(BudgetExceededError,))
+    @metered("gemini", record_gemini_response)
+    def make_flaky_request(self, payload: dict) -> dict:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("reset")
+        return {"text": payload["prompt"]}
+
+
+class AccountingTest(TestCase):
+    def setUp(self):
+        self.ledger = UsageLedger(budgets={})
+        self.cache = ResponseCache(max_entries=10, ttl_seconds=60)
+        for name, value in [
+            ("get_usage_ledger", self.ledger),
+            ("get_response_cache", self.cache),
+        ]:
+            patcher = mock.patch(
+                f"recruiterblast.accounting.{name}", return_value=value
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = FakeGeminiClient()
+
+    def test_parse_usage_budgets(self):
+        budgets = parse_usage_budgets("session.google.queries=50, day.cost_usd=1.5")
+
+        self.assertEqual(
+            {("session", "google.queries"): 50, ("day", "cost_usd"): 1.5}, budgets
+        )
+
+    def test_parse_usage_budgets_rejects_unknown_scope(self):
+        with self.assertRaises(ValueError):
+            parse_usage_budgets("week.google.queries=50")
+
+    def test_records_usage_per_job_and_session(self):
+        with usage_scope(job_id="1", session_id="abc"):
+            self.client.make_request({"prompt": "foo"})
+        with usage_scope(job_id="2", session_id="abc"):
+            self.client.make_request({"prompt": "bar"})
+
+        session = self.ledger.get_usage("session", "abc")
+        self.assertEqual(2, session["gemini.requests"])
+        self.assertEqual(200, session["gemini.input_tokens"])
+        self.assertEqual(20, self.ledger.get_usage("job", "1")["gemini.output_tokens"])
+
+    def test_cache_hits_record_savings(self):
+        with usage_scope(session_id="abc"):
+            self.client.make_request({"prompt": "foo"})
+            self.client.make_request({"prompt": "foo"})
+
+        usage = self.ledger.get_usage("session", "abc")
+        self.assertEqual(1, self.client.calls)
+        self.assertEqual(1, usage["gemini.cache_hits"])
+        self.assertAlmostEqual(usage["cost_usd"], usage["cache_savings_usd"])
+
+    def test_error_responses_are_not_cached(self):
+        self.client.make_request({"prompt": "foo", "error": True})
+        self.client.make_request({"prompt": "foo", "error": True})
+
+        self.assertEqual(2, self.client.calls)
+        self.assertEqual(0, len(self.cache.entries))
+
+    def test_only_recent_jobs_and_sessions_are_kept(self):
+        self.ledger.max_scopes = 2
+        for i in range(3):
+            with usage_scope(job_id=str(i), session_id=str(i)):
+                self.client.make_request({"prompt": str(i)})
+
+        self.assertEqual({}, self.ledger.get_usage("job", "0"))
+        self.assertEqual({}, self.ledger.get_usage("session", "0"))
+        self.assertEqual(1, self.ledger.get_usage("job", "2")["gemini.requests"])
+        self.assertEqual(3, self.ledger.summarize()["day"]["gemini.requests"])
+
+    def test_exhausted_budget_serves_stale_cache_only(self):
+        self.ledger.budgets = {("session", "gemini.requests"): 1}
+        self.cache.ttl_seconds = 0.0001
+        with usage_scope(session_id="abc"):
+            self.client.make_request({"prompt": "foo"})
+            self.cache.entries[next(iter(self.cache.entries))] = (
+                0,
+                {"text": "stale"},
+            )
+
+            self.assertEqual(
+                "stale", self.client.make_request({"prompt": "foo"})["text"]
+            )
+            with self.assertRaises(BudgetExceededError):
+                self.client.make_request({"prompt": "bar"})
+        self.assertEqual(1, self.client.calls)
+
+    def test_nearly_spent_budget_prefers_stale_cache(self):
+        self.ledger.budgets = {("session", "gemini.requests"): 10}
+        self.cache.ttl_seconds = 0.0001
+        with usage_scope(session_id="abc"), mock.patch(
+            "recruiterblast.config.USAGE_BUDGET_SOFT_LIMIT_RATIO", 0.2, create=True
+        ):
+            self.client.make_request({"prompt": "foo"})
+            self.client.make_request({"prompt": "bar"})
+            self.cache.entries[next(iter(self.cache.entries))] = (
+                0,
+                {"text": "stale"},
+            )
+
+            self.assertEqual(
+                "stale", self.client.make_request({"prompt": "foo"})["text"]
+            )
+            self.assertEqual("baz", self.client.make_request({"prompt": "baz"})["text"])
+        self.assertEqual(3, self.client.calls)
+
+    def test_retried_attempts_are_recorded(self):
+        self.client.failures = 2
+        with usage_scope(session_id="abc"):
+            self.client.make_flaky_request({"prompt": "foo"})
+
+        self.assertEqual(3, self.ledger.get_usage("session", "abc")["gemini.requests"])
+
+    def test_exhausted_budget_is_not_retried(self):
+        self.ledger.budgets = {("session", "gemini.requests"): 1}
+        with usage_scope(session_id="abc"):
+            self.client.make_flaky_request({"prompt": "foo"})
+            with self.assertRaises(BudgetExceededError):
+                self.client.make_flaky_request({"prompt": "bar"})
+
+        self.assertEqual(1, self.client.calls)
+
+    def test_budgets_are_scoped(self):
+        self.ledger.budgets = {("session", "gemini.requests"): 1}
+        with usage_scope(session_id="abc"):
+            self.client.make_request({"prompt": "foo"})
+        with usage_scope(session_id="xyz"):
+            self.client.make_request({"prompt": "bar"})
+
+        self.assertEqual(2, self.client.calls)
+
+    def test_bind_usage_scope_propagates_to_threads(self):
+        with usage_scope(job_id="1", session_id="abc"):
+            func = bind_usage_scope(get_usage_scope)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            scope = executor.submit(func).result()
+
+        self.assertEqual(("abc", "1"), (scope.session_id, scope.job_id))
+
+
+class ResponseCacheTest(TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = ResponseCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual((1, None, 3), (cache.get("a"), cache.get("b"), cache.get("c")))
+
+    def test_disabled_without_ttl(self):
+        cache = ResponseCache(max_entries=2, ttl_seconds=0)
+        cache.set("a", 1)
+
+        self.assertIsNone(cache.get("a"))
@@ -1,10 +1,21 @@
+import json
 from unittest import TestCase, mock
 
 from constants import MOCK_GOOGLE_GEMINI_API_RESPONSE
 
+import recruiterblast.config as cfg
+from recruiterblast import metrics
 from recruiterblast.api import GoogleGeminiAPIClient
 
 
+def make_gemini_text_response(text: str) -> dict:
+    return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+
+def make_gemini_response(data: dict) -> dict:
+    return make_gemini_text_response(json.dumps(data))
+
+
 class TestGoogleGeminiAPIClient(TestCase):
     @mock.patch.object(GoogleGeminiAPIClient, "_make_request")
     def test_parse_skills_from_job_description(self, mock_request):
@@ -18,3 +29,202 @@ class TestGoogleGeminiAPIClient(TestCase):
         }
         actual = client.parse_relevant_job_description_info("foobar")
         self.assertEqual(expected, actual)
+
+    @mock.patch.object(GoogleGeminiAPIClient, "_make_request")
+    def test_malformed_response_is_repaired_locally(self, mock_request):
+        mock_request.return_value = make_gemini_text_response(
+            '```json\n{"core_responsibilities": ["foo"], "technical_requirements": '
+            '["bar",], "soft_skills": ["baz"], "highlights": ["qux"]\n```'
+        )
+        metrics.reset_counters()
+        client = GoogleGeminiAPIClient()
+
+        actual = client.parse_relevant_job_description_info("foobar")
+
+        self.assertEqual(["bar"], actual["technical_requirements"])
+        self.assertEqual(1, mock_request.call_count)
+        self.assertEqual(
+            {"gemini.summaries.repaired": 1}, metrics.get_counters("gemini.summaries.")
+        )
+
+    @mock.patch.object(GoogleGeminiAPIClient, "_make_request")
+    def test_only_invalid_fields_are_reasked(self, mock_request):
+        mock_request.side_effect = [
+            make_gemini_text_response(
+                '{"core_responsibilities": ["foo"], "technical_requirements": '
+                '["bar"], "soft_skills": ["baz"], "highlights": ["qu'
+            ),
+            make_gemini_response({"highlights": ["qux"]}),
+        ]
+        metrics.reset_counters()
+        client = GoogleGeminiAPIClient()
+
+        actual = client.parse_relevant_job_description_info("foobar")
+
+        self.assertEqual(["qux"], actual["highlights"])
+        self.assertEqual(["foo"], actual["core_responsibilities"])
+        reask_payload = mock_request.call_args.args[0]
+        schema = reask_payload["generationConfig"]["responseSchema"]
+        self.assertEqual(["highlights"], schema["required"])
+        self.assertEqual(
+            {"gemini.summaries.repaired": 1, "gemini.summaries.partial_reasks": 1},
+            metrics.get_counters("gemini.summaries."),
+        )
+
+    @mock.patch.object(cfg, "SKILL_EXTRACTION_MODE", "hybrid")
+    @mock.patch.object(GoogleGeminiAPIClient, "_make_request")
+    def test_hybrid_mode_asks_llm_for_remaining_fields(self, mock_request):
+        mock_request.return_value = make_gemini_response(
+            {"core_responsibilities": ["foo"], "soft_skills": [], "highlights": []}
+        )
+        client = GoogleGeminiAPIClient()
+
+        actual = client.parse_relevant_job_description_info("Build APIs in Python.")
+
+        self.assertEqual(["Python"], actual["technical_requirements"])
+        self.assertEqual(["foo"], actual["core_responsibilities"])
+        schema = mock_request.call_args.args[0]["generationConfig"]["responseSchema"]
+        self.assertNotIn("technical_requirements", schema["required"])
+
+    @mock.patch.object(cfg, "SKILL_EXTRACTION_MODE", "local")
+    @mock.patch.object(GoogleGeminiAPIClient, "_make_request")
+    def test_local_mode_skips_llm(self, mock_request):
+        client = GoogleGeminiAPIClient()
+
+        actual = client.parse_relevant_job_description_info("Build APIs in Python.")
+
+        self.assertEqual({"technical_requirements": ["Python"]}, actual)
+        mock_request.assert_not_called()
+
+    @mock.patch.object(cfg, "GOOGLE_GEMINI_MAX_CONCURRENT_REQUESTS", 1)
+    @mock.patch.object(cfg, "GOOGLE_GEMINI_BATCH_MAX_ITEMS", 2)
+    @mock.patch.object(GoogleGeminiAPIClient, "_make_request")
+    def test_batch_maps_results_and_resubmits_failures(self, mock_request):
+        info = {
+            "core_responsibilities": ["foo"],
+            "technical_requirements": ["bar"],
+            "soft_skills": ["baz"],
+            "highlights": ["qux"],
+        }
+        mock_request.side_effect = [
+            make_gemini_response({"1": info, "2": info}),
+            make_gemini_response({"3": info}),
+            make_gemini_response(info),
+        ]
+        client = GoogleGeminiAPIClient()
+
+        actual = client.parse_relevant_job_description_info_batch(
+            {1: "foo", 2: "bar", 3: "baz", 4: "qux"}
+        )
+
+        self.assertEqual({1: info, 2: info, 3: info, 4: info}, actual)
+        self.assertEqual(3, mock_request.call_count)
+        resubmitted_prompt = mock_request.call_args.args[0]["contents"][0]["parts"][0]
+        self.assertTrue(resubmitted_prompt["text"].endswith("Job description: qux"))
+
+    @mock.patch.object(cfg, "GOOGLE_GEMINI_MAX_CONCURRENT_REQUESTS", 1)
+    @mock.patch.object(GoogleGeminiAPIClient, "_make_request")
+    def test_batch_resubmit_failure_only_loses_that_job(self, mock_request):
+        info = {
+            "core_responsibilities": ["foo"],
+            "technical_requirements": ["bar"],
+            "soft_skills": ["baz"],
+            "highlights": ["qux"],
+        }
+        mock_request.side_effect = [
+            make_gemini_response({"1": info}),
+            RuntimeError("quota exhausted"),
+        ]
+        client = GoogleGeminiAPIClient()
+
+        actual = client.parse_relevant_job_description_info_batch({1: "foo", 2: "bar"})
+
+        self.assertEqual({1: info, 2: {}}, actual)
+
+    @mock.patch.object(cfg, "SKILL_EXTRACTION_MODE", "hybrid")
+    @mock.patch.object(GoogleGeminiAPIClient, "_make_request")
+    def test_hybrid_batch_asks_llm_for_remaining_fields(self, mock_request):
+        info = {"core_responsibilities": ["foo"], "soft_skills": [], "highlights": []}
+        mock_request.return_value = make_gemini_response({"1": info})
+        client = GoogleGeminiAPIClient()
+
+        actual = client.parse_relevant_job_description_info_batch(
+            {1: "Build APIs in Python."}
+        )
+
+        self.assertEqual({**info, "technical_requirements": ["Python"]}, actual[1])
+        prompt = mock_request.call_args.args[0]["contents"][0]["parts"][0]["text"]
+        self.assertIn(
+            "only these categories: core_responsibilities, soft_skills, highlights.",
+            prompt,
+        )
+
+    @mock.patch.object(cfg, "GOOGLE_GEMINI_BATCH_TOKEN_BUDGET", 1500)
+    def test_batches_are_packed_within_token_budget(self):
+        client = GoogleGeminiAPIClient()
+        descriptions = {i: "x" * 2000 for i in range(6)}
+
+        batches = client._pack_job_descriptions(descriptions)
+
+        self.assertEqual([2, 2, 2], [len(batch) for batch in batches])
+
+    @mock.patch.object(GoogleGeminiAPIClient, "_stream_request")
+    def test_stream_yields_completed_items(self, mock_stream):
+        text = json.dumps(
+            {
+                "core_responsibilities": [],
+                "technical_requirements": ["Python"],
+                "soft_skills": [],
+                "highlights": ["pay"],
+            }
+        )
+        mock_stream.return_value = [
+            {"candidates": [{"content": {"parts": [{"text": text[:60]}]}}]},
+            {"candidates": [{"content": {"parts": [{"text": text[60:]}]}}]},
+        ]
+        client = GoogleGeminiAPIClient()
+
+        actual = list(client.stream_relevant_job_description_info("foobar"))
+
+        self.assertEqual(
+            [("technical_requirements", "Python"), ("highlights", "pay")], actual
+        )
+
+    @mock.patch.object(GoogleGeminiAPIClient, "_make_request")
+    @mock.patch.object(GoogleGeminiAPIClient, "_stream_request")
+    def test_stream_reasks_fields_cut_off_mid_value(self, mock_stream, mock_request):
+        mock_stream.return_value = [
+            make_gemini_text_response(
+                '{"core_responsibilities": ["foo"], "technical_requirements": '
+                '["bar"], "soft_skills": ["baz"], "highlights": ["pay", "qu'
+            )
+        ]
+        mock_request.return_value = make_gemini_response({"highlights": ["pay", "qux"]})
+        client = GoogleGeminiAPIClient()
+
+        actual = list(client.stream_relevant_job_description_info("foobar"))
+
+        self.assertEqual(
+            [
+                ("core_responsibilities", "foo"),
+                ("technical_requirements", "bar"),
+                ("soft_skills", "baz"),
+                ("highlights", "pay"),
+                ("highlights", "qux"),
+            ],
+            actual,
+        )
+        schema = mock_request.call_args.args[0]["generationConfig"]["responseSchema"]
+        self.assertEqual(["highlights"], schema["required"])
+
+    @mock.patch.object(GoogleGeminiAPIClient, "_make_request")
+    @mock.patch.object(GoogleGeminiAPIClient, "_stream_request")
+    def test_stream_failure_falls_back_to_request(self, mock_stream, mock_request):
+        mock_stream.side_effect = ConnectionError("reset")
+        mock_request.return_value = MOCK_GOOGLE_GEMINI_API_RESPONSE
+        client = GoogleGeminiAPIClient()
+
+        actual = dict(client.stream_relevant_job_description_info("foobar"))
+
+        self.assertEqual("qux", actual["highlights"])
+        self.assertEqual(1, mock_request.call_count)
@@ -0,0 +1,176 @@
+import io
+import json
+import mailbox
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from recruiterblast.api import GoogleGeminiAPIClient
+from recruiterblast.batch import main, read_job_urls, run_batch
+from recruiterblast.email_formats import EmailFormatResolver, EmailFormatResult
+from recruiterblast.indexes import RecruiterIndex
+from recruiterblast.models import Company, Employee, JobPost
+from recruiterblast.scrapers import LinkedInScraper
+
+
+class BatchTest(TestCase):
+    def setUp(self):
+        patches = {
+            "fetch_job_post_details": lambda scraper: JobPost(
+                id=scraper.job_id, title="SWE", description="Python"
+            ),
+            "fetch_company_from_job_post": lambda scraper: Company(
+                id=1, name="Foo", domain="foo.com"
+            ),
+            "fetch_recruiters_from_company": lambda scraper, company: [
+                Employee(id=2, first_name="Jane", last_name="Doe", full_name="Jane Doe")
+            ],
+        }
+        for name, func in patches.items():
+            patcher = mock.patch.object(LinkedInScraper, name, func)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch(
+            "recruiterblast.config.SCRAPER_SOURCE_LIMITS",
+            "linkedin.concurrency=2",
+            create=True,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_read_job_urls_skips_invalid_lines(self):
+        lines = [
+            "https://www.linkedin.com/jobs/view/1?foo=bar\n",
+            "not a url\n",
+            "\n",
+        ]
+
+        self.assertEqual(["https://www.linkedin.com/jobs/view/1"], read_job_urls(lines))
+
+    @mock.patch.object(
+        GoogleGeminiAPIClient, "parse_relevant_job_description_info_batch"
+    )
+    def test_run_batch_summarizes_job_posts(self, mock_summarize):
+        mock_summarize.return_value = {"1": {"technical_requirements": ["Python"]}}
+
+        results = run_batch(["https://www.linkedin.com/jobs/view/1"])
+
+        self.assertEqual(["Python"], results[0].job_post.technical_requirements)
+        self.assertEqual("foo.com", results[0].company.domain)
+        self.assertEqual("Jane Doe", results[0].recruiters[0].full_name)
+
+    @mock.patch.object(LinkedInScraper, "fetch_recruiters_from_company")
+    def test_run_batch_fetches_recruiters_once_per_company(self, mock_fetch):
+        mock_fetch.return_value = [Employee(id=2, full_name="Jane Doe")]
+
+        results = run_batch(
+            [
+                "https://www.linkedin.com/jobs/view/1",
+                "https://www.linkedin.com/jobs/view/2",
+            ],
+            summarize=False,
+        )
+
+        mock_fetch.assert_called_once()
+        self.assertEqual(results[0].recruiters, results[1].recruiters)
+
+    @mock.patch.object(EmailFormatResolver, "resolve")
+    def test_run_batch_resolves_email_format_once_per_company(self, mock_resolve):
+        mock_resolve.return_value = EmailFormatResult(
+            "RocketReach.co", "[first].[last]", "", 0.9
+        )
+
+        results = run_batch(
+            [
+                "https://www.linkedin.com/jobs/view/1",
+                "https://www.linkedin.com/jobs/view/2",
+            ],
+            summarize=False,
+            resolve_email_formats=True,
+        )
+
+        mock_resolve.assert_called_once_with("foo.com")
+        self.assertEqual(["[first].[last]"] * 2, [r.email_format for r in results])
+
+    @mock.patch.object(LinkedInScraper, "fetch_company_from_job_post")
+    def test_run_batch_records_errors(self, mock_fetch):
+        mock_fetch.side_effect = RuntimeError("rate limited")
+
+        results = run_batch(["https://www.linkedin.com/jobs/view/1"], summarize=False)
+
+        self.assertEqual("rate limited", results[0].error)
+
+    @mock.patch("sys.stderr", new_callable=io.StringIO)
+    @mock.patch("sys.stdout", new_callable=io.StringIO)
+    def test_main_writes_results_and_usage_summary(self, mock_stdout, mock_stderr):
+        with mock.patch(
+            "sys.stdin", io.StringIO("https://www.linkedin.com/jobs/view/1\n")
+        ):
+            exit_code = main(["-", "--no-summaries"])
+
+        self.assertEqual(0, exit_code)
+        self.assertEqual("Foo", json.loads(mock_stdout.getvalue())["company"]["name"])
+        self.assertIn("session:", mock_stderr.getvalue())
+
+    @mock.patch.object(EmailFormatResolver, "resolve")
+    @mock.patch("sys.stderr", new_callable=io.StringIO)
+    @mock.patch("sys.stdout", new_callable=io.StringIO)
+    def test_main_writes_drafts(self, mock_stdout, mock_stderr, mock_resolve):
+        mock_resolve.return_value = EmailFormatResult(
+            "RocketReach.co", "[first].[last]", "", 0.9
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "drafts.mbox")
+            with mock.patch(
+                "sys.stdin", io.StringIO("https://www.linkedin.com/jobs/view/1\n")
+            ):
+                main(
+                    [
+                        "-",
+                        "--no-summaries",
+                        "--drafts",
+                        path,
+                        "--subject-template",
+                        "{first_name}, about {job_title}",
+                    ]
+                )
+
+            messages = list(mailbox.mbox(path))
+
+        self.assertEqual(1, len(messages))
+        self.assertEqual("Jane, about SWE", messages[0]["Subject"])
+        self.assertEqual("jane.doe@foo.com", messages[0]["To"])
+
+    @mock.patch("sys.stderr", new_callable=io.StringIO)
+    @mock.patch("sys.stdout", new_callable=io.StringIO)
+    def test_main_writes_parquet(self, mock_stdout, mock_stderr):
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch(
+            "recruiterblast.parquet.write_parquet_results"
+        ) as mock_write, mock.patch(
+            "sys.stdin", io.StringIO("https://www.linkedin.com/jobs/view/1\n")
+        ):
+            main(["-", "--no-summaries", "--parquet", tmp_dir])
+
+        root, jobs = mock_write.call_args.args
+        company, job_post, recruiters = next(iter(jobs))
+        self.assertEqual(tmp_dir, root)
+        self.assertEqual("Foo", company.name)
+        self.assertEqual(["Jane"], [recruiter.first_name for recruiter in recruiters])
+
+    @mock.patch("sys.stderr", new_callable=io.StringIO)
+    @mock.patch("sys.stdout", new_callable=io.StringIO)
+    def test_main_adds_recruiters_to_index(self, mock_stdout, mock_stderr):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "recruiters.json")
+            for job_id in (1, 2):
+                with mock.patch(
+                    "sys.stdin",
+                    io.StringIO(f"https://www.linkedin.com/jobs/view/{job_id}\n"),
+                ):
+                    main(["-", "--no-summaries", "--recruiter-index", path])
+
+            index = RecruiterIndex.load(path)
+
+        results = index.search(company="foo")
+        self.assertEqual(1, len(index))
+        self.assertEqual(["Foo"], [result.company for result in results])
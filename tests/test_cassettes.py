@@ -0,0 +1,113 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import TestCase
+from urllib.parse import urlsplit
+
+from recruiterblast.cassettes import CassetteMissError, sanitize_url
+from recruiterblast.sessions import create_http_session
+
+
+class StubUpstreamHandler(BaseHTTPRequestHandler):
+    requests_received = 0
+
+    def do_GET(self):
+        type(self).requests_received += 1
+        body = json.dumps({"path": urlsplit(self.path).path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Set-Cookie", "session=secret")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        type(self).requests_received += 1
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = b'data: {"n": 1}\r\n\r\ndata: {"n": 2}\r\n\r\n'
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CassetteTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("127.0.0.1", 0), StubUpstreamHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cassette.json")
+        StubUpstreamHandler.requests_received = 0
+
+    def record(self):
+        session = create_http_session("record", self.path)
+        session.get(
+            f"{self.base_url}/search?q=foo&key=api-key",
+            headers={"cookie": "li_at=secret", "csrf-token": "ajax:secret"},
+        )
+        session.post(f"{self.base_url}/stream?key=api-key", json={"prompt": "foo"})
+
+    def test_sanitize_url_redacts_api_key(self):
+        self.assertEqual(
+            "https://foo.com/?key=REDACTED&q=bar",
+            sanitize_url("https://foo.com/?q=bar&key=api-key"),
+        )
+
+    def test_recording_strips_credentials(self):
+        self.record()
+
+        with open(self.path) as f:
+            cassette = f.read()
+        self.assertNotIn("secret", cassette)
+        self.assertNotIn("api-key", cassette)
+        self.assertEqual(2, len(json.loads(cassette)["interactions"]))
+
+    def test_replay_does_not_touch_network(self):
+        self.record()
+        session = create_http_session("replay", self.path)
+
+        response = session.get(
+            f"{self.base_url}/search?q=foo&key=another-key",
+            headers={"cookie": "li_at=other"},
+        )
+        with session.post(
+            f"{self.base_url}/stream?key=api-key", json={"prompt": "foo"}, stream=True
+        ) as stream:
+            lines = [line for line in stream.iter_lines(decode_unicode=True) if line]
+
+        self.assertEqual(2, StubUpstreamHandler.requests_received)
+        self.assertEqual({"path": "/search"}, response.json())
+        self.assertEqual(['data: {"n": 1}', 'data: {"n": 2}'], lines)
+
+    def test_replay_miss_raises(self):
+        self.record()
+        session = create_http_session("replay", self.path)
+
+        with self.assertRaises(CassetteMissError):
+            session.get(f"{self.base_url}/search?q=bar")
+
+    def test_replay_simulates_latency(self):
+        self.record()
+        session = create_http_session("replay", self.path, latency="0.05")
+
+        start = time.perf_counter()
+        session.get(f"{self.base_url}/search?q=foo&key=api-key")
+
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
@@ -0,0 +1,87 @@
+import json
+from pathlib import Path
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from recruiterblast.compactors import compact_job_description, normalize_whitespace
+
+RESOURCES_DIR = Path(__file__).resolve().parent.parent / "resources"
+
+
+def load_job_post_description(name: str) -> str:
+    with open(RESOURCES_DIR / f"{name}.json") as f:
+        return json.load(f)["data"]["description"]["text"]
+
+
+class CompactorTest(TestCase):
+    @parameterized.expand(
+        [
+            ("linkedin_job_post_api_response", "Python", 0.2),
+            ("linkedin_job_post_hourly_wage_api_response", "C++", 0.15),
+            ("linkedin_job_post_salary_api_response", "Terraform", 0.0),
+        ]
+    )
+    def test_fixtures_are_compacted(self, name, keyword, min_reduction):
+        description = load_job_post_description(name)
+
+        compacted = compact_job_description(description)
+
+        self.assertIn(keyword, compacted.text)
+        self.assertNotIn("equal opportunity", compacted.text.lower())
+        self.assertLessEqual(
+            compacted.output_tokens, compacted.input_tokens * (1 - min_reduction)
+        )
+
+    def test_single_paragraph_description_keeps_non_boilerplate_sentences(self):
+        description = load_job_post_description(
+            "linkedin_job_post_hourly_wage_api_response"
+        ).replace("\n\n", "\n")
+
+        compacted = compact_job_description(description)
+
+        self.assertIn("Python and/or C or C++", compacted.text)
+        self.assertIn(
+            "Amazon is committed to a diverse and inclusive workplace.", compacted.text
+        )
+        self.assertNotIn("equal opportunity employer", compacted.text)
+        self.assertNotIn("Fair Chance Ordinance", compacted.text)
+        self.assertLess(compacted.output_tokens, compacted.input_tokens)
+
+    def test_boilerplate_phrases_inside_sentences_are_kept(self):
+        text = (
+            "You will build workplace accommodation tooling for our equal "
+            "opportunity hiring platform. Experience with criminal history "
+            "record APIs is a plus."
+        )
+
+        self.assertEqual(text, compact_job_description(text).text)
+
+    def test_falls_back_to_original_when_nearly_everything_is_removed(self):
+        text = (
+            "Acme is an equal opportunity employer. All qualified applicants "
+            "will receive consideration for employment without regard to race. "
+            "Use Python."
+        )
+
+        self.assertEqual(text, compact_job_description(text).text)
+
+    def test_repeated_paragraphs_are_dropped(self):
+        text = "About us: we build.\n\nUse Python.\n\nAbout  us: we build!\n\n"
+
+        compacted = compact_job_description(text)
+
+        self.assertEqual("About us: we build.\n\nUse Python.", compacted.text)
+
+    def test_token_budget_is_enforced(self):
+        text = "\n\n".join(f"Paragraph {i} " + "x" * 400 for i in range(20))
+
+        compacted = compact_job_description(text, token_budget=300)
+
+        self.assertLessEqual(compacted.output_tokens, 300)
+        self.assertTrue(compacted.text.startswith("Paragraph 0"))
+
+    def test_normalize_whitespace(self):
+        text = "  Foo \t bar baz \r\n\n\n\nqux  "
+
+        self.assertEqual("Foo bar baz\n\nqux", normalize_whitespace(text))
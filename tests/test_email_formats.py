@@ -0,0 +1,233 @@
+import os
+import tempfile
+import threading
+import time
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from recruiterblast.email_formats import (
+    EmailFormatPriors,
+    EmailFormatResolver,
+    infer_email_format,
+    normalize_email_format,
+    parse_snippet_confidence,
+)
+
+
+class EmailFormatsTest(TestCase):
+    @parameterized.expand(
+        [
+            ("rocketreach", "[first].[last]", "[first].[last]"),
+            ("leadiq_dot", "First.Last@gitlab.com", "[first].[last]"),
+            ("leadiq_initial", "FLast@gitlab.com", "[first_initial][last]"),
+            ("leadiq_underscore", "First_L@gitlab.com", "[first]_[last_initial]"),
+        ]
+    )
+    def test_normalize_email_format(self, name, email_format, expected):
+        self.assertEqual(expected, normalize_email_format(email_format))
+
+    @parameterized.expand(
+        [
+            ("dot", "jane.doe@gitlab.com", "[first].[last]"),
+            ("initial_dot", "j.doe@gitlab.com", "[first_initial].[last]"),
+            ("underscore_initial", "jane_d@gitlab.com", "[first]_[last_initial]"),
+            ("ambiguous", "jdoe@gitlab.com", ""),
+            ("role", "careers@gitlab.com", ""),
+        ]
+    )
+    def test_infer_email_format(self, name, email, expected):
+        self.assertEqual(expected, infer_email_format(email))
+
+    def test_infer_email_format_with_name(self):
+        self.assertEqual(
+            "[first_initial][last]",
+            infer_email_format("jdoe@gitlab.com", "Jane", "Doe"),
+        )
+
+
+class EmailFormatPriorsTest(TestCase):
+    def setUp(self):
+        self.priors = EmailFormatPriors()
+
+    def test_defaults_without_observations(self):
+        probabilities = self.priors.get_probabilities("gitlab.com")
+
+        self.assertEqual("[first].[last]", max(probabilities, key=probabilities.get))
+        self.assertAlmostEqual(1.0, sum(probabilities.values()))
+
+    def test_domain_observations_outrank_defaults(self):
+        self.priors.observe("gitlab.com", "[last]_[first]")
+        self.priors.observe("gitlab.com", "Last_First@gitlab.com")
+
+        probabilities = self.priors.get_probabilities("gitlab.com")
+
+        self.assertEqual("[last]_[first]", max(probabilities, key=probabilities.get))
+
+    def test_global_observations_shift_unseen_domains(self):
+        for i in range(50):
+            self.priors.observe(f"company{i}.com", "[first_initial][last]")
+
+        probabilities = self.priors.get_probabilities("unseen.com")
+
+        self.assertEqual(
+            "[first_initial][last]", max(probabilities, key=probabilities.get)
+        )
+
+    def test_observe_emails_ignores_other_domains(self):
+        self.priors.observe_emails(
+            "gitlab.com", ["j.doe@gitlab.com", "jane.doe@gmail.com", "info@gitlab.com"]
+        )
+
+        self.assertEqual(
+            {"[first_initial].[last]": 0.5},
+            dict(self.priors.domain_counts["gitlab.com"]),
+        )
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "priors.json")
+            priors = EmailFormatPriors(path)
+            priors.observe("gitlab.com", "[last][first]")
+            priors.save()
+
+            loaded = EmailFormatPriors(path)
+
+        self.assertEqual(
+            priors.get_probabilities("gitlab.com"),
+            loaded.get_probabilities("gitlab.com"),
+        )
+
+
+class FakeEmailFormatScraper:
+    def __init__(self, leadiq="", rocketreach="", emails=(), blocked=()):
+        self.leadiq = leadiq
+        self.rocketreach = rocketreach
+        self.emails = list(emails)
+        self.blocked = blocked
+        self.release = threading.Event()
+        self.calls = []
+
+    def _wait_if_blocked(self, source):
+        self.calls.append(source)
+        if source in self.blocked:
+            self.release.wait(5)
+
+    def scrape_leadiq_suggested_email_format(self, domain):
+        self._wait_if_blocked("leadiq")
+        return self.leadiq
+
+    def scrape_rocketreach_suggested_email_format(self, domain):
+        self._wait_if_blocked("rocketreach")
+        return self.rocketreach
+
+    def scrape_emails_from_company_domain(self, domain, is_done=None):
+        self._wait_if_blocked("emails")
+        self.is_done = is_done
+        return self.emails
+
+
+class EmailFormatResolverTest(TestCase):
+    leadiq_snippet = (
+        "The FooBar's email format typically follows the pattern of "
+        "First_Last@foobar.com; this email format is used 95% of the time."
+    )
+    rocketreach_snippet = (
+        "The most common FooBar email format is [first].[last] "
+        "(ex. jane.doe@foobar.com), which is being used by 60% of FooBar emails"
+    )
+
+    def resolve(self, scraper, **kwargs):
+        resolver = EmailFormatResolver(scraper, EmailFormatPriors())
+        return resolver.resolve("foobar.com", threshold=0.8, **kwargs)
+
+    @parameterized.expand(
+        [
+            ("percentage", "used 95% of the time", 0.95),
+            ("decimal", "used by 89.8% of addresses", 0.898),
+            ("missing", "the most common format", 0.7),
+        ]
+    )
+    def test_parse_snippet_confidence(self, name, snippet, expected):
+        self.assertAlmostEqual(expected, parse_snippet_confidence(snippet))
+
+    def test_returns_first_confident_result_without_waiting(self):
+        scraper = FakeEmailFormatScraper(
+            leadiq=self.leadiq_snippet, blocked=("rocketreach", "emails")
+        )
+        start = time.perf_counter()
+
+        result = self.resolve(scraper)
+
+        elapsed = time.perf_counter() - start
+        scraper.release.set()
+        self.assertEqual("LeadIQ.com", result.source)
+        self.assertEqual("[first]_[last]", result.email_format)
+        self.assertLess(elapsed, 1)
+
+    def test_confident_first_source_skips_other_lookups(self):
+        scraper = FakeEmailFormatScraper(
+            leadiq=self.leadiq_snippet, rocketreach=self.rocketreach_snippet
+        )
+
+        result = self.resolve(scraper)
+
+        self.assertEqual("LeadIQ.com", result.source)
+        self.assertEqual(["leadiq"], scraper.calls)
+
+    def test_next_source_starts_after_hedge_delay(self):
+        scraper = FakeEmailFormatScraper(
+            rocketreach=self.rocketreach_snippet.replace("60%", "90%"),
+            blocked=("leadiq",),
+        )
+
+        result = self.resolve(scraper, hedge_delay=0.05)
+
+        scraper.release.set()
+        self.assertEqual("RocketReach.co", result.source)
+        self.assertEqual(["leadiq", "rocketreach"], scraper.calls)
+
+    def test_returns_most_confident_result_below_threshold(self):
+        scraper = FakeEmailFormatScraper(
+            rocketreach=self.rocketreach_snippet,
+            emails=["j.doe@foobar.com", "a.smith@foobar.com"],
+        )
+
+        result = self.resolve(scraper)
+
+        self.assertEqual("RocketReach.co", result.source)
+        self.assertEqual("[first].[last]", result.email_format)
+        self.assertAlmostEqual(0.6, result.confidence)
+
+    def test_scraped_emails_resolve_format(self):
+        emails = [f"{name}.doe@foobar.com" for name in "abcdef"]
+        scraper = FakeEmailFormatScraper(emails=emails + ["info@foobar.com"])
+
+        result = self.resolve(scraper)
+
+        self.assertEqual("company domain", result.source)
+        self.assertEqual("[first_initial].[last]", result.email_format)
+        self.assertEqual(1.0, result.confidence)
+
+    def test_scraped_emails_stop_once_format_is_confident(self):
+        emails = [f"{name}.doe@foobar.com" for name in "abcdef"]
+        scraper = FakeEmailFormatScraper(emails=emails)
+
+        self.resolve(scraper)
+
+        self.assertTrue(scraper.is_done(emails[:5]))
+        self.assertFalse(scraper.is_done(emails[:2]))
+        self.assertFalse(scraper.is_done(emails[:3] + ["jane_doe@foobar.com"] * 2))
+
+    def test_returns_none_when_no_source_resolves(self):
+        self.assertIsNone(self.resolve(FakeEmailFormatScraper()))
+
+    def test_returns_best_result_on_timeout(self):
+        scraper = FakeEmailFormatScraper(
+            rocketreach=self.rocketreach_snippet, blocked=("leadiq", "emails")
+        )
+
+        result = self.resolve(scraper, timeout=0.2, hedge_delay=0.05)
+
+        scraper.release.set()
+        self.assertEqual("RocketReach.co", result.source)
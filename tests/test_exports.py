@@ -0,0 +1,116 @@
+import email
+import mailbox
+import os
+import tempfile
+from email import policy
+from unittest import TestCase, mock
+
+from recruiterblast.exports import Draft, iter_drafts, write_eml_files, write_mbox
+from recruiterblast.models import Company, Employee, JobPost
+from recruiterblast.templates import OutreachTemplate
+
+
+class DraftExportTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        self.jobs = [
+            (
+                Company(name=f"Foo {i}", domain=f"foo{i}.com"),
+                JobPost(title="SWE", job_url=f"https://www.linkedin.com/jobs/view/{i}"),
+                [
+                    Employee(first_name="Jane", last_name="Doe"),
+                    Employee(first_name="Zoë", last_name="Roe"),
+                ],
+            )
+            for i in range(3)
+        ]
+        self.template = OutreachTemplate(
+            "👋 {first_name}, your {job_title} role", "Hi {first_name},\n{job_url}"
+        )
+
+    @mock.patch("recruiterblast.config.EMAIL_PERMUTATION_LIMIT", 2, create=True)
+    def test_iter_drafts_yields_a_draft_per_recruiter_per_job(self):
+        drafts = list(iter_drafts(self.jobs, self.template))
+
+        self.assertEqual(6, len(drafts))
+        self.assertEqual("👋 Zoë, your SWE role", drafts[1].subject)
+        self.assertEqual(
+            "Hi Jane,\nhttps://www.linkedin.com/jobs/view/2".encode(), drafts[4].body
+        )
+        self.assertEqual(2, len(drafts[0].to))
+        self.assertTrue(all(to.endswith("@foo0.com") for to in drafts[0].to))
+
+    def test_iter_drafts_addresses_resolved_format_to_a_single_email(self):
+        drafts = list(
+            iter_drafts(self.jobs, self.template, {"foo1.com": "[first_initial][last]"})
+        )
+
+        self.assertEqual((["jdoe@foo1.com"], True), (drafts[2].to, drafts[2].resolved))
+        self.assertFalse(drafts[0].resolved)
+
+    def test_write_mbox_streams_readable_messages(self):
+        path = os.path.join(self.tmp_dir, "drafts.mbox")
+
+        count = write_mbox(path, iter_drafts(self.jobs, self.template))
+
+        messages = list(mailbox.mbox(path, factory=None))
+        self.assertEqual(6, count)
+        self.assertEqual(6, len(messages))
+        message = email.message_from_bytes(
+            messages[1].as_bytes(), policy=policy.default
+        )
+        self.assertEqual("👋 Zoë, your SWE role", message["Subject"])
+        self.assertEqual(
+            "Hi Zoë,\nhttps://www.linkedin.com/jobs/view/0\n", message.get_content()
+        )
+
+    def test_write_mbox_escapes_from_lines(self):
+        path = os.path.join(self.tmp_dir, "drafts.mbox")
+        drafts = [Draft(["a@foo.com"], "Hi", b"Hi\nFrom here on\n>From there")] * 2
+
+        write_mbox(path, drafts)
+
+        messages = list(mailbox.mbox(path))
+        self.assertEqual(2, len(messages))
+        self.assertIn(
+            b">From here on\n>>From there", messages[0].get_payload(decode=True)
+        )
+
+    def test_write_eml_files_writes_a_file_per_draft(self):
+        directory = os.path.join(self.tmp_dir, "drafts")
+
+        count = write_eml_files(directory, iter_drafts(self.jobs, self.template))
+
+        self.assertEqual(6, count)
+        with open(os.path.join(directory, "draft-000001.eml"), "rb") as f:
+            message = email.message_from_binary_file(f, policy=policy.default)
+        self.assertEqual("1", message["X-Unsent"])
+        self.assertIn("Jane.Doe@foo0.com", message["To"])
+
+    def test_long_lines_are_quoted_printable(self):
+        directory = os.path.join(self.tmp_dir, "drafts")
+        body = ("é" * 2000).encode()
+
+        write_eml_files(directory, [Draft(["a@foo.com"], "Hi", body)])
+
+        with open(os.path.join(directory, "draft-000001.eml"), "rb") as f:
+            message = email.message_from_binary_file(f, policy=policy.default)
+        self.assertEqual("quoted-printable", message["Content-Transfer-Encoding"])
+        self.assertEqual("é" * 2000 + "\n", message.get_content())
+
+    def test_line_breaks_in_headers_are_collapsed(self):
+        directory = os.path.join(self.tmp_dir, "drafts")
+        drafts = [
+            Draft(["a@foo.com\nBcc: b@bar.com"], "Hi\r\nBcc: c@bar.com", b"Hi"),
+            Draft(["a@foo.com"], "Zoë\nBcc: c@bar.com", b"Hi"),
+        ]
+
+        write_eml_files(directory, drafts)
+
+        for name in ["draft-000001.eml", "draft-000002.eml"]:
+            with open(os.path.join(directory, name), "rb") as f:
+                message = email.message_from_binary_file(f, policy=policy.default)
+            self.assertIsNone(message["Bcc"])
+            self.assertIn("Bcc: c@bar.com", message["Subject"])
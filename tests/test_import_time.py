@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest import TestCase
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+MODULES = [
+    "recruiterblast.api",
+    "recruiterblast.models",
+    "recruiterblast.parsers",
+    "recruiterblast.scrapers",
+    "recruiterblast.utils",
+]
+LAZY_MODULES = ["dotenv", "nameparser", "pandas", "tldextract"]
+MAX_CUMULATIVE_IMPORT_TIME_US = 1_000_000
+
+
+def run_importtime(modules: list[str]) -> dict[str, int]:
+    env = {k: v for k, v in os.environ.items() if k != "ENV"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_us = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            cumulative_us[name.strip()] = int(cumulative)
+    return cumulative_us
+
+
+class ImportTimeTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.import_times = run_importtime(MODULES)
+
+    def test_heavy_dependencies_are_not_imported_eagerly(self):
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, self.import_times)
+
+    def test_package_imports_without_environment(self):
+        for module in MODULES:
+            self.assertIn(module, self.import_times)
+
+    def test_cumulative_import_time_within_budget(self):
+        total_us = sum(self.import_times[module] for module in MODULES)
+        self.assertLess(total_us, MAX_CUMULATIVE_IMPORT_TIME_US)
@@ -0,0 +1,124 @@
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from recruiterblast.indexes import (
+    RecruiterIndex,
+    main,
+    tokenize,
+    update_recruiter_index,
+)
+from recruiterblast.models import Company, Employee
+
+
+class RecruiterIndexTest(TestCase):
+    def setUp(self):
+        self.index = RecruiterIndex()
+        self.index.add_many(
+            [
+                Employee(
+                    id=1,
+                    full_name="Jane Doe",
+                    headline="Technical Recruiter",
+                    locale="Austin, Texas, United States",
+                ),
+                Employee(
+                    id=2,
+                    full_name="John Smith",
+                    headline="Senior Technical Recruiter | Software Engineering",
+                    locale="New York, New York, United States",
+                ),
+                Employee(
+                    id=3,
+                    full_name="Ann Lee",
+                    headline="Talent Acquisition Partner",
+                    locale="Austin, Texas, United States",
+                ),
+            ],
+            Company(name="Sphinx Defense", domain="sphinxdefense.com"),
+        )
+        self.index.add(
+            Employee(
+                id=4,
+                full_name="Bob Ray",
+                headline="Technical Recruiting Lead",
+                locale="Austin, Texas, United States",
+            ),
+            Company(name="GitLab", domain="gitlab.com"),
+        )
+
+    def get_names(self, results) -> list[str]:
+        return [result.employee.full_name for result in results]
+
+    def test_tokenize_drops_stopwords(self):
+        self.assertEqual(
+            ["technical", "recruiters", "austin"],
+            tokenize("Technical recruiters in Austin"),
+        )
+
+    def test_query_matches_every_token_across_fields(self):
+        results = self.index.search("technical recruit austin")
+
+        self.assertEqual({"Jane Doe", "Bob Ray"}, set(self.get_names(results)))
+
+    def test_exact_matches_rank_above_prefix_matches(self):
+        self.index.add(
+            Employee(id=5, full_name="Eve Poe", headline="Recruiters Lead"),
+            Company(name="Foo"),
+        )
+
+        results = self.index.search("recruiters")
+
+        self.assertEqual(["Eve Poe"], self.get_names(results))
+
+    def test_company_filter_uses_prefix_search(self):
+        results = self.index.search("recruit", company="sphinx")
+
+        self.assertEqual({"Jane Doe", "John Smith"}, set(self.get_names(results)))
+
+    def test_ranks_by_job_location_and_title(self):
+        results = self.index.search(
+            "recruiter", location="New York, NY", job_title="Software Engineer"
+        )
+
+        self.assertEqual(["John Smith", "Jane Doe"], self.get_names(results))
+
+    def test_duplicate_recruiters_are_indexed_once(self):
+        self.index.add(Employee(id=1, headline="Recruiter"), Company(name="Foo"))
+
+        self.assertEqual(4, len(self.index))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "recruiters.json")
+            self.index.save(path)
+            index = RecruiterIndex.load(path)
+
+        results = index.search("talent", company="sphinxdefense")
+        self.assertEqual(["Ann Lee"], self.get_names(results))
+        self.assertEqual("Sphinx Defense", results[0].company)
+
+    def test_update_recruiter_index_appends_to_saved_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "recruiters.json")
+            self.index.save(path)
+            update_recruiter_index(
+                path,
+                [(Company(name="Foo"), [Employee(id=5, headline="Recruiter")])],
+            )
+            index = RecruiterIndex.load(path)
+
+        self.assertEqual(5, len(index))
+
+    @mock.patch("sys.stdout", new_callable=io.StringIO)
+    def test_main_prints_ranked_recruiters(self, mock_stdout):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "recruiters.json")
+            self.index.save(path)
+            main([path, "technical recruiter", "--location", "Austin", "--limit", "1"])
+
+        results = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        self.assertEqual(1, len(results))
+        self.assertEqual("Jane Doe", results[0]["employee"]["full_name"])
@@ -0,0 +1,49 @@
+import logging
+from unittest import TestCase, mock
+
+import recruiterblast.config as cfg
+from recruiterblast import logger as logger_module
+from recruiterblast.logger import Payload, setup_logger
+
+
+class SetupLoggerTest(TestCase):
+    def test_handlers_are_attached_once(self):
+        setup_logger("tests.logger")
+        logger = setup_logger("tests.logger")
+
+        self.assertEqual(1, len(logger.handlers))
+        self.assertIsInstance(logger.handlers[0], logging.handlers.QueueHandler)
+
+    def test_loggers_share_one_queue_handler(self):
+        logger_1 = setup_logger("tests.logger.one")
+        logger_2 = setup_logger("tests.logger.two")
+
+        self.assertIs(logger_1.handlers[0], logger_2.handlers[0])
+
+
+class PayloadTest(TestCase):
+    def test_small_payload_is_rendered_in_full(self):
+        self.assertEqual("{'foo': 'bar'}", str(Payload({"foo": "bar"})))
+
+    @mock.patch.object(cfg, "LOG_PAYLOAD_MAX_CHARS", 100)
+    def test_large_payload_is_truncated(self):
+        data = {"included": [{"text": "x" * 10_000} for _ in range(1_000)]}
+
+        text = str(Payload(data))
+
+        self.assertLess(len(text), 150)
+        self.assertIn("chars truncated", text)
+
+    @mock.patch.object(cfg, "LOG_PAYLOAD_SAMPLE_RATE", 0.0)
+    def test_unsampled_payload_is_omitted(self):
+        self.assertEqual("<dict omitted>", str(Payload({"foo": "bar"})))
+
+    @mock.patch.dict("os.environ", clear=True)
+    def test_logging_without_env_falls_back_to_info(self):
+        logger_module._get_console_log_level.cache_clear()
+        self.addCleanup(logger_module._get_console_log_level.cache_clear)
+        with mock.patch.dict(cfg.__dict__), mock.patch.object(cfg, "load"):
+            cfg.__dict__.pop("ENV", None)
+            setup_logger("test_no_env").info("hi")
+
+            self.assertEqual(logging.INFO, logger_module._get_console_log_level())
@@ -0,0 +1,196 @@
+import email
+import os
+import smtplib
+import tempfile
+from email import policy
+from unittest import TestCase, mock
+
+from parameterized import parameterized
+from smtp_server import SMTPStandInServer
+
+from recruiterblast.exports import Draft
+from recruiterblast.mailer import (
+    Outbox,
+    SMTPConnectionPool,
+    SMTPMailer,
+    build_outbox_key,
+    is_transient_smtp_error,
+)
+
+
+class SMTPMailerTest(TestCase):
+    def setUp(self):
+        self.server = SMTPStandInServer()
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.outbox = Outbox()
+
+    def create_mailer(self, password="secret", **kwargs) -> SMTPMailer:
+        pool = SMTPConnectionPool(
+            "127.0.0.1", self.server.port, "user", password, size=2, starttls=False
+        )
+        kwargs = {"messages_per_minute": 60000, "retry_delay": 0, **kwargs}
+        return SMTPMailer(pool, self.outbox, "me@foo.com", workers=2, **kwargs)
+
+    def test_sends_queued_messages_over_pooled_connections(self):
+        mailer = self.create_mailer(queue_size=2)
+        mailer.start()
+
+        for i in range(10):
+            mailer.enqueue([f"jane{i}@bar.com"], f"Hi {i}", f"Hello {i} 👋".encode())
+        mailer.stop()
+
+        self.assertEqual(10, len(self.server.messages))
+        self.assertLessEqual(self.server.connections, 2)
+        self.assertEqual({"sent": 10}, self.outbox.get_counts())
+        _, recipients, data = self.server.messages[0]
+        message = email.message_from_bytes(data, policy=policy.default)
+        self.assertEqual(message["To"], recipients[0].strip("TO:<>"))
+        self.assertIn("👋", message.get_content())
+
+    def test_message_is_sent_once_when_enqueued_twice(self):
+        mailer = self.create_mailer()
+        mailer.start()
+
+        self.assertTrue(mailer.enqueue(["jane@bar.com"], "Hi", b"Hello"))
+        self.assertFalse(mailer.enqueue(["jane@bar.com"], "Hi", b"Hello"))
+        mailer.stop()
+
+        self.assertEqual(1, len(self.server.messages))
+
+    def test_message_id_is_stable_per_outbox_key(self):
+        mailer = self.create_mailer()
+        mailer.start()
+        mailer.enqueue(["jane@bar.com"], "Hi", b"Hello")
+        mailer.stop()
+
+        message = email.message_from_bytes(self.server.messages[0][2])
+        key = build_outbox_key("me@foo.com", ["jane@bar.com"], "Hi", b"Hello")
+        self.assertEqual(f"<{key}@recruiterblast.local>", message["Message-ID"])
+
+    @parameterized.expand([("451 Try again later",), ("drop",)])
+    def test_transient_failures_are_retried(self, reply):
+        self.server.data_replies.append(reply)
+        mailer = self.create_mailer()
+        mailer.start()
+
+        mailer.enqueue(["jane@bar.com"], "Hi", b"Hello")
+        mailer.stop()
+
+        self.assertEqual(1, len(self.server.messages))
+        self.assertEqual({"sent": 1}, self.outbox.get_counts())
+
+    def test_permanent_failures_are_not_retried(self):
+        self.server.data_replies.append("550 Mailbox unavailable")
+        mailer = self.create_mailer()
+        mailer.start()
+
+        mailer.enqueue(["jane@bar.com"], "Hi", b"Hello")
+        mailer.stop()
+
+        self.assertEqual([], self.server.messages)
+        self.assertEqual({"failed": 1}, self.outbox.get_counts())
+
+    def test_gives_up_after_max_attempts(self):
+        self.server.data_replies.extend(["451 Try again later"] * 2)
+        mailer = self.create_mailer(max_attempts=2)
+        mailer.start()
+
+        mailer.enqueue(["jane@bar.com"], "Hi", b"Hello")
+        mailer.stop()
+
+        self.assertEqual({"failed": 1}, self.outbox.get_counts())
+
+    def test_authentication_failure_fails_message(self):
+        mailer = self.create_mailer(password="wrong")
+        mailer.start()
+
+        mailer.enqueue(["jane@bar.com"], "Hi", b"Hello")
+        mailer.stop()
+
+        self.assertEqual({"failed": 1}, self.outbox.get_counts())
+
+    def test_failure_before_sending_fails_claimed_message(self):
+        mailer = self.create_mailer()
+        mailer.start()
+
+        with mock.patch.object(
+            SMTPMailer, "_build_message", side_effect=ValueError("bad")
+        ):
+            mailer.enqueue(["jane@bar.com"], "Hi", b"Hello")
+            mailer.stop()
+
+        self.assertEqual({"failed": 1}, self.outbox.get_counts())
+
+    def test_workers_survive_failing_error_logs(self):
+        mailer = self.create_mailer()
+        mailer.start()
+
+        with mock.patch.object(
+            SMTPMailer, "_build_message", side_effect=ValueError("bad")
+        ), mock.patch("recruiterblast.mailer.log.error", side_effect=KeyError("ENV")):
+            for i in range(3):
+                mailer.enqueue([f"jane{i}@bar.com"], "Hi", b"Hello")
+            mailer.stop()
+
+        self.assertEqual({"failed": 3}, self.outbox.get_counts())
+
+    def test_restart_sends_pending_and_skips_interrupted_messages(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "outbox.sqlite3")
+            outbox = Outbox(path)
+            outbox.add("a", "me@foo.com", ["jane@bar.com"], "Hi", b"Hello")
+            outbox.add("b", "me@foo.com", ["john@bar.com"], "Hi", b"Hello")
+            outbox.claim("a")
+            self.outbox = Outbox(path)
+
+            mailer = self.create_mailer()
+            mailer.start()
+            mailer.stop()
+
+            self.assertEqual(1, len(self.server.messages))
+            self.assertEqual("sent", self.outbox.get_status("b"))
+            self.assertEqual("uncertain", self.outbox.get_status("a"))
+
+    def test_send_drafts_only_sends_to_resolved_addresses(self):
+        mailer = self.create_mailer()
+        mailer.start()
+
+        count = mailer.send_drafts(
+            [
+                Draft(["jane@bar.com"], "Hi", b"Hello", resolved=True),
+                Draft(["john.doe@bar.com", "jdoe@bar.com"], "Hi", b"Hello"),
+                Draft([], "Hi", b"Hello"),
+            ]
+        )
+        mailer.stop()
+
+        self.assertEqual(1, count)
+        self.assertEqual(1, len(self.server.messages))
+
+    def test_send_drafts_with_guesses_sends_to_most_likely_address_only(self):
+        mailer = self.create_mailer()
+        mailer.start()
+
+        count = mailer.send_drafts(
+            [Draft(["john.doe@bar.com", "jdoe@bar.com"], "Hi", b"Hello")],
+            include_guesses=True,
+        )
+        mailer.stop()
+
+        _, recipients, _ = self.server.messages[0]
+        self.assertEqual(1, count)
+        self.assertEqual(["john.doe@bar.com"], [r.strip("TO:<>") for r in recipients])
+
+    @parameterized.expand(
+        [
+            (smtplib.SMTPDataError(451, b"Try again"), True),
+            (smtplib.SMTPServerDisconnected(), True),
+            (ConnectionResetError(), True),
+            (smtplib.SMTPDataError(550, b"Unavailable"), False),
+            (smtplib.SMTPAuthenticationError(535, b"Failed"), False),
+            (smtplib.SMTPRecipientsRefused({}), False),
+        ]
+    )
+    def test_is_transient_smtp_error(self, error, expected):
+        self.assertEqual(expected, is_transient_smtp_error(error))
@@ -0,0 +1,154 @@
+import json
+import logging
+import tracemalloc
+from unittest import TestCase, mock
+
+from recruiterblast.api import GoogleGeminiAPIClient
+from recruiterblast.models import Company
+from recruiterblast.profiling import (
+    get_memory_peaks,
+    get_retained_memory,
+    reset_memory_peaks,
+)
+from recruiterblast.scrapers import GoogleSearchScraper, LinkedInScraper
+from recruiterblast.stores import CompanyStore
+
+MB = 2**20
+
+
+def make_employee_response(count: int) -> dict:
+    return {
+        "included": [
+            {
+                "bserpEntityNavigationalUrl": f"https://www.linkedin.com/in/{i}",
+                "trackingUrn": f"urn:li:member:{i}",
+                "title": {"text": f"Jane{i} Doe{i}"},
+                "primarySubtitle": {"text": "Technical Recruiter at Foo " * 4},
+                "secondarySubtitle": {"text": "New York, NY"},
+                "navigationUrl": f"https://www.linkedin.com/in/{i}?miniProfileUrn=x",
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def make_company_response(count: int, description_size: int) -> dict:
+    # A company entry among `count` unrelated included entities, as in the
+    # job posting company response.
+    return {
+        "included": [
+            {"entityUrn": f"urn:li:fsd_jobPosting:{i}", "title": "Engineer " * 20}
+            for i in range(count)
+        ]
+        + [
+            {"entityUrn": "urn:li:fsd_industry:4", "name": "Software Development"},
+            {
+                "entityUrn": "urn:li:fsd_company:1",
+                "name": "Foo",
+                "employeeCount": 500,
+                "description": "x" * description_size,
+            },
+        ]
+    }
+
+
+def make_search_response(count: int) -> dict:
+    return {
+        "items": [
+            {"snippet": f"Contact jane{i}.doe@foo.com for details. " * 20}
+            for i in range(count)
+        ]
+    }
+
+
+def make_job_description(size: int) -> str:
+    paragraph = (
+        "We are looking for a backend engineer with Python, SQL and AWS "
+        "experience to build data pipelines for our platform.\n\n"
+    )
+    return paragraph * (size // len(paragraph))
+
+
+class MemoryBudgetTest(TestCase):
+    # Regression budgets for each scraper stage's peak and retained allocation
+    # on large synthetic responses, measured with tracemalloc. Each stage runs
+    # once on a small response first so lazy imports are not counted, and
+    # logging is disabled as queued log records would otherwise count towards
+    # the peaks.
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        # Stored recruiters expire immediately so every run fetches and saves.
+        patcher = mock.patch(
+            "recruiterblast.scrapers.get_company_store",
+            return_value=CompanyStore(recruiter_ttl_seconds=0),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch("recruiterblast.scrapers.sleep_for_random_n_seconds")
+    @mock.patch.object(LinkedInScraper, "_fetch_recruiters_from_company")
+    def test_recruiters_stage(self, mock_fetch, mock_sleep):
+        scraper = LinkedInScraper("https://www.linkedin.com/jobs/view/1")
+        mock_fetch.return_value = make_employee_response(1)
+        scraper.fetch_recruiters_from_company(Company(id=1))
+        reset_memory_peaks()
+        mock_fetch.return_value = make_employee_response(1000)
+
+        recruiters = scraper.fetch_recruiters_from_company(Company(id=1))
+
+        self.assertEqual(1000, len(recruiters))
+        self.assertLess(get_memory_peaks()["linkedin.recruiters"], 1 * MB)
+
+    @mock.patch.object(LinkedInScraper, "fetch_company_domain", return_value="foo.com")
+    @mock.patch.object(LinkedInScraper, "_fetch_company_from_job_post")
+    def test_company_stage(self, mock_fetch, mock_domain):
+        mock_fetch.return_value = make_company_response(1, 100)
+        LinkedInScraper(
+            "https://www.linkedin.com/jobs/view/1"
+        ).fetch_company_from_job_post()
+        reset_memory_peaks()
+        description_size = 1 * MB
+        mock_fetch.return_value = make_company_response(5000, description_size)
+
+        company = LinkedInScraper(
+            "https://www.linkedin.com/jobs/view/2"
+        ).fetch_company_from_job_post()
+
+        self.assertEqual(500, company.employee_count)
+        self.assertLess(get_memory_peaks()["linkedin.company"], MB // 64)
+        self.assertLess(get_retained_memory()["linkedin.company"], MB // 64)
+
+    @mock.patch.object(GoogleSearchScraper, "_search_google")
+    def test_domain_emails_stage(self, mock_search):
+        mock_search.return_value = make_search_response(1)
+        GoogleSearchScraper().scrape_emails_from_company_domain("foo.com")
+        reset_memory_peaks()
+        mock_search.return_value = make_search_response(10)
+
+        emails = GoogleSearchScraper().scrape_emails_from_company_domain("foo.com")
+
+        self.assertEqual(10, len(emails))
+        self.assertLess(get_memory_peaks()["google.domain_emails"], MB // 16)
+
+    @mock.patch.object(GoogleGeminiAPIClient, "_make_request")
+    def test_summary_stage(self, mock_request):
+        summary = {
+            "core_responsibilities": ["Build pipelines"],
+            "technical_requirements": ["Python"],
+            "soft_skills": ["Communication"],
+            "highlights": ["Remote"],
+        }
+        mock_request.return_value = {
+            "candidates": [{"content": {"parts": [{"text": json.dumps(summary)}]}}]
+        }
+        client = GoogleGeminiAPIClient()
+        client.parse_relevant_job_description_info(make_job_description(1000))
+        reset_memory_peaks()
+        description = make_job_description(1 * MB)
+
+        client.parse_relevant_job_description_info(description)
+
+        self.assertLess(get_memory_peaks()["gemini.summary"], 5 * len(description))
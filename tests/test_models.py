@@ -0,0 +1,129 @@
+import gc
+import importlib.util
+import tracemalloc
+from unittest import TestCase, skipUnless
+
+from recruiterblast.models import Company, Employee, JobPost, RecruiterBatch
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+LOCALES = ["Austin, Texas, United States", "New York, New York, United States"]
+
+
+def make_employees(count: int):
+    for i in range(count):
+        yield Employee(
+            id=100000000 + i,
+            first_name=f"Jane{i}",
+            last_name=f"Doe{i}",
+            full_name=f"Jane{i} Doe{i}",
+            headline=f"Senior Technical Recruiter {i}",
+            locale=LOCALES[i % len(LOCALES)],
+            profile_url=f"https://www.linkedin.com/in/jane-doe-{i}",
+        )
+
+
+def get_allocated_bytes(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        result = build()
+        allocated = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    del result
+    return allocated
+
+
+class ModelTest(TestCase):
+    def test_models_are_slotted(self):
+        for model in (Company(), Employee(), JobPost()):
+            self.assertFalse(hasattr(model, "__dict__"))
+
+    def test_as_df_lists_every_field(self):
+        company = Company(id=1, name="Sphinx Defense", domain="sphinxdefense.com")
+
+        df = company.as_df()
+
+        self.assertEqual(
+            ["id", "name", "industry", "domain", "employee_count", "description"],
+            list(df["Field"]),
+        )
+        self.assertEqual("sphinxdefense.com", df["Details"][3])
+
+
+class RecruiterBatchTest(TestCase):
+    def setUp(self):
+        self.employees = [
+            Employee(
+                id=1,
+                first_name="Jane",
+                last_name="Doe",
+                full_name="Jane Doe",
+                headline="Technical Recruiter",
+                locale="Austin, TX",
+                profile_url="https://www.linkedin.com/in/jane",
+            ),
+            Employee(
+                id=2,
+                first_name="John",
+                last_name="Smith",
+                full_name="John Smith",
+                headline="Talent Acquisition",
+                locale="Austin, TX",
+                profile_url="https://www.linkedin.com/in/john",
+            ),
+        ]
+
+    def test_round_trips_employees(self):
+        batch = RecruiterBatch.from_employees(self.employees)
+
+        self.assertEqual(2, len(batch))
+        self.assertEqual(self.employees, batch.to_employees())
+        self.assertEqual(self.employees[1], batch[1])
+
+    def test_columns_are_parallel(self):
+        batch = RecruiterBatch.from_employees(self.employees)
+
+        columns = batch.columns()
+
+        self.assertEqual([1, 2], columns["id"])
+        self.assertEqual(["Jane Doe", "John Smith"], columns["full_name"])
+        self.assertIs(columns["locale"][0], columns["locale"][1])
+
+    def test_to_pandas(self):
+        batch = RecruiterBatch.from_employees(self.employees)
+
+        df = batch.to_pandas()
+
+        self.assertEqual((2, 7), df.shape)
+        self.assertEqual(["Jane", "John"], list(df["first_name"]))
+
+    def test_round_trips_missing_values(self):
+        employees = [Employee(), Employee(id=0, first_name="", locale="")]
+
+        batch = RecruiterBatch.from_employees(employees)
+
+        self.assertEqual(employees, batch.to_employees())
+
+    @skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_to_arrow(self):
+        batch = RecruiterBatch.from_employees(self.employees + [Employee()])
+
+        table = batch.to_arrow()
+
+        self.assertEqual(3, table.num_rows)
+        self.assertEqual([1, 2, None], table.column("id").to_pylist())
+        self.assertEqual(
+            ["Austin, TX", "Austin, TX", None], table.column("locale").to_pylist()
+        )
+
+    def test_uses_a_fraction_of_the_memory_of_employee_objects(self):
+        count = 20000
+
+        objects = get_allocated_bytes(lambda: list(make_employees(count)))
+        batch = get_allocated_bytes(
+            lambda: RecruiterBatch.from_employees(make_employees(count))
+        )
+
+        self.assertLess(batch * 2.5, objects)
@@ -0,0 +1,209 @@
+import threading
+import time
+from unittest import TestCase, mock
+
+from recruiterblast.models import Company, Employee, JobPost
+from recruiterblast.orchestrator import (
+    ScrapeResult,
+    ScraperOrchestrator,
+    SourceLimits,
+    get_company_key,
+    get_employee_key,
+    merge_results,
+    parse_source_limits,
+)
+from recruiterblast.scrapers import BaseScraper
+
+
+class FakeScraper(BaseScraper):
+    lock = threading.Lock()
+    running = {}
+    peaks = {}
+
+    def __init__(self, source, company, recruiters=(), delay=0.0, error=None):
+        self.source = source
+        self.job_id = f"{source}-{company.name}"
+        self.company = company
+        self.recruiters = list(recruiters)
+        self.delay = delay
+        self.error = error
+
+    def fetch_company_from_job_post(self) -> Company:
+        with self.lock:
+            self.running[self.source] = self.running.get(self.source, 0) + 1
+            self.peaks[self.source] = max(
+                self.peaks.get(self.source, 0), self.running[self.source]
+            )
+        try:
+            time.sleep(self.delay)
+        finally:
+            with self.lock:
+                self.running[self.source] -= 1
+        if self.error:
+            raise self.error
+        return self.company
+
+    def fetch_recruiters_from_company(self, company: Company) -> list[Employee]:
+        return self.recruiters
+
+
+class ScraperOrchestratorTest(TestCase):
+    def setUp(self):
+        FakeScraper.running.clear()
+        FakeScraper.peaks.clear()
+
+    def test_sources_run_concurrently_within_their_limits(self):
+        scrapers = [
+            FakeScraper(source, Company(name=f"Foo{i}"), delay=0.1)
+            for source in ["linkedin", "indeed"]
+            for i in range(2)
+        ]
+        orchestrator = ScraperOrchestrator(
+            {"linkedin": SourceLimits(1), "indeed": SourceLimits(2)}
+        )
+
+        start = time.perf_counter()
+        results = orchestrator.run(scrapers)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(["Foo0", "Foo1"] * 2, [r.company.name for r in results])
+        self.assertEqual({"linkedin": 1, "indeed": 2}, FakeScraper.peaks)
+        self.assertLess(elapsed, 0.35)
+
+    def test_failed_scraper_does_not_fail_the_run(self):
+        scrapers = [
+            FakeScraper("linkedin", Company(name="Foo"), error=RuntimeError("429")),
+            FakeScraper("indeed", Company(name="Foo")),
+        ]
+
+        with self.assertLogs("recruiterblast.orchestrator", "ERROR"):
+            results = ScraperOrchestrator({}).run(scrapers)
+
+        self.assertEqual("429", results[0].error)
+        self.assertEqual("Foo", results[1].company.name)
+
+    @mock.patch("recruiterblast.orchestrator.RateLimiter")
+    def test_rate_limited_sources_acquire_before_each_call(self, mock_limiter):
+        scrapers = [FakeScraper("linkedin", Company(name=f"Foo{i}")) for i in range(3)]
+        orchestrator = ScraperOrchestrator(
+            {"linkedin": SourceLimits(2, requests_per_minute=30)}
+        )
+
+        orchestrator.run(scrapers)
+
+        mock_limiter.assert_called_once_with(30, 60)
+        self.assertEqual(6, mock_limiter.return_value.acquire.call_count)
+
+    def test_recruiters_are_fetched_once_per_company_and_source(self):
+        scrapers = [
+            FakeScraper(source, Company(name="Foo", domain="foo.com"), delay=0.05)
+            for source in ["linkedin", "linkedin", "indeed"]
+        ]
+
+        with mock.patch.object(
+            FakeScraper, "fetch_recruiters_from_company", return_value=[]
+        ) as mock_fetch:
+            ScraperOrchestrator({"linkedin": SourceLimits(2)}).run(scrapers)
+
+        self.assertEqual(2, mock_fetch.call_count)
+
+    def test_job_post_details_are_fetched_from_sources_that_have_them(self):
+        scraper = FakeScraper("linkedin", Company(name="Foo"))
+        scraper.has_job_post_details = True
+
+        with mock.patch.object(
+            FakeScraper, "fetch_job_post_details", return_value=JobPost(id="1")
+        ):
+            results = ScraperOrchestrator({}).run(
+                [scraper, FakeScraper("indeed", Company(name="Foo"))]
+            )
+
+        self.assertEqual(["1", None], [r.job_post and r.job_post.id for r in results])
+
+    def test_run_merged_combines_sources(self):
+        scrapers = [
+            FakeScraper(
+                "linkedin",
+                Company(name="Foo, Inc.", domain="foo.com", employee_count=10),
+                [
+                    Employee(
+                        full_name="Jane Doe", profile_url="https://linkedin.com/in/jane"
+                    )
+                ],
+            ),
+            FakeScraper(
+                "indeed",
+                Company(name="Foo", domain="WWW.Foo.com", industry="Software"),
+                [
+                    Employee(
+                        full_name="Jane Doe",
+                        headline="Recruiter",
+                        profile_url="https://www.linkedin.com/in/jane/",
+                    ),
+                    Employee(full_name="John Roe"),
+                ],
+            ),
+        ]
+
+        merged = ScraperOrchestrator({}).run_merged(scrapers)
+
+        self.assertEqual(1, len(merged))
+        self.assertEqual(
+            Company(
+                name="Foo, Inc.",
+                domain="foo.com",
+                employee_count=10,
+                industry="Software",
+            ),
+            merged[0].company,
+        )
+        self.assertEqual(["linkedin", "indeed"], merged[0].sources)
+        self.assertEqual(
+            ["Jane Doe", "John Roe"], [r.full_name for r in merged[0].recruiters]
+        )
+        self.assertEqual("Recruiter", merged[0].recruiters[0].headline)
+
+    def test_merge_results_does_not_modify_scraped_recruiters(self):
+        recruiter = Employee(full_name="Jane Doe")
+        results = [
+            ScrapeResult("a", company=Company(name="Foo"), recruiters=[recruiter]),
+            ScrapeResult(
+                "b",
+                company=Company(name="Foo"),
+                recruiters=[Employee(full_name="Jane Doe", headline="Recruiter")],
+            ),
+        ]
+
+        merge_results(results)
+
+        self.assertIsNone(recruiter.headline)
+
+
+class OrchestratorHelpersTest(TestCase):
+    def test_parse_source_limits(self):
+        self.assertEqual(
+            {
+                "linkedin": SourceLimits(2, 30.0),
+                "indeed": SourceLimits(concurrency=4),
+            },
+            parse_source_limits(
+                "linkedin.concurrency=2, linkedin.requests_per_minute=30,"
+                "indeed.concurrency=4"
+            ),
+        )
+
+    def test_parse_source_limits_rejects_unknown_settings(self):
+        with self.assertRaises(ValueError):
+            parse_source_limits("linkedin.threads=2")
+
+    def test_company_key_ignores_case_and_legal_suffixes(self):
+        self.assertEqual(
+            get_company_key(Company(name="Foo Corp.")),
+            get_company_key(Company(name="foo")),
+        )
+
+    def test_employee_key_falls_back_to_name(self):
+        self.assertEqual(
+            get_employee_key(Employee(full_name="Jane  Doe")),
+            get_employee_key(Employee(first_name="jane", last_name="doe")),
+        )
@@ -0,0 +1,133 @@
+import importlib.util
+import os
+import tempfile
+from datetime import date
+from unittest import TestCase, mock, skipUnless
+
+from recruiterblast.models import Company, Employee, JobPost
+from recruiterblast.parquet import (
+    COMPANIES_DATASET,
+    JOB_POSTS_DATASET,
+    RECRUITERS_DATASET,
+    build_table,
+    compact_parquet_results,
+    open_parquet_dataset,
+    write_parquet_results,
+)
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+@skipUnless(HAS_PYARROW, "pyarrow is not installed")
+class ParquetExportTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = tmp_dir.name
+        company = Company(id=1, name="Foo", domain="foo.com")
+        recruiters = [
+            Employee(id=10, first_name="Jane", last_name="Doe"),
+            Employee(id=11, first_name="John", last_name="Roe"),
+        ]
+        self.jobs = [
+            (
+                company,
+                JobPost(
+                    id="100",
+                    title="SWE",
+                    technical_requirements=["Python", "SQL"],
+                    highlights=["Remote"],
+                ),
+                recruiters,
+            ),
+            (company, JobPost(id=101, title="SRE"), recruiters),
+        ]
+
+    def _read(self, name: str) -> list[dict]:
+        return open_parquet_dataset(self.root, name).to_table().to_pylist()
+
+    def _count_files(self, name: str) -> int:
+        return sum(
+            name.endswith(".parquet")
+            for _, _, names in os.walk(os.path.join(self.root, name))
+            for name in names
+        )
+
+    def test_write_parquet_results_writes_each_company_once(self):
+        counts = write_parquet_results(self.root, self.jobs, date(2026, 1, 2))
+
+        self.assertEqual(
+            {JOB_POSTS_DATASET: 2, COMPANIES_DATASET: 1, RECRUITERS_DATASET: 2},
+            counts,
+        )
+        job_posts = sorted(self._read(JOB_POSTS_DATASET), key=lambda r: r["id"])
+        self.assertEqual(["100", "101"], [row["id"] for row in job_posts])
+        self.assertEqual(["Python", "SQL"], job_posts[0]["technical_requirements"])
+        self.assertEqual([], job_posts[1]["highlights"])
+        self.assertEqual("2026-01-02", job_posts[0]["export_date"])
+        self.assertEqual(1, job_posts[0]["company_id"])
+        recruiters = self._read(RECRUITERS_DATASET)
+        self.assertEqual({"foo.com"}, {row["company_domain"] for row in recruiters})
+        self.assertEqual(
+            ["Foo"], [row["name"] for row in self._read(COMPANIES_DATASET)]
+        )
+
+    def test_write_parquet_results_appends(self):
+        write_parquet_results(self.root, self.jobs, date(2026, 1, 2))
+        write_parquet_results(self.root, self.jobs, date(2026, 1, 2))
+        write_parquet_results(self.root, self.jobs, date(2026, 1, 3))
+
+        self.assertEqual(6, len(self._read(JOB_POSTS_DATASET)))
+        self.assertEqual(3, self._count_files(JOB_POSTS_DATASET))
+        rows = (
+            open_parquet_dataset(self.root, JOB_POSTS_DATASET)
+            .to_table(filter=self._partition_filter("2026-01-03"))
+            .num_rows
+        )
+        self.assertEqual(2, rows)
+
+    def test_compact_parquet_results_merges_partition_files(self):
+        for _ in range(3):
+            write_parquet_results(self.root, self.jobs, date(2026, 1, 2))
+        write_parquet_results(self.root, self.jobs, date(2026, 1, 3))
+
+        compacted = compact_parquet_results(self.root)
+
+        self.assertEqual(3, compacted)
+        self.assertEqual(2, self._count_files(JOB_POSTS_DATASET))
+        job_posts = self._read(JOB_POSTS_DATASET)
+        self.assertEqual(8, len(job_posts))
+        self.assertEqual(
+            ["Python", "SQL"],
+            next(r for r in job_posts if r["id"] == "100")["technical_requirements"],
+        )
+        self.assertEqual(0, compact_parquet_results(self.root))
+
+    def test_compact_parquet_results_removes_inputs_left_by_interrupted_run(self):
+        write_parquet_results(self.root, self.jobs, date(2026, 1, 2))
+        write_parquet_results(self.root, self.jobs, date(2026, 1, 2))
+        with mock.patch("recruiterblast.parquet.os.remove"):
+            compact_parquet_results(self.root)
+        self.assertEqual(3, self._count_files(JOB_POSTS_DATASET))
+
+        compact_parquet_results(self.root)
+
+        self.assertEqual(1, self._count_files(JOB_POSTS_DATASET))
+        self.assertEqual(4, len(self._read(JOB_POSTS_DATASET)))
+
+    def test_build_table_converts_values_to_column_types(self):
+        table = build_table(
+            {"id": "string", "skills": "list<string>"},
+            [{"id": 1, "skills": None}, {"id": None, "skills": [2]}],
+        )
+
+        self.assertEqual(
+            [{"id": "1", "skills": []}, {"id": None, "skills": ["2"]}],
+            table.to_pylist(),
+        )
+
+    @staticmethod
+    def _partition_filter(export_date: str):
+        import pyarrow.dataset as ds
+
+        return ds.field("export_date") == export_date
@@ -5,11 +5,15 @@ from parameterized import parameterized
 
 from recruiterblast.parsers import (
     GoogleGeminiAPIResponseParser,
+    IncrementalJSONListParser,
     LinkedinCompanyAPIResponseParser,
     LinkedInJobPostAPIResponseParser,
     parse_emails_from_text,
     parse_linkedin_job_url,
+    parse_json_object_leniently,
     parse_rocket_reach_email_format,
+    parse_search_keywords,
+    validate_string_lists,
 )
 from recruiterblast.utils import iso_to_utc_timestamp
 
@@ -81,6 +85,20 @@ class ParserTest(TestCase):
         actual = parse_rocket_reach_email_format(text)
         self.assertEqual(expected, actual)
 
+    @parameterized.expand(
+        [
+            ("recruiter,talent acquisition", ["recruiter", "talent acquisition"]),
+            (
+                " recruiter , talent   acquisition ,",
+                ["recruiter", "talent acquisition"],
+            ),
+            ("Recruiter,recruiter,sourcer", ["Recruiter", "sourcer"]),
+            ("", []),
+        ]
+    )
+    def test_parse_search_keywords(self, text: str, expected: list[str]):
+        self.assertEqual(expected, parse_search_keywords(text))
+
 
 class EmailParserTest(TestCase):
 
@@ -223,3 +241,81 @@ class TestGoogleGeminiAPIResponseParser(TestCase):
         parser = GoogleGeminiAPIResponseParser(MOCK_GOOGLE_GEMINI_API_RESPONSE)
         actual = parser.get_response_text()
         self.assertEqual(expected, actual)
+
+
+class TestIncrementalJSONListParser(TestCase):
+    def test_emits_items_as_they_complete(self):
+        text = (
+            '```json\n{"core_responsibilities": ["foo", "b\\"ar"],'
+            '"technical_requirements": ["Python", "SQL"],'
+            '"soft_skills": [], "highlights": ["qux"]}\n```'
+        )
+        parser = IncrementalJSONListParser()
+
+        items = []
+        for char in text:
+            items.extend(parser.feed(char))
+
+        self.assertEqual(
+            [
+                ("core_responsibilities", "foo"),
+                ("core_responsibilities", 'b"ar'),
+                ("technical_requirements", "Python"),
+                ("technical_requirements", "SQL"),
+                ("highlights", "qux"),
+            ],
+            items,
+        )
+
+    def test_incomplete_item_is_held_back(self):
+        parser = IncrementalJSONListParser()
+
+        self.assertEqual([], parser.feed('{"highlights": ["remote fri'))
+        self.assertEqual([("highlights", "remote friendly")], parser.feed('endly"'))
+
+
+class LenientJSONParserTest(TestCase):
+    @parameterized.expand(
+        [
+            ("valid", '{"a": ["x"]}', {"a": ["x"]}, False),
+            ("fenced", '```JSON\n{"a": ["x"]}\n```', {"a": ["x"]}, True),
+            ("trailing_commas", '{"a": ["x",], "b": [],}', {"a": ["x"], "b": []}, True),
+            (
+                "surrounding_text",
+                'Sure! {"a": ["x"]} Hope it helps',
+                {"a": ["x"]},
+                True,
+            ),
+            ("truncated_member", '{"a": ["x"], "b": ["y', {"a": ["x"]}, True),
+            ("dangling_key", '{"a": ["x"], "b":', {"a": ["x"]}, True),
+            (
+                "trailing_object",
+                '{"a": ["x"]} trailing {junk}',
+                {"a": ["x"]},
+                True,
+            ),
+            (
+                "brace_in_string",
+                '{"a": ["x}"], "b": ["y"',
+                {"a": ["x}"]},
+                True,
+            ),
+            (
+                "truncated_nested_object",
+                '{"a": ["x"], "b": {"c": ["y"',
+                {"a": ["x"]},
+                True,
+            ),
+            ("not_json", "no json here", {}, False),
+        ]
+    )
+    def test_parse_json_object_leniently(self, name, text, expected, is_repaired):
+        self.assertEqual((expected, is_repaired), parse_json_object_leniently(text))
+
+    def test_validate_string_lists(self):
+        data = {"a": ["x", " ", 1], "b": "y", "c": {"z": 1}}
+
+        valid, invalid_fields = validate_string_lists(data, ["a", "b", "c", "d"])
+
+        self.assertEqual({"a": ["x", "1"], "b": ["y"]}, valid)
+        self.assertEqual(["c", "d"], invalid_fields)
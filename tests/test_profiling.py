@@ -0,0 +1,125 @@
+import os
+import pstats
+import tempfile
+import threading
+import time
+import tracemalloc
+from unittest import TestCase, mock
+
+import recruiterblast.config as cfg
+from recruiterblast.profiling import (
+    StackSampler,
+    get_memory_peaks,
+    get_retained_memory,
+    profile_run,
+    reset_memory_peaks,
+    trace_memory,
+)
+
+
+def busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class ProfilingTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output_dir = directory.name
+
+    def test_disabled_by_default(self):
+        with mock.patch.object(cfg, "PROFILING_ENABLED", False):
+            with profile_run("123", output_dir=self.output_dir) as path:
+                busy_wait(0.01)
+
+        self.assertIsNone(path)
+        self.assertEqual([], os.listdir(self.output_dir))
+
+    def test_writes_pstats_and_collapsed_stacks_keyed_by_job_id(self):
+        with mock.patch.object(cfg, "PROFILING_INTERVAL_MILLISECONDS", 1):
+            with profile_run("123", enabled=True, output_dir=self.output_dir) as path:
+                busy_wait(0.1)
+
+        self.assertTrue(os.path.basename(path).startswith("123-"))
+        stats = pstats.Stats(f"{path}.pstats")
+        self.assertTrue(
+            any(name == "busy_wait" for _, _, name in stats.stats),
+        )
+        with open(f"{path}.collapsed") as f:
+            lines = f.read().splitlines()
+        self.assertTrue(any("test_profiling.py:busy_wait" in line for line in lines))
+
+    def test_sample_rate_skips_runs(self):
+        with mock.patch.object(cfg, "PROFILING_SAMPLE_RATE", 0.0):
+            with profile_run("123", enabled=True, output_dir=self.output_dir) as path:
+                pass
+
+        self.assertIsNone(path)
+
+    def test_concurrent_runs_are_skipped(self):
+        inner_paths = []
+        with profile_run("1", enabled=True, output_dir=self.output_dir):
+
+            def run():
+                with profile_run("2", enabled=True, output_dir=self.output_dir) as p:
+                    inner_paths.append(p)
+
+            thread = threading.Thread(target=run)
+            thread.start()
+            thread.join()
+
+        self.assertEqual([None], inner_paths)
+
+    def test_stack_sampler_collapses_stacks(self):
+        sampler = StackSampler(threading.get_ident(), 0.001)
+        sampler.start()
+        busy_wait(0.05)
+        sampler.stop()
+
+        stack, count = sampler.stacks.most_common(1)[0]
+        self.assertIn("busy_wait", stack.split(";")[-1])
+        self.assertGreater(count, 0)
+
+
+class MemoryTracingTest(TestCase):
+    def setUp(self):
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        reset_memory_peaks()
+
+    def test_nested_stages_fold_peaks_into_outer_stage(self):
+        with trace_memory("outer"):
+            data = bytearray(2_000_000)
+            del data
+            with trace_memory("inner"):
+                data = bytearray(1_000_000)
+                del data
+
+        peaks = get_memory_peaks()
+        self.assertGreater(peaks["outer"], 1_900_000)
+        self.assertGreater(peaks["inner"], 900_000)
+        self.assertLess(peaks["inner"], 1_900_000)
+
+    def test_records_memory_retained_after_stage(self):
+        with trace_memory("stage"):
+            kept = bytearray(1_000_000)
+            data = bytearray(2_000_000)
+            del data
+
+        retained = get_retained_memory()["stage"]
+        self.assertGreater(retained, 900_000)
+        self.assertLess(retained, 1_900_000)
+        self.assertGreater(get_memory_peaks()["stage"], 2_900_000)
+        del kept
+
+    def test_disabled_without_tracing(self):
+        tracemalloc.stop()
+
+        with mock.patch.object(cfg, "MEMORY_TRACING_ENABLED", False):
+            with trace_memory("stage"):
+                pass
+
+        self.assertEqual({}, get_memory_peaks())
+        self.assertEqual({}, get_retained_memory())
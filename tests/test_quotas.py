@@ -0,0 +1,44 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from recruiterblast.quotas import DailyQuotaBudget, QuotaExceededError
+
+
+class DailyQuotaBudgetTest(TestCase):
+    def setUp(self):
+        self.quota = DailyQuotaBudget("google.search", daily_limit=10, reserve=3)
+
+    def test_acquire_spends_quota(self):
+        self.assertTrue(self.quota.acquire())
+        self.assertEqual(9, self.quota.remaining())
+
+    def test_defers_optional_queries_within_reserve(self):
+        self.quota.used = 7
+
+        self.assertFalse(self.quota.acquire(essential=False))
+        self.assertTrue(self.quota.acquire())
+        self.assertEqual(8, self.quota.used)
+
+    def test_refuses_queries_past_the_limit(self):
+        self.quota.used = 10
+
+        with self.assertRaises(QuotaExceededError):
+            self.quota.acquire()
+
+    def test_resets_on_new_day(self):
+        self.quota.used = 10
+
+        with mock.patch(
+            "recruiterblast.quotas.get_quota_day", return_value="2099-01-01"
+        ):
+            self.assertEqual(10, self.quota.remaining())
+
+    def test_persists_usage_for_the_same_day(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "quota.json")
+            DailyQuotaBudget("google.search", 10, path=path).acquire(cost=4)
+
+            quota = DailyQuotaBudget("google.search", 10, path=path)
+
+        self.assertEqual(6, quota.remaining())
@@ -0,0 +1,129 @@
+import asyncio
+import struct
+from unittest import IsolatedAsyncioTestCase
+
+from recruiterblast import metrics
+from recruiterblast.resolvers import (
+    DNS_TYPE_MX,
+    MXResolver,
+    encode_dns_name,
+    prune_email_candidates,
+)
+
+STUB_MX_RECORDS = {
+    "example.com": [(10, "mx1.example.com"), (20, "mx2.example.com")],
+    "null.test": [(0, "")],
+    "nodata.test": [],
+}
+
+
+def build_stub_response(query: bytes) -> bytes:
+    query_id = struct.unpack_from("!H", query)[0]
+    labels, offset = [], 12
+    while query[offset]:
+        length = query[offset]
+        labels.append(query[offset + 1 : offset + 1 + length].decode())
+        offset += length + 1
+    question = query[12 : offset + 5]
+    records = STUB_MX_RECORDS.get(".".join(labels))
+
+    if ".".join(labels) == "malformed.test":
+        # Claims an answer but ends after the question.
+        header = struct.pack("!HHHHHH", query_id, 0x8180, 1, 1, 0, 0)
+        return header + question
+    if records is None:
+        header = struct.pack("!HHHHHH", query_id, 0x8183, 1, 0, 0, 0)
+        return header + question
+
+    answers = b""
+    for preference, exchange in records:
+        rdata = struct.pack("!H", preference) + encode_dns_name(exchange)
+        answers += struct.pack("!HHHIH", 0xC00C, DNS_TYPE_MX, 1, 600, len(rdata))
+        answers += rdata
+    header = struct.pack("!HHHHHH", query_id, 0x8180, 1, len(records), 0, 0)
+    return header + question + answers
+
+
+class StubDNSServerProtocol(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.queries = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.queries += 1
+        self.transport.sendto(build_stub_response(data), addr)
+
+
+class MXResolverTest(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        loop = asyncio.get_running_loop()
+        self.transport, self.server = await loop.create_datagram_endpoint(
+            StubDNSServerProtocol, local_addr=("127.0.0.1", 0)
+        )
+        port = self.transport.get_extra_info("sockname")[1]
+        self.resolver = MXResolver(nameserver="127.0.0.1", port=port, timeout=1)
+        metrics.reset_counters()
+
+    async def asyncTearDown(self):
+        self.transport.close()
+
+    async def test_resolves_mx_records_in_preference_order(self):
+        exchanges = await self.resolver.resolve_mx("Example.com")
+
+        self.assertEqual(["mx1.example.com", "mx2.example.com"], exchanges)
+
+    async def test_can_receive_mail(self):
+        self.assertTrue(await self.resolver.can_receive_mail("example.com"))
+        self.assertFalse(await self.resolver.can_receive_mail("nomail.test"))
+        self.assertFalse(await self.resolver.can_receive_mail("null.test"))
+
+    async def test_domain_without_mx_records_can_receive_mail(self):
+        self.assertEqual([], await self.resolver.resolve_mx("nodata.test"))
+        self.assertTrue(await self.resolver.can_receive_mail("nodata.test"))
+
+    async def test_concurrent_and_repeated_lookups_share_one_query(self):
+        await asyncio.gather(
+            *(self.resolver.resolve_mx("example.com") for _ in range(10))
+        )
+        await self.resolver.resolve_mx("example.com")
+
+        self.assertEqual(1, self.server.queries)
+        self.assertEqual(1, metrics.get_counters("dns.")["dns.mx.cache_hits"])
+
+    async def test_prune_email_candidates(self):
+        candidates = {
+            1: ["jane.doe@example.com", "jdoe@example.com"],
+            2: ["john.smith@nomail.test"],
+            3: ["ann.lee@example.com", "ann.lee@null.test"],
+        }
+
+        actual = await prune_email_candidates(candidates, self.resolver)
+
+        self.assertEqual(
+            {
+                1: ["jane.doe@example.com", "jdoe@example.com"],
+                2: [],
+                3: ["ann.lee@example.com"],
+            },
+            actual,
+        )
+        self.assertEqual(3, self.server.queries)
+
+    async def test_lookups_in_flight_on_another_loop_are_not_shared(self):
+        other_loop = asyncio.new_event_loop()
+        self.addCleanup(other_loop.close)
+        self.resolver.pending[(other_loop, "example.com")] = other_loop.create_future()
+
+        exchanges = await self.resolver.resolve_mx("example.com")
+
+        self.assertEqual(["mx1.example.com", "mx2.example.com"], exchanges)
+
+    async def test_malformed_response_fails_open(self):
+        self.assertTrue(await self.resolver.can_receive_mail("malformed.test"))
+
+    async def test_unreachable_nameserver_fails_open(self):
+        resolver = MXResolver(nameserver="127.0.0.1", port=9, timeout=0.05)
+
+        self.assertTrue(await resolver.can_receive_mail("example.com"))
@@ -8,11 +8,23 @@ from constants import (
     MOCK_GOOGLE_SEARCH_API_ROCKETREACH_EMAIL_FORMAT_RESPONSE,
 )
 
+import recruiterblast.config as cfg
+from recruiterblast import metrics
 from recruiterblast.models import Company
+from recruiterblast.quotas import DailyQuotaBudget
 from recruiterblast.scrapers import GoogleSearchScraper, LinkedInScraper
+from recruiterblast.stores import CompanyStore
 
 
 class LinkedInScraperTest(TestCase):
+    def setUp(self):
+        self.store = CompanyStore()
+        patcher = mock.patch(
+            "recruiterblast.scrapers.get_company_store", return_value=self.store
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     @mock.patch.object(LinkedInScraper, "_fetch_company_from_job_post")
     @mock.patch.object(LinkedInScraper, "_fetch_company_entity_data")
     def test_fetch_company_from_job_post(self, mock_fetch_1, mock_fetch_2):
@@ -32,6 +44,150 @@ class LinkedInScraperTest(TestCase):
 
         self.assertEqual(expected, actual)
 
+    @mock.patch.object(LinkedInScraper, "_fetch_company_from_job_post")
+    @mock.patch.object(LinkedInScraper, "_fetch_company_entity_data")
+    def test_fetch_company_from_job_post_skips_linkedin_for_stored_job(
+        self, mock_fetch_1, mock_fetch_2
+    ):
+        company = Company(
+            id=69318116, name="Sphinx Defense", domain="sphinxdefense.com"
+        )
+        self.store.save("4133961406", company)
+        scraper = LinkedInScraper("https://www.linkedin.com/jobs/view/4133961406")
+
+        actual = scraper.fetch_company_from_job_post()
+
+        self.assertEqual(company, actual)
+        mock_fetch_1.assert_not_called()
+        mock_fetch_2.assert_not_called()
+
+    @mock.patch.object(LinkedInScraper, "_fetch_company_from_job_post")
+    @mock.patch.object(LinkedInScraper, "_fetch_company_entity_data")
+    def test_fetch_company_from_job_post_reuses_stored_company_domain(
+        self, mock_fetch_1, mock_fetch_2
+    ):
+        mock_fetch_2.return_value = MOCK_COMPANY_API_RESPONSE
+        self.store.save("1", Company(id=69318116, domain="sphinxdefense.com"))
+        scraper = LinkedInScraper("https://www.linkedin.com/jobs/view/4133961406")
+
+        actual = scraper.fetch_company_from_job_post()
+
+        self.assertEqual("sphinxdefense.com", actual.domain)
+        self.assertEqual("Sphinx Defense", actual.name)
+        mock_fetch_1.assert_not_called()
+        self.assertEqual(actual, self.store.get_company_for_job("4133961406"))
+
+
+def make_employee_result(i: int, headline: str = "Recruiter") -> dict:
+    return {
+        "bserpEntityNavigationalUrl": f"https://www.linkedin.com/in/{i}",
+        "trackingUrn": f"urn:li:member:{i}",
+        "title": {"text": f"Jane{i} Doe{i}"},
+        "primarySubtitle": {"text": headline},
+        "navigationUrl": f"https://www.linkedin.com/in/{i}?miniProfileUrn=x",
+    }
+
+
+@mock.patch.object(cfg, "RECRUITER_SEARCH_KEYWORDS", "recruiter,talent acquisition")
+@mock.patch.object(LinkedInScraper, "_fetch_recruiters_from_company")
+class LinkedInRecruiterSearchTest(TestCase):
+    def setUp(self):
+        metrics.reset_counters()
+        self.addCleanup(metrics.reset_counters)
+        patcher = mock.patch(
+            "recruiterblast.scrapers.get_company_store", return_value=CompanyStore()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scraper = LinkedInScraper("https://www.linkedin.com/jobs/view/1")
+
+    def test_searches_keywords_with_one_or_query(self, mock_fetch):
+        mock_fetch.return_value = {
+            "included": [
+                make_employee_result(1, "Recruiter, Talent Acquisition"),
+                make_employee_result(2, "Technical Recruiter"),
+            ]
+        }
+
+        recruiters = self.scraper.fetch_recruiters_from_company(Company(id=1))
+
+        self.assertEqual(2, len(recruiters))
+        mock_fetch.assert_called_once_with(
+            Company(id=1), "recruiter%20OR%20%22talent%20acquisition%22"
+        )
+        self.assertEqual(
+            {
+                "linkedin.recruiter_search.queries": 1,
+                "linkedin.recruiter_search.recruiters": 2,
+                "linkedin.recruiter_search.overlapping": 1,
+            },
+            metrics.get_counters("linkedin.recruiter_search."),
+        )
+
+    def test_falls_back_to_one_query_per_keyword(self, mock_fetch):
+        mock_fetch.side_effect = [
+            {"status": 400},
+            {"included": [make_employee_result(1), make_employee_result(2)]},
+            {"included": [make_employee_result(2), make_employee_result(3)]},
+        ]
+
+        with self.assertLogs("recruiterblast.scrapers", "WARNING"):
+            recruiters = self.scraper.fetch_recruiters_from_company(Company(id=1))
+
+        self.assertEqual(3, len(recruiters))
+        self.assertEqual(
+            ["recruiter", "talent%20acquisition"],
+            [call.args[1] for call in mock_fetch.call_args_list[1:]],
+        )
+        self.assertEqual(
+            {
+                "linkedin.recruiter_search.queries": 3,
+                "linkedin.recruiter_search.fallbacks": 1,
+                "linkedin.recruiter_search.recruiters": 3,
+                "linkedin.recruiter_search.overlapping": 1,
+            },
+            metrics.get_counters("linkedin.recruiter_search."),
+        )
+
+    def test_empty_or_query_falls_back_to_one_query_per_keyword(self, mock_fetch):
+        mock_fetch.side_effect = [
+            {"included": []},
+            {"included": [make_employee_result(1)]},
+            {},
+        ]
+
+        with self.assertLogs("recruiterblast.scrapers", "WARNING"):
+            recruiters = self.scraper.fetch_recruiters_from_company(Company(id=1))
+
+        self.assertEqual(1, len(recruiters))
+        self.assertEqual(3, mock_fetch.call_count)
+        self.assertEqual(
+            1, metrics.get_counters()["linkedin.recruiter_search.fallbacks"]
+        )
+
+    def test_empty_recruiter_list_is_not_stored(self, mock_fetch):
+        mock_fetch.return_value = {"included": []}
+
+        with self.assertLogs("recruiterblast.scrapers", "WARNING"):
+            self.scraper.fetch_recruiters_from_company(Company(id=1))
+            self.scraper.fetch_recruiters_from_company(Company(id=1))
+
+        self.assertEqual(6, mock_fetch.call_count)
+
+    @mock.patch.object(cfg, "RECRUITER_SEARCH_KEYWORDS_PER_QUERY", 2)
+    def test_splits_keywords_into_groups(self, mock_fetch):
+        mock_fetch.return_value = {"included": [make_employee_result(1)]}
+
+        with mock.patch.object(
+            cfg, "RECRUITER_SEARCH_KEYWORDS", "recruiter,sourcer,Recruiter,hr"
+        ):
+            self.scraper.fetch_recruiters_from_company(Company(id=1))
+
+        self.assertEqual(
+            ["recruiter%20OR%20sourcer", "hr"],
+            [call.args[1] for call in mock_fetch.call_args_list],
+        )
+
 
 class GoogleSearchScraperTest(TestCase):
     @mock.patch.object(GoogleSearchScraper, "_search_google")
@@ -88,3 +244,107 @@ class GoogleSearchScraperTest(TestCase):
             ),
             suggested_email_format,
         )
+
+
+def make_search_page(start: int, size: int = 10, total: int = 100) -> dict:
+    return {
+        "searchInformation": {"totalResults": str(total)},
+        "items": [{"snippet": f"result {start + i}"} for i in range(size)],
+    }
+
+
+class GoogleSearchPaginationTest(TestCase):
+    def setUp(self):
+        self.quota = DailyQuotaBudget("google.search", daily_limit=100, reserve=0)
+        patcher = mock.patch(
+            "recruiterblast.scrapers.get_google_search_quota", return_value=self.quota
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scraper = GoogleSearchScraper()
+
+    @mock.patch.object(GoogleSearchScraper, "_request_google")
+    def test_fetches_remaining_pages(self, mock_search):
+        mock_search.side_effect = lambda query, start=1: make_search_page(start)
+
+        items = self.scraper._search_google_pages("foo", max_pages=3)
+
+        self.assertEqual(30, len(items))
+        self.assertEqual("result 21", items[20]["snippet"])
+        self.assertEqual(3, self.quota.used)
+
+    @mock.patch.object(GoogleSearchScraper, "_request_google")
+    def test_stops_early_when_done(self, mock_search):
+        mock_search.side_effect = lambda query, start=1: make_search_page(start)
+
+        items = self.scraper._search_google_pages(
+            "foo", lambda items: len(items) >= 10, max_pages=3
+        )
+
+        self.assertEqual(10, len(items))
+        mock_search.assert_called_once_with("foo")
+
+    @mock.patch.object(GoogleSearchScraper, "_request_google")
+    def test_early_stop_saves_quota_for_remaining_pages(self, mock_search):
+        mock_search.side_effect = lambda query, start=1: make_search_page(start)
+
+        items = self.scraper._search_google_pages(
+            "foo", lambda items: len(items) >= 20, max_pages=5
+        )
+
+        self.assertEqual(20, len(items))
+        self.assertEqual(2, mock_search.call_count)
+        self.assertEqual(2, self.quota.used)
+
+    @mock.patch.object(GoogleSearchScraper, "_request_google")
+    def test_limits_pages_to_total_results(self, mock_search):
+        mock_search.side_effect = lambda query, start=1: make_search_page(
+            start, total=15
+        )
+
+        self.scraper._search_google_pages("foo", max_pages=5)
+
+        self.assertEqual(2, mock_search.call_count)
+
+    @mock.patch.object(GoogleSearchScraper, "_request_google")
+    def test_defers_optional_pages_within_reserve(self, mock_search):
+        self.quota.reserve = 99
+        mock_search.side_effect = lambda query, start=1: make_search_page(start)
+
+        items = self.scraper._search_google_pages("foo", max_pages=3)
+
+        self.assertEqual(10, len(items))
+        self.assertEqual(1, self.quota.used)
+
+    @mock.patch.object(GoogleSearchScraper, "_request_google")
+    def test_refuses_query_when_quota_is_exhausted(self, mock_search):
+        self.quota.used = 100
+
+        items = self.scraper._search_google_pages("foo")
+
+        self.assertEqual([], items)
+        mock_search.assert_not_called()
+
+    @mock.patch("recruiterblast.utils.time.sleep")
+    @mock.patch.object(GoogleSearchScraper, "_request_google")
+    def test_retried_queries_take_quota(self, mock_search, mock_sleep):
+        mock_search.side_effect = [RuntimeError("timeout"), make_search_page(1)]
+
+        items = self.scraper._search_google_pages("foo", max_pages=1)
+
+        self.assertEqual(10, len(items))
+        self.assertEqual(2, mock_search.call_count)
+        self.assertEqual(2, self.quota.used)
+
+    @mock.patch.object(GoogleSearchScraper, "_request_google")
+    def test_domain_emails_stop_once_done(self, mock_search):
+        mock_search.side_effect = lambda query, start=1: {
+            "items": [{"snippet": f"user{start + i}@bar.com"} for i in range(10)]
+        }
+
+        emails = self.scraper.scrape_emails_from_company_domain(
+            "bar.com", max_emails=100, is_done=lambda emails: len(emails) >= 5
+        )
+
+        self.assertEqual(10, len(emails))
+        mock_search.assert_called_once_with('site:bar.com "@bar.com"')
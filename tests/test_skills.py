@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from recruiterblast.skills import SkillAutomaton, extract_technical_requirements
+
+
+class SkillAutomatonTest(TestCase):
+    def setUp(self):
+        self.automaton = SkillAutomaton(
+            {
+                "Java": ["java"],
+                "JavaScript": ["javascript"],
+                "C++": ["c++"],
+                "AWS": ["aws", "amazon web services"],
+                "Data Lake": ["data lake"],
+            }
+        )
+
+    @parameterized.expand(
+        [
+            ("single", "Experience with Java.", ["Java"]),
+            ("longer_alias", "We write JavaScript daily", ["JavaScript"]),
+            ("overlapping", "Java/JavaScript", ["Java", "JavaScript"]),
+            ("symbols", "Python, C/C++ or R", ["C++"]),
+            ("aliases_dedupe", "AWS (Amazon Web Services)", ["AWS"]),
+            ("multi_word", "AWS Data Lake infrastructure", ["AWS", "Data Lake"]),
+            ("embedded_word", "rawsome datalakes", []),
+        ]
+    )
+    def test_find_skills(self, name, text, expected):
+        self.assertEqual(expected, self.automaton.find_skills(text))
+
+
+class ExtractTechnicalRequirementsTest(TestCase):
+    def test_uses_curated_vocabulary(self):
+        text = "Terraform, Kubernetes (k8s) and CI/CD pipelines on GCP with Git."
+
+        self.assertEqual(
+            ["Terraform", "Kubernetes", "CI/CD", "GCP", "Git"],
+            extract_technical_requirements(text),
+        )
+
+    def test_ignores_skill_names_used_as_english_words(self):
+        text = (
+            "You will react swiftly to incidents and help the rest of the team. "
+            "Be agile and spark ideas. Swift decisions and monitoring are key."
+        )
+
+        self.assertEqual([], extract_technical_requirements(text))
+
+    def test_matches_capitalized_skill_names(self):
+        text = (
+            "Requirements:\n- Swift\n- Monitoring\nWe build with React, REST "
+            "and Spark in an Agile team."
+        )
+
+        self.assertEqual(
+            ["Swift", "Monitoring", "React", "REST APIs", "Spark", "Agile"],
+            extract_technical_requirements(text),
+        )
@@ -0,0 +1,97 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from recruiterblast.models import Company, Employee
+from recruiterblast.stores import CompanyStore
+
+
+class CompanyStoreTest(TestCase):
+    def setUp(self):
+        self.company = Company(
+            id=1, name="Foo", industry="Software", domain="foo.com", employee_count=10
+        )
+
+    def test_get_company_for_job_returns_saved_company(self):
+        store = CompanyStore()
+        store.save(123, self.company)
+
+        self.assertEqual(self.company, store.get_company_for_job("123"))
+        self.assertEqual(self.company, store.get_company(1))
+
+    def test_get_company_for_job_returns_none_for_unknown_job(self):
+        self.assertIsNone(CompanyStore().get_company_for_job("123"))
+
+    def test_save_skips_company_without_id(self):
+        store = CompanyStore()
+        store.save("123", Company(name="Foo"))
+
+        self.assertIsNone(store.get_company_for_job("123"))
+
+    def test_jobs_share_updated_company(self):
+        store = CompanyStore()
+        store.save("1", self.company)
+        store.save("2", Company(id=1, name="Foo", domain="foo.io"))
+
+        self.assertEqual("foo.io", store.get_company_for_job("1").domain)
+
+    @mock.patch("recruiterblast.stores.time.time")
+    def test_expired_company_is_not_returned(self, mock_time):
+        store = CompanyStore(ttl_seconds=60)
+        mock_time.return_value = 1000
+        store.save("123", self.company)
+
+        mock_time.return_value = 1061
+
+        self.assertIsNone(store.get_company_for_job("123"))
+        self.assertIsNone(store.get_company(1))
+
+    def test_store_persists_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "companies.sqlite3")
+            CompanyStore(path).save("123", self.company)
+
+            self.assertEqual(
+                self.company, CompanyStore(path).get_company_for_job("123")
+            )
+
+    def test_get_company_by_domain_returns_saved_company(self):
+        store = CompanyStore()
+        store.save_company(self.company)
+
+        self.assertEqual(self.company, store.get_company_by_domain("foo.com"))
+        self.assertIsNone(store.get_company_by_domain("bar.com"))
+
+    def test_get_recruiters_returns_saved_recruiters_in_order(self):
+        store = CompanyStore()
+        recruiters = [
+            Employee(id=2, first_name="Jane", last_name="Doe", full_name="Jane Doe"),
+            Employee(id=1, first_name="John", last_name="Roe", full_name="John Roe"),
+        ]
+        store.save_recruiters(1, recruiters)
+
+        self.assertEqual(recruiters, store.get_recruiters(1))
+
+    def test_get_recruiters_distinguishes_empty_from_unknown(self):
+        store = CompanyStore()
+        store.save_recruiters(1, [])
+
+        self.assertEqual([], store.get_recruiters(1))
+        self.assertIsNone(store.get_recruiters(2))
+
+    def test_save_recruiters_replaces_previous_recruiters(self):
+        store = CompanyStore()
+        store.save_recruiters(1, [Employee(id=1), Employee(id=2)])
+        store.save_recruiters(1, [Employee(id=3)])
+
+        self.assertEqual([Employee(id=3)], store.get_recruiters(1))
+
+    @mock.patch("recruiterblast.stores.time.time")
+    def test_expired_recruiters_are_not_returned(self, mock_time):
+        store = CompanyStore(recruiter_ttl_seconds=60)
+        mock_time.return_value = 1000
+        store.save_recruiters(1, [Employee(id=1)])
+
+        mock_time.return_value = 1061
+
+        self.assertIsNone(store.get_recruiters(1))
@@ -0,0 +1,76 @@
+from unittest import TestCase, mock
+from urllib.parse import quote_plus
+
+from recruiterblast.models import Company, Employee, JobPost
+from recruiterblast.templates import (
+    OutreachTemplate,
+    compile_template,
+    encode_url_component,
+    encode_utf8,
+)
+
+
+class TemplateTest(TestCase):
+    def setUp(self):
+        self.company = Company(name="Foo & Co")
+        self.job_post = JobPost(
+            title="Data Engineer", job_url="https://www.linkedin.com/jobs/view/1"
+        )
+        self.recruiter = Employee(
+            first_name="Zoë", last_name="Doe", full_name="Zoë Doe"
+        )
+
+    def test_encode_url_component_matches_quote_plus_with_spaces_as_percent_20(self):
+        text = "Hi Zoë, 92.5% fit + 4 years? a/b&c=d\n"
+
+        self.assertEqual(
+            quote_plus(text).replace("+", "%20"), encode_url_component(text)
+        )
+
+    def test_render_fills_job_and_recruiter_fields(self):
+        template = compile_template(
+            "Hi {first_name}, about {job_title} at {company_name}",
+            {"job_title": "Data Engineer", "company_name": "Foo"},
+            str,
+        )
+
+        self.assertEqual(
+            "Hi Zoë, about Data Engineer at Foo", template.render(self.recruiter)
+        )
+
+    def test_compile_merges_job_fields_into_static_segments(self):
+        template = compile_template(
+            "{job_title} {first_name} {company_name} {last_name}",
+            {"job_title": "SWE", "company_name": "Foo"},
+            str,
+        )
+
+        self.assertEqual(
+            ["SWE ", "first_name", " Foo ", "last_name", ""], template.segments
+        )
+
+    def test_unknown_placeholders_and_braces_stay_literal(self):
+        template = compile_template("{name} {first_name} {", {}, str)
+
+        self.assertEqual("{name} Zoë {", template.render(self.recruiter))
+
+    def test_missing_recruiter_field_renders_empty(self):
+        template = compile_template("Hi {first_name}!", {}, encode_utf8)
+
+        self.assertEqual(b"Hi !", template.render(Employee()))
+
+    @mock.patch(
+        "recruiterblast.config.RESUME_LINK", "https://foo.com/resume", create=True
+    )
+    def test_outreach_template_url_encodes_like_full_message(self):
+        template = OutreachTemplate().compile(self.company, self.job_post)
+
+        subject, body = template.render(self.recruiter)
+
+        expected = OutreachTemplate().compile(self.company, self.job_post, str)
+        expected_subject, expected_body = expected.render(self.recruiter)
+        self.assertEqual(quote_plus(expected_subject).replace("+", "%20"), subject)
+        self.assertEqual(quote_plus(expected_body).replace("+", "%20"), body)
+        self.assertTrue(expected_body.startswith("Hi Zoë,\n\n"))
+        self.assertIn("Data Engineer role at Foo & Co [1]", expected_body)
+        self.assertTrue(expected_body.endswith("[2]: https://foo.com/resume"))
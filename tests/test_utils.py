@@ -4,6 +4,8 @@ from parameterized import parameterized
 
 from recruiterblast.models import Employee
 from recruiterblast.utils import (
+    RateLimiter,
+    build_or_query,
     generate_formatted_employee_email,
     generate_rocketreach_formatted_username,
 )
@@ -41,3 +43,66 @@ class UtilsTest(TestCase):
     def test_generate_rocketreach_formatted_username(self, name, format, expected):
         actual = generate_rocketreach_formatted_username(self.employee, format)
         self.assertEqual(expected, actual)
+
+    def test_generate_email_permutations(self):
+        emails = self.employee.generate_email_permutations("gitlab.com")
+
+        self.assertEqual(26, len(emails))
+        self.assertIn("foo.bar@gitlab.com", emails)
+
+    def test_rank_email_permutations_by_prior(self):
+        priors = {"[last].[first]": 0.9, "[first].[last]": 0.1}
+
+        emails = self.employee.rank_email_permutations("gitlab.com", priors)
+
+        self.assertEqual(["bar.foo@gitlab.com", "foo.bar@gitlab.com"], emails[:2])
+        self.assertEqual(26, len(emails))
+
+    def test_rank_email_permutations_with_limit(self):
+        priors = {"[last].[first]": 0.9, "[first].[last]": 0.1}
+
+        emails = self.employee.rank_email_permutations("gitlab.com", priors, limit=1)
+
+        self.assertEqual(["bar.foo@gitlab.com"], emails)
+
+    def test_iter_ranked_email_permutations_skips_duplicates(self):
+        employee = Employee(first_name="a", last_name="b")
+
+        emails = list(employee.iter_ranked_email_permutations("gitlab.com"))
+
+        self.assertEqual(len(set(emails)), len(emails))
+
+    @parameterized.expand(
+        [
+            (["recruiter"], "recruiter"),
+            (["talent acquisition"], "talent acquisition"),
+            (["recruiter", "talent acquisition"], 'recruiter OR "talent acquisition"'),
+        ]
+    )
+    def test_build_or_query(self, keywords: list[str], expected: str):
+        self.assertEqual(expected, build_or_query(keywords))
+
+
+class RateLimiterTest(TestCase):
+    @mock.patch("recruiterblast.utils.time.sleep")
+    @mock.patch("recruiterblast.utils.time.monotonic")
+    def test_acquire_spaces_calls_after_burst(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 100.0
+        limiter = RateLimiter(rate=2, period=1, burst=2)
+
+        delays = [limiter.acquire() for _ in range(4)]
+
+        self.assertEqual([0.0, 0.0, 0.5, 1.0], delays)
+        self.assertEqual([mock.call(0.5), mock.call(1.0)], mock_sleep.call_args_list)
+
+    @mock.patch("recruiterblast.utils.time.sleep")
+    @mock.patch("recruiterblast.utils.time.monotonic")
+    def test_acquire_refills_tokens_over_time(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 100.0
+        limiter = RateLimiter(rate=60, period=60)
+        limiter.acquire()
+
+        mock_monotonic.return_value = 101.0
+
+        self.assertEqual(0.0, limiter.acquire())
+        mock_sleep.assert_not_called()
@@ -0,0 +1,214 @@
+import datetime
+from unittest import TestCase, mock
+
+import requests
+from parameterized import parameterized
+from requests.adapters import HTTPAdapter
+
+from recruiterblast import metrics
+from recruiterblast.email_formats import EmailFormatResolver
+from recruiterblast.models import Company, Employee
+from recruiterblast.quotas import DailyQuotaBudget
+from recruiterblast.scrapers import LinkedInScraper
+from recruiterblast.sessions import create_http_session
+from recruiterblast.stores import CompanyStore
+from recruiterblast.warming import (
+    CacheWarmer,
+    is_within_windows,
+    parse_off_peak_windows,
+    parse_watchlist,
+)
+
+
+class StubAdapter(HTTPAdapter):
+    def __init__(self):
+        super().__init__()
+        self.requests = 0
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"included": []}'
+        response.request = request
+        return response
+
+
+class WarmingParserTest(TestCase):
+    def test_parse_watchlist_splits_company_ids_and_domains(self):
+        self.assertEqual(
+            [69318116, "foo.com"], parse_watchlist(" 69318116, Foo.com ,foo.com,")
+        )
+
+    def test_parse_off_peak_windows(self):
+        self.assertEqual(
+            [
+                (datetime.time(22), datetime.time(2)),
+                (datetime.time(12), datetime.time(13, 30)),
+            ],
+            parse_off_peak_windows("22:00-02:00, 12:00-13:30"),
+        )
+
+    @parameterized.expand(
+        [
+            (datetime.time(1), True),
+            (datetime.time(23), True),
+            (datetime.time(12, 15), True),
+            (datetime.time(2), False),
+            (datetime.time(13, 30), False),
+        ]
+    )
+    def test_is_within_windows(self, now, expected):
+        windows = parse_off_peak_windows("22:00-02:00,12:00-13:30")
+
+        self.assertEqual(expected, is_within_windows(now, windows))
+
+
+class CacheWarmerTest(TestCase):
+    def setUp(self):
+        metrics.reset_counters()
+        self.store = CompanyStore()
+        self.quota = DailyQuotaBudget("google", daily_limit=100, reserve=10)
+        patchers = [
+            mock.patch(
+                "recruiterblast.warming.get_company_store", return_value=self.store
+            ),
+            mock.patch(
+                "recruiterblast.scrapers.get_company_store", return_value=self.store
+            ),
+            mock.patch(
+                "recruiterblast.warming.get_google_search_quota",
+                return_value=self.quota,
+            ),
+            mock.patch.object(
+                LinkedInScraper, "fetch_company_domain", return_value="foo.com"
+            ),
+            mock.patch.object(
+                LinkedInScraper,
+                "_fetch_recruiters_from_company",
+                return_value={"included": []},
+            ),
+            mock.patch.object(EmailFormatResolver, "resolve"),
+        ]
+        self.patchers = {patcher.attribute: patcher for patcher in patchers}
+        self.mocks = {}
+        for patcher in patchers:
+            self.mocks[patcher.attribute] = patcher.start()
+            self.addCleanup(patcher.stop)
+        self.warmer = CacheWarmer(
+            [1, "bar.com"], parse_off_peak_windows(""), lookups_per_hour=10**9
+        )
+
+    def test_warm_company_id_stores_company_recruiters_and_email_format(self):
+        self.mocks["_fetch_recruiters_from_company"].return_value = {
+            "included": [
+                {
+                    "bserpEntityNavigationalUrl": "https://www.linkedin.com/in/2",
+                    "trackingUrn": "urn:li:member:2",
+                    "title": {"text": "Jane Doe"},
+                    "primarySubtitle": {"text": "Recruiter"},
+                }
+            ]
+        }
+
+        self.assertTrue(self.warmer.warm(1))
+
+        self.assertEqual("foo.com", self.store.get_company(1).domain)
+        self.assertEqual([2], [r.id for r in self.store.get_recruiters(1)])
+        self.mocks["resolve"].assert_called_once_with("foo.com")
+
+    def test_warm_domain_without_stored_company_is_incomplete(self):
+        self.assertFalse(self.warmer.warm("bar.com"))
+
+        self.mocks["fetch_company_domain"].assert_not_called()
+        self.mocks["_fetch_recruiters_from_company"].assert_not_called()
+        self.mocks["resolve"].assert_called_once_with("bar.com")
+        self.assertEqual(0, self.warmer.get_progress().warmed)
+
+    def test_stop_skips_remaining_lookups(self):
+        self.warmer.stop()
+
+        self.assertFalse(self.warmer.warm(1))
+
+        self.mocks["fetch_company_domain"].assert_not_called()
+        self.assertEqual(0, self.warmer.get_progress().lookups)
+
+    def test_warm_domain_uses_stored_company_for_recruiters(self):
+        self.store.save_company(Company(id=2, domain="bar.com"))
+        self.store.save_recruiters(2, [Employee(id=3)])
+
+        self.warmer.warm("bar.com")
+
+        self.mocks["_fetch_recruiters_from_company"].assert_not_called()
+
+    def test_warm_defers_email_format_within_quota_reserve(self):
+        self.quota.acquire(cost=90)
+
+        self.assertFalse(self.warmer.warm(1))
+
+        self.mocks["resolve"].assert_not_called()
+        self.assertEqual(1, metrics.get_counters()["cache_warmer.deferred"])
+        self.assertEqual(0, self.warmer.get_progress().warmed)
+
+    def test_warm_records_failures(self):
+        self.mocks["fetch_company_domain"].side_effect = RuntimeError("rate limited")
+
+        with self.assertLogs("recruiterblast.warming", "ERROR"):
+            self.assertFalse(self.warmer.warm(1))
+
+        self.assertEqual(1, self.warmer.get_progress().failed)
+        self.assertEqual(1, metrics.get_counters()["cache_warmer.failed"])
+
+    def test_progress_counts_warmed_and_pending_entries(self):
+        self.warmer.warm(1)
+
+        progress = self.warmer.get_progress()
+
+        self.assertEqual((2, 1, 1), (progress.total, progress.warmed, progress.pending))
+
+    def test_record_lookup_counts_warm_hits(self):
+        self.warmer.warm(1)
+
+        self.warmer.record_lookup(Company(id=1, domain="foo.com"))
+        self.warmer.record_lookup(Company(id=4, domain="baz.com"))
+
+        counters = metrics.get_counters("cache_warmer.")
+        self.assertEqual(1, counters["cache_warmer.hits"])
+        self.assertEqual(1, counters["cache_warmer.misses"])
+
+    def test_next_entry_skips_recently_attempted_entries_until_retry(self):
+        self.quota.acquire(cost=90)
+        self.warmer.warm(1)
+        self.warmer.warm("bar.com")
+
+        self.assertIsNone(self.warmer._get_next_entry())
+
+    @mock.patch("recruiterblast.scrapers.sleep_for_random_n_seconds")
+    def test_throttle_counts_every_upstream_request(self, mock_sleep):
+        session = create_http_session(cassette_mode="off")
+        session.mount("https://", StubAdapter())
+        self.patchers["_fetch_recruiters_from_company"].stop()
+        keywords = "recruiter,talent acquisition"
+
+        with mock.patch(
+            "recruiterblast.scrapers.get_http_session", return_value=session
+        ), mock.patch("recruiterblast.config.RECRUITER_SEARCH_KEYWORDS", keywords):
+            self.warmer.warm(1)
+            session.get("https://www.linkedin.com/voyager/api/me")
+
+        # An empty combined query falls back to one query per keyword, and
+        # requests outside the warmer are not paced.
+        self.assertEqual(4, session.adapters["https://"].requests)
+        self.assertEqual(3, self.warmer.get_progress().lookups)
+
+    @mock.patch("recruiterblast.warming.time.monotonic")
+    def test_throttle_paces_lookups(self, mock_monotonic):
+        warmer = CacheWarmer([1], [], lookups_per_hour=3600)
+        mock_monotonic.return_value = 100.0
+        warmer._throttle()
+
+        with mock.patch.object(warmer._stop, "wait") as mock_wait:
+            mock_monotonic.return_value = 100.25
+            warmer._throttle()
+
+        mock_wait.assert_called_once_with(0.75)